@@ -0,0 +1,103 @@
+"""Benchmark: full vs. delta checkpoints of DefaultGroupReasoner
+
+Runs a reasoner against a local function model (no API key required) and
+checkpoints its state after each turn, once as a full snapshot and once as a
+delta. Reports checkpoint size and CPU time per turn, and the time to restore
+from a full snapshot vs. from compacted deltas.
+
+    python -m benchmarks.checkpoints --turns 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ThinkingPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.profiles import ModelProfile
+
+from group_sense import DefaultGroupReasoner, Message
+
+RESPONSE = json.dumps({"decision": "delegate", "query": "Summarize the open questions of the discussion."})
+THOUGHTS = "The latest message asks a question that is relevant to the owner. " * 10
+
+
+def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    return ModelResponse(parts=[ThinkingPart(content=THOUGHTS), TextPart(content=RESPONSE)])
+
+
+def create_reasoner() -> DefaultGroupReasoner:
+    model = FunctionModel(respond, profile=ModelProfile(supports_json_schema_output=True))
+    return DefaultGroupReasoner(system_prompt="You are assisting alice in a group chat.", model=model)
+
+
+def measure(checkpoint) -> tuple[int, float]:
+    start = time.process_time()
+    encoded = json.dumps(checkpoint())
+    return len(encoded), time.process_time() - start
+
+
+async def main(args):
+    reasoner = create_reasoner()
+    full_sizes, full_times, delta_sizes, delta_times = [], [], [], []
+    deltas = []
+
+    def checkpoint_delta() -> dict:
+        deltas.append(reasoner.get_serialized_delta())
+        return deltas[-1]
+
+    for i in range(args.turns):
+        message = Message(content=f"Message {i}: " + "Let's discuss the release plan. " * 5, sender=f"user{i % 5}")
+        await reasoner.process([message])
+
+        size, cpu = measure(reasoner.get_serialized)
+        full_sizes.append(size)
+        full_times.append(cpu)
+
+        size, cpu = measure(checkpoint_delta)
+        delta_sizes.append(size)
+        delta_times.append(cpu)
+
+    print(f"{'turn':>6} {'full [KiB]':>12} {'full [ms]':>10} {'delta [KiB]':>12} {'delta [ms]':>11}")
+    for turn in sorted({1, 10, 100, args.turns} & set(range(1, args.turns + 1))):
+        i = turn - 1
+        print(
+            f"{turn:>6} "
+            f"{full_sizes[i] / 1024:>12.1f} "
+            f"{full_times[i] * 1000:>10.2f} "
+            f"{delta_sizes[i] / 1024:>12.1f} "
+            f"{delta_times[i] * 1000:>11.2f}"
+        )
+    print(
+        f"{'total':>6} "
+        f"{sum(full_sizes) / 1024:>12.1f} "
+        f"{sum(full_times) * 1000:>10.2f} "
+        f"{sum(delta_sizes) / 1024:>12.1f} "
+        f"{sum(delta_times) * 1000:>11.2f}"
+    )
+
+    snapshot = reasoner.get_serialized()
+    create_reasoner().set_serialized(snapshot)  # warm-up
+
+    start = time.process_time()
+    create_reasoner().set_serialized(snapshot)
+    print(f"\nrestore from full snapshot: {(time.process_time() - start) * 1000:.2f} ms")
+
+    start = time.process_time()
+    compacted = DefaultGroupReasoner.compact_serialized({"agent": [], "processed": 0}, deltas)
+    create_reasoner().set_serialized(compacted)
+    print(f"restore from compacted deltas: {(time.process_time() - start) * 1000:.2f} ms")
+
+    start = time.process_time()
+    restored = create_reasoner()
+    for delta in deltas:
+        restored.apply_serialized_delta(delta)
+    print(f"restore by replaying deltas: {(time.process_time() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark full vs. delta checkpoints")
+    parser.add_argument("--turns", type=int, default=1000, help="Number of reasoner turns")
+
+    asyncio.run(main(args=parser.parse_args()))
@@ -0,0 +1,71 @@
+"""Benchmark: import time of group_sense
+
+Measures the cold-start import time of group_sense in fresh interpreter
+processes with `python -X importtime`, for a light import of messages and
+for the import of a reasoner, which imports pydantic-ai and the model
+provider packages. Reports the median over repeated runs and the slowest
+modules imported. Exits with a non-zero status if the light import exceeds
+`--max-ms`, e.g. to guard cold-start latency in CI.
+
+    python -m benchmarks.imports --repeat 10 --max-ms 50
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "messages": "import group_sense",
+    "reasoner": "from group_sense import DefaultGroupReasoner",
+}
+
+
+def import_times(statement: str) -> list[tuple[str, int, int]]:
+    """Modules imported by a statement with their nesting level and cumulative import time in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        level = (len(module) - len(module.lstrip())) // 2
+        times.append((module.strip(), level, int(cumulative)))
+    return times
+
+
+def total(times: list[tuple[str, int, int]], startup: set[str]) -> int:
+    # modules imported at interpreter startup, e.g. site, are excluded
+    return sum(t for module, level, t in times if level == 0 and module not in startup)
+
+
+def main(args):
+    exceeded = False
+    startup = {module for module, _, _ in import_times("pass")}
+
+    for name, statement in STATEMENTS.items():
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        elapsed = statistics.median(total(times, startup) for times in runs) / 1000
+
+        slowest = sorted(runs[-1], key=lambda item: item[2], reverse=True)
+        top = [module for module, _, _ in slowest if module not in startup and not module.startswith("group_sense")][:3]
+        print(f"{name} ({statement}): {elapsed:.1f} ms, slowest: {', '.join(top)}")
+
+        if name == "messages" and args.max_ms is not None and elapsed > args.max_ms:
+            print(f"light import exceeds {args.max_ms} ms")
+            exceeded = True
+
+    sys.exit(1 if exceeded else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark import time of group_sense")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of runs per import")
+    parser.add_argument("--max-ms", type=float, default=None, help="Maximum time of the light import in ms")
+
+    main(args=parser.parse_args())
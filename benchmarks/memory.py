@@ -0,0 +1,56 @@
+"""Benchmark: memory footprint of group chat messages
+
+Creates a large number of messages, as held in memory across rooms, and
+reports the bytes allocated per message with tracemalloc, compared to a
+dict-based dataclass with per-instance default lists (the previous message
+representation). Sender IDs are created per message, as when deserialized
+from a chat gateway or store. Message contents are created in advance and
+not included in the measurement.
+
+    python -m benchmarks.memory --messages 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from group_sense import Message
+
+
+@dataclass
+class DictMessage:
+    content: str
+    sender: str
+    receiver: str | None = None
+    threads: list = field(default_factory=list)
+    attachments: list = field(default_factory=list)
+    id: str | None = None
+
+
+def measure(create: Callable[[str, str], Any], contents: list[str], senders: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    messages = [create(content, f"user{i % senders}") for i, content in enumerate(contents)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+    return size
+
+
+def main(args):
+    contents = [f"Message {i}: let's discuss the release plan for next week." for i in range(args.messages)]
+
+    for name, create in [("dict", DictMessage), ("slotted", Message)]:
+        size = measure(create, contents, args.senders)
+        print(f"{name}: {size / args.messages:,.1f} bytes/message ({size / 2**20:,.1f} MiB total)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory footprint of messages")
+    parser.add_argument("--messages", type=int, default=1000000, help="Number of messages")
+    parser.add_argument("--senders", type=int, default=50, help="Number of distinct senders")
+
+    main(args=parser.parse_args())
@@ -0,0 +1,79 @@
+"""Benchmark: latency profiles of DefaultGroupReasoner
+
+Replays an example chat through one reasoner per latency profile and reports
+per-call latency and agreement of decisions with the thorough profile.
+Requires a Gemini API key (GOOGLE_API_KEY).
+
+    python -m benchmarks.profiles \
+     --data-dir examples/data/fact_check \
+     --prompt-file examples/prompts/default/fact_check.md
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from group_sense import Decision, DefaultGroupReasoner, Message
+from group_sense.reasoner.profile import Profile
+
+
+def load_chat(chat_dir: Path) -> list[Message]:
+    with open(chat_dir / "chat.json") as f:
+        return [Message(**msg) for msg in json.load(f)]
+
+
+async def run_profile(
+    profile: Profile, system_prompt: str, messages: list[Message]
+) -> tuple[list[float], list[Decision]]:
+    reasoner = DefaultGroupReasoner(system_prompt=system_prompt, profile=profile)
+    latencies = []
+    decisions = []
+
+    for message in messages:
+        start = time.perf_counter()
+        response = await reasoner.process([message])
+        latencies.append(time.perf_counter() - start)
+        decisions.append(response.decision)
+
+    return latencies, decisions
+
+
+def percentile(values: list[float], p: float) -> float:
+    return statistics.quantiles(values, n=100)[int(p) - 1] if len(values) > 1 else values[0]
+
+
+async def main(args):
+    system_prompt = args.prompt_file.read_text()
+    messages = load_chat(args.data_dir)
+
+    results = {}
+    for profile in Profile:
+        results[profile] = await run_profile(profile, system_prompt, messages)
+
+    _, reference = results[Profile.THOROUGH]
+
+    print(f"{'profile':<10} {'mean [s]':>10} {'p50 [s]':>10} {'p95 [s]':>10} {'agreement':>10}")
+    for profile, (latencies, decisions) in results.items():
+        agreement = sum(d == r for d, r in zip(decisions, reference)) / len(reference)
+        print(
+            f"{profile.value:<10} "
+            f"{statistics.mean(latencies):>10.2f} "
+            f"{percentile(latencies, 50):>10.2f} "
+            f"{percentile(latencies, 95):>10.2f} "
+            f"{agreement:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Benchmark latency profiles on example data")
+    parser.add_argument("--data-dir", type=Path, required=True, help="Path to example data directory")
+    parser.add_argument("--prompt-file", type=Path, required=True, help="Path to reasoner system prompt")
+
+    asyncio.run(main(args=parser.parse_args()))
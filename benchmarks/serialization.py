@@ -0,0 +1,112 @@
+"""Benchmark: serialization of DefaultGroupReasoner state
+
+Builds a conversation history against a local function model (no API key
+required) and compares the JSON-able state with the compact msgpack + zstd
+encoding in size and encode/decode time. Also measures the maximum event loop
+stall while serializing on the event loop vs. in an executor. The compact
+encoding requires `pip install group-sense[compact]`.
+
+    python -m benchmarks.serialization --turns 2000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.profiles import ModelProfile
+
+from benchmarks.checkpoints import respond
+from group_sense import DefaultGroupReasoner, Message
+from group_sense.storage import decode_compact, encode_compact
+
+
+def create_reasoner() -> DefaultGroupReasoner:
+    model = FunctionModel(respond, profile=ModelProfile(supports_json_schema_output=True))
+    # the fast profile sends only recent turns, which keeps building long histories fast
+    return DefaultGroupReasoner(system_prompt="You are assisting alice in a group chat.", model=model, profile="fast")
+
+
+T = TypeVar("T")
+
+
+def timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+async def max_stall(operation: Callable[[], Awaitable], repeat: int = 5) -> float:
+    """Median over repeated runs of the longest event loop stall during an operation."""
+    return statistics.median([await _max_stall(operation) for _ in range(repeat)])
+
+
+async def _max_stall(operation: Callable[[], Awaitable], interval: float = 0.001) -> float:
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            stall = max(stall, time.perf_counter() - start - interval)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(interval)
+    await operation()
+    done = True
+    await task
+    return stall
+
+
+async def main(args):
+    reasoner = create_reasoner()
+    for i in range(args.turns):
+        message = Message(content=f"Message {i}: " + "Let's discuss the release plan. " * 5, sender=f"user{i % 5}")
+        await reasoner.process([message])
+
+    state, get_time = timed(reasoner.get_serialized)
+    data_json, dumps_time = timed(lambda: json.dumps(state).encode())
+    _, loads_time = timed(json.loads, data_json)
+    data_compact, encode_time = timed(encode_compact, state)
+    _, decode_time = timed(decode_compact, data_compact)
+    _, set_time = timed(create_reasoner().set_serialized, state)
+
+    print(f"history: {len(reasoner._history)} model messages after {args.turns} turns\n")
+    print(f"{'encoding':<18} {'size [KiB]':>12} {'encode [ms]':>12} {'decode [ms]':>12}")
+    print(f"{'json':<18} {len(data_json) / 1024:>12.1f} {dumps_time * 1000:>12.1f} {loads_time * 1000:>12.1f}")
+    print(
+        f"{'msgpack + zstd':<18} {len(data_compact) / 1024:>12.1f} "
+        f"{encode_time * 1000:>12.1f} {decode_time * 1000:>12.1f}"
+    )
+    print(f"\nget_serialized: {get_time * 1000:.1f} ms, set_serialized: {set_time * 1000:.1f} ms\n")
+
+    async def on_loop():
+        reasoner.get_serialized()
+
+    async def in_thread():
+        await reasoner.get_serialized_async()
+
+    print(f"median max loop stall, get_serialized on loop: {await max_stall(on_loop) * 1000:.1f} ms")
+    print(f"median max loop stall, get_serialized_async (thread): {await max_stall(in_thread) * 1000:.1f} ms")
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        await reasoner.get_serialized_async(executor)  # warm-up
+
+        async def in_process():
+            await reasoner.get_serialized_async(executor)
+
+        print(f"median max loop stall, get_serialized_async (process): {await max_stall(in_process) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark reasoner state serialization")
+    parser.add_argument("--turns", type=int, default=2000, help="Number of reasoner turns")
+
+    asyncio.run(main(args=parser.parse_args()))
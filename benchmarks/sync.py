@@ -0,0 +1,117 @@
+"""Benchmark: call overhead of SyncGroupReasoner
+
+Measures the overhead of calling a ConcurrentGroupReasoner through the
+thread-safe SyncGroupReasoner facade from a pool of threads, compared to
+calling it directly on the event loop. Uses a reasoner that responds
+immediately, so that the measured time is the overhead of the facade and the
+concurrent reasoner. No model calls are made.
+
+    python -m benchmarks.sync --calls 20000 --threads 1 4 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from group_sense import (
+    ConcurrentGroupReasoner,
+    Decision,
+    GroupReasoner,
+    GroupReasonerFactory,
+    Message,
+    Response,
+    RoomSummary,
+    SyncGroupReasoner,
+)
+
+
+class ImmediateGroupReasoner(GroupReasoner):
+    def __init__(self):
+        self._processed = 0
+
+    @property
+    def processed(self) -> int:
+        return self._processed
+
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+        self._processed += len(updates)
+        return Response(decision=Decision.IGNORE)
+
+    def get_serialized(self) -> dict:
+        return {"processed": self._processed}
+
+    def set_serialized(self, state: dict):
+        self._processed = state["processed"]
+
+
+class ImmediateGroupReasonerFactory(GroupReasonerFactory):
+    def create_group_reasoner(self, owner: str) -> GroupReasoner:
+        return ImmediateGroupReasoner()
+
+
+def message(i: int) -> Message:
+    return Message(content=f"Message {i}", sender=f"user{i % 50}")
+
+
+async def direct(calls: int) -> float:
+    reasoner = ConcurrentGroupReasoner(factory=ImmediateGroupReasonerFactory())
+    start = time.perf_counter()
+    for i in range(calls):
+        await reasoner.process(message(i))
+    elapsed = time.perf_counter() - start
+    await reasoner.aclose()
+    return elapsed
+
+
+def threaded(calls: int, threads: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    with SyncGroupReasoner(ConcurrentGroupReasoner(factory=ImmediateGroupReasonerFactory())) as reasoner:
+
+        def worker(offset: int):
+            for i in range(offset, calls, threads):
+                called = time.perf_counter()
+                reasoner.process(message(i)).result()
+                latencies.append(time.perf_counter() - called)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(worker, range(threads)))
+        elapsed = time.perf_counter() - start
+
+    return elapsed, latencies
+
+
+def batched(calls: int, batch_size: int) -> float:
+    with SyncGroupReasoner(ConcurrentGroupReasoner(factory=ImmediateGroupReasonerFactory())) as reasoner:
+        start = time.perf_counter()
+        for i in range(0, calls, batch_size):
+            reasoner.process_batch([message(j) for j in range(i, min(i + batch_size, calls))])
+        return time.perf_counter() - start
+
+
+def main(args):
+    elapsed = asyncio.run(direct(args.calls))
+    print(f"direct: {elapsed / args.calls * 1e6:.1f} us/call")
+
+    for threads in args.threads:
+        elapsed, latencies = threaded(args.calls, threads)
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"sync, {threads} threads: {args.calls / elapsed:,.0f} calls/s, "
+            f"latency p50 {quantiles[49] * 1e6:.1f} us, p99 {quantiles[98] * 1e6:.1f} us"
+        )
+
+    elapsed = batched(args.calls, args.batch_size)
+    print(f"sync, batches of {args.batch_size}: {elapsed / args.calls * 1e6:.1f} us/call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark call overhead of SyncGroupReasoner")
+    parser.add_argument("--calls", type=int, default=20000, help="Number of process calls")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16], help="Numbers of calling threads")
+    parser.add_argument("--batch-size", type=int, default=100, help="Number of messages per batch call")
+
+    main(args=parser.parse_args())
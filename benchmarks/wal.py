@@ -0,0 +1,104 @@
+"""Benchmark: write-ahead log throughput of ConcurrentGroupReasoner
+
+Appends messages to a ConcurrentGroupReasoner with a write-ahead log, once as
+fast as possible and once paced at a target rate, and reports write
+throughput, number of group commits and commit latency percentiles. No model
+calls are made.
+
+    python -m benchmarks.wal --messages 100000 --rate 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from group_sense import ConcurrentGroupReasoner, DefaultGroupReasonerFactory, Message
+from group_sense.storage import WriteAheadLog
+
+
+class CountingWriteAheadLog(WriteAheadLog):
+    """Write-ahead log that records the number of records of each group commit."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commits: list[int] = []
+
+    def _write(self, batch: list[bytes], first: int):
+        self.commits.append(len(batch))
+        super()._write(batch, first)
+
+
+def create_reasoner(directory: str, args) -> tuple[ConcurrentGroupReasoner, CountingWriteAheadLog]:
+    wal = CountingWriteAheadLog(directory, commit_interval=args.commit_interval, fsync=not args.no_fsync)
+    factory = DefaultGroupReasonerFactory(system_prompt_template="You are assisting {owner}.")
+    return ConcurrentGroupReasoner(factory=factory, wal=wal), wal
+
+
+def message(i: int) -> Message:
+    return Message(content=f"Message {i}: let's discuss the release plan for next week.", sender=f"user{i % 50}")
+
+
+async def burst(args):
+    with tempfile.TemporaryDirectory() as directory:
+        reasoner, wal = create_reasoner(directory, args)
+
+        start = time.perf_counter()
+        for i in range(args.messages):
+            reasoner.append(message(i))
+            if i % 1000 == 999:
+                await asyncio.sleep(0)  # let group commits run
+        await wal.commit()
+        elapsed = time.perf_counter() - start
+        await wal.aclose()
+
+    print(f"burst: {args.messages / elapsed:,.0f} msg/s ({len(wal.commits)} commits)")
+
+
+async def paced(args):
+    latencies: list[float] = []
+
+    async def committed(lsn: int, appended: float):
+        await wal.commit(lsn)
+        latencies.append(time.perf_counter() - appended)
+
+    with tempfile.TemporaryDirectory() as directory:
+        reasoner, wal = create_reasoner(directory, args)
+        waiters = []
+
+        start = time.perf_counter()
+        i = 0
+        while i < args.messages:
+            # append all messages due at the target rate, then sample the commit latency of the last one
+            due = min(args.messages, int((time.perf_counter() - start) * args.rate) + 1)
+            while i < due:
+                reasoner.append(message(i))
+                i += 1
+            waiters.append(asyncio.create_task(committed(wal.lsn - 1, time.perf_counter())))
+            await asyncio.sleep(0.001)
+
+        await asyncio.gather(*waiters)
+        elapsed = time.perf_counter() - start
+        await wal.aclose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"paced at {args.rate:,} msg/s: {args.messages / elapsed:,.0f} msg/s ({len(wal.commits)} commits), "
+        f"commit latency p50 {quantiles[49] * 1000:.1f} ms, p99 {quantiles[98] * 1000:.1f} ms"
+    )
+
+
+async def main(args):
+    await burst(args)
+    await paced(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark write-ahead log throughput")
+    parser.add_argument("--messages", type=int, default=100000, help="Number of messages")
+    parser.add_argument("--rate", type=int, default=10000, help="Target rate of the paced run in msg/s")
+    parser.add_argument("--commit-interval", type=float, default=0.002, help="Group commit interval in seconds")
+    parser.add_argument("--no-fsync", action="store_true", help="Disable fsync of group commits")
+
+    asyncio.run(main(args=parser.parse_args()))
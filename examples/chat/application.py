@@ -1,7 +1,7 @@
 import argparse
 import logging
 import re
-from asyncio import Future, create_task, run
+from asyncio import create_task, run
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -9,7 +9,7 @@ from group_terminal.server import ChatServer
 
 from examples.chat.assistant import Service
 from examples.utils import configure_logging
-from group_sense import ConcurrentGroupReasoner, Decision, DefaultGroupReasonerFactory, Message, Response
+from group_sense import ConcurrentGroupReasoner, Decision, DefaultGroupReasonerFactory, Message, ResponseStream
 
 logger = logging.getLogger(__name__)
 
@@ -39,20 +39,23 @@ class App:
         message = self._create_reasoner_message(content, sender)
         # Initiate reasoner processing in message arrival order
         # (guarantees equal internal and chat message ordering)
-        future = self._reasoner.process(message)
-        # Asynchronously await and process reasoner response
-        create_task(self._handle_response(future, sender))
+        stream = self._reasoner.process_stream(message)
+        # Asynchronously consume and process reasoner response stream
+        create_task(self._handle_response(stream, sender))
 
-    async def _handle_response(self, future: Future[Response], sender: str):
+    async def _handle_response(self, stream: ResponseStream, sender: str):
         try:
-            reasoner_response = await future
+            async for partial_response in stream:
+                # The decision is streamed before the query is complete
+                if partial_response.decision == Decision.IGNORE:
+                    logger.debug("Reasoner decision: ignore")
+                    return
+            reasoner_response = await stream.response()
         except Exception:
             logger.exception("Reasoner error")
             return
 
         logger.debug(f"Reasoner decision: {reasoner_response.decision.value}")
-        if reasoner_response.decision == Decision.IGNORE:
-            return
 
         if not reasoner_response.query:
             logger.warning("Reasoner delegated without query")
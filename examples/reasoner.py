@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 
 from examples.utils import configure_logging
 from group_sense import (
+    BufferedGroupReasoner,
     ConcurrentGroupReasoner,
     Decision,
     DefaultGroupReasoner,
@@ -67,6 +68,29 @@ async def run_default_reasoner(chat_dir: Path, prompt_file: Path, batch_size: in
         print_response(response)
 
 
+async def run_buffered_reasoner(chat_dir: Path, prompt_file: Path, max_size: int):
+    system_prompt = load_system_prompt(prompt_file)
+
+    if "{owner}" in system_prompt:
+        raise ValueError("System prompt of default group reasoner must not contain an {owner} placeholder")
+
+    reasoner = BufferedGroupReasoner(DefaultGroupReasoner(system_prompt=system_prompt), max_size=max_size)
+    messages = load_chat(chat_dir)
+
+    futures = []
+    for i, msg in enumerate(messages):
+        print_message(i, msg)
+        futures.append(reasoner.submit(msg))
+
+    # messages of the same batch share a response
+    responses: list[Response] = []
+    for future in futures:
+        response = await future
+        if not responses or response is not responses[-1]:
+            responses.append(response)
+            print_response(response)
+
+
 async def run_concurrent_reasoner(chat_dir: Path, prompt_file: Path):
     system_prompt_template = load_system_prompt(prompt_file)
 
@@ -88,6 +112,8 @@ async def run_concurrent_reasoner(chat_dir: Path, prompt_file: Path):
 async def main(args):
     if args.concurrent:
         await run_concurrent_reasoner(args.data_dir, args.prompt_file)
+    elif args.adaptive:
+        await run_buffered_reasoner(args.data_dir, args.prompt_file, args.max_batch_size)
     else:
         await run_default_reasoner(args.data_dir, args.prompt_file, args.batch_size)
 
@@ -100,6 +126,8 @@ if __name__ == "__main__":
     parser.add_argument("--data-dir", type=Path, required=True, help="Path to example data directory")
     parser.add_argument("--prompt-file", type=Path, required=True, help="Path to reasoner system prompt")
     parser.add_argument("--batch-size", type=int, default=1, help="Batch size for default group reasoner")
+    parser.add_argument("--adaptive", action="store_true", help="Use adaptive batch sizes for default group reasoner")
+    parser.add_argument("--max-batch-size", type=int, default=20, help="Maximum batch size in adaptive mode")
     parser.add_argument("--concurrent", action="store_true", help="Use concurrent group reasoner")
 
     asyncio.run(main(args=parser.parse_args()))
@@ -1,10 +1,72 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from group_sense.message import Attachment, Message, Thread
-from group_sense.reasoner import (
-    ConcurrentGroupReasoner,
-    Decision,
-    DefaultGroupReasoner,
-    DefaultGroupReasonerFactory,
-    GroupReasoner,
-    GroupReasonerFactory,
-    Response,
-)
+
+if TYPE_CHECKING:
+    from group_sense.columnar import ColumnarRoomLog
+    from group_sense.reasoner import (
+        BatchGroupReasoner,
+        BufferedGroupReasoner,
+        ConcurrentGroupReasoner,
+        Decision,
+        DecisionValidator,
+        DefaultBatchGroupReasoner,
+        DefaultGroupReasoner,
+        DefaultGroupReasonerFactory,
+        GroupReasoner,
+        GroupReasonerFactory,
+        Overload,
+        Profile,
+        PromptBudget,
+        RateLimit,
+        Response,
+        ResponseStream,
+        RoomSummarizer,
+        RoomSummary,
+        ShedStats,
+        SyncGroupReasoner,
+    )
+    from group_sense.storage import SQLiteStore, WriteAheadLog
+
+# Reasoners import pydantic-ai and model provider packages, which is slow.
+# They are imported on first access, so that importing messages is fast.
+_LAZY = {
+    "ColumnarRoomLog": "group_sense.columnar",
+    "BatchGroupReasoner": "group_sense.reasoner",
+    "BufferedGroupReasoner": "group_sense.reasoner",
+    "ConcurrentGroupReasoner": "group_sense.reasoner",
+    "Decision": "group_sense.reasoner",
+    "DecisionValidator": "group_sense.reasoner",
+    "DefaultBatchGroupReasoner": "group_sense.reasoner",
+    "DefaultGroupReasoner": "group_sense.reasoner",
+    "DefaultGroupReasonerFactory": "group_sense.reasoner",
+    "GroupReasoner": "group_sense.reasoner",
+    "GroupReasonerFactory": "group_sense.reasoner",
+    "Overload": "group_sense.reasoner",
+    "Profile": "group_sense.reasoner",
+    "PromptBudget": "group_sense.reasoner",
+    "RateLimit": "group_sense.reasoner",
+    "Response": "group_sense.reasoner",
+    "ResponseStream": "group_sense.reasoner",
+    "RoomSummarizer": "group_sense.reasoner",
+    "RoomSummary": "group_sense.reasoner",
+    "ShedStats": "group_sense.reasoner",
+    "SyncGroupReasoner": "group_sense.reasoner",
+    "SQLiteStore": "group_sense.storage",
+    "WriteAheadLog": "group_sense.storage",
+}
+
+__all__ = ["Attachment", "Message", "Thread", *_LAZY]
+
+
+def __getattr__(name: str) -> Any:
+    if (module := _LAZY.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+
+from group_sense.reasoner.base import GroupReasoner, GroupReasonerFactory
+from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+from group_sense.reasoner.default import DefaultGroupReasoner, DefaultGroupReasonerFactory
+from group_sense.reasoner.profile import Profile
+from group_sense.replay import ReplayStats, expand_sources, replay
+
+
+class _ModelFactory(GroupReasonerFactory):
+    """Factory that creates reasoners with a fixed model."""
+
+    def __init__(self, factory: DefaultGroupReasonerFactory, model: str | None):
+        self._factory = factory
+        self._model = model
+
+    def create_group_reasoner(self, owner: str, **kwargs: Any) -> GroupReasoner:
+        return self._factory.create_group_reasoner(owner=owner, model=self._model, **kwargs)
+
+
+def _format_stats(stats: ReplayStats) -> str:
+    return (
+        f"{stats.rooms} rooms, {stats.messages} messages, {stats.decisions} decisions "
+        f"({stats.delegations} delegated, {stats.errors} errors) in {stats.elapsed:.1f} s, "
+        f"{stats.throughput:.1f} msg/s"
+    )
+
+
+async def _replay(args: argparse.Namespace) -> ReplayStats:
+    system_prompt = args.prompt_file.read_text()
+
+    def create_reasoner(room: str) -> GroupReasoner | ConcurrentGroupReasoner:
+        if args.concurrent:
+            factory = DefaultGroupReasonerFactory(system_prompt_template=system_prompt, profile=args.profile)
+            return ConcurrentGroupReasoner(factory=_ModelFactory(factory, args.model))
+        return DefaultGroupReasoner(system_prompt=system_prompt, model=args.model, profile=args.profile)
+
+    def on_progress(stats: ReplayStats):
+        print(_format_stats(stats), file=sys.stderr)
+
+    sources = expand_sources(args.inputs)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        return await replay(
+            sources,
+            output,
+            create_reasoner,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            context_senders=args.context_sender or ["system"],
+            room_key=args.room_key,
+            queue_size=args.queue_size,
+            on_progress=on_progress if args.progress_interval > 0 else None,
+            progress_interval=args.progress_interval,
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def _validate(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    system_prompt = args.prompt_file.read_text()
+    if args.concurrent and "{owner}" not in system_prompt:
+        parser.error("System prompt template of concurrent reasoner must contain an {owner} placeholder")
+    if not args.concurrent and "{owner}" in system_prompt:
+        parser.error("System prompt of default group reasoner must not contain an {owner} placeholder")
+    for name in ["concurrency", "batch_size", "queue_size"]:
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="group-sense", description="Group Sense command line interface")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        aliases=["backfill"],
+        help="Replay chat exports through reasoners and write decisions as NDJSON",
+        description=(
+            "Stream chat exports (JSON arrays or NDJSON of messages) through one reasoner per room, "
+            "with rooms processed in parallel, and write decisions as NDJSON."
+        ),
+    )
+    replay_parser.add_argument("inputs", type=Path, nargs="+", help="Chat export files or directories")
+    replay_parser.add_argument("--prompt-file", type=Path, required=True, help="Path to reasoner system prompt")
+    replay_parser.add_argument("--output", default="-", help="Output NDJSON file (default: stdout)")
+    replay_parser.add_argument("--concurrent", action="store_true", help="Use concurrent group reasoner per room")
+    replay_parser.add_argument("--model", help="Model name (default: reasoner default model)")
+    replay_parser.add_argument(
+        "--profile", choices=[p.value for p in Profile], default=Profile.THOROUGH.value, help="Latency profile"
+    )
+    replay_parser.add_argument("--concurrency", type=int, default=8, help="Maximum concurrent reasoner calls")
+    replay_parser.add_argument("--batch-size", type=int, default=1, help="Batch size for default group reasoner")
+    replay_parser.add_argument("--room-key", default="room", help="Record field containing the room ID")
+    replay_parser.add_argument(
+        "--context-sender",
+        action="append",
+        help="Sender whose messages are only added as context in concurrent mode (default: system)",
+    )
+    replay_parser.add_argument("--queue-size", type=int, default=1000, help="Maximum pending messages per room")
+    replay_parser.add_argument(
+        "--progress-interval", type=float, default=10.0, help="Seconds between progress reports, 0 to disable"
+    )
+    replay_parser.add_argument("--log-level", default="WARNING", help="Log level of group_sense loggers")
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("group_sense").setLevel(args.log_level.upper())
+
+    _validate(parser, args)
+    stats = asyncio.run(_replay(args))
+    print(_format_stats(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from group_sense.message import Attachment, Message, Thread
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Columnar room logs require the numpy package. Install it with: pip install group-sense[columnar]"
+        ) from e
+    return numpy
+
+
+class ColumnarRoomLog(Sequence[Message]):
+    """Columnar in-memory log of the group chat messages of a room.
+
+    Stores messages in NumPy arrays of sender and receiver codes, content
+    offsets, content lengths and timestamps, and message contents in a
+    single UTF-8 arena, instead of one `Message` object per message. Scans
+    over the history, e.g. messages per sender or messages addressed to an
+    owner since an offset, are vectorized with
+    [`count()`][group_sense.columnar.ColumnarRoomLog.count],
+    [`indices()`][group_sense.columnar.ColumnarRoomLog.indices] and
+    [`counts_by_sender()`][group_sense.columnar.ColumnarRoomLog.counts_by_sender].
+
+    The log is a sequence of messages. Indexing and slicing return `Message`
+    views that are created on access, so they compare equal to, but are not
+    identical with, the appended messages. Threads, attachments and message
+    IDs are stored sparsely, for the messages that have them.
+
+    Used by
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    with `columnar=True`. Requires the optional `columnar` dependencies
+    (`pip install group-sense[columnar]`).
+
+    Example:
+        ```python
+        log = ColumnarRoomLog()
+        log.append(Message(content="Hi @bob", sender="alice", receiver="bob"))
+        log.append(Message(content="Hello", sender="bob"))
+
+        assert log.count(receiver="bob") == 1
+        assert log.counts_by_sender() == {"alice": 1, "bob": 1}
+        ```
+    """
+
+    def __init__(self, messages: Iterable[Message] = (), capacity: int = 1024):
+        """Initialize the log with optional messages.
+
+        Args:
+            messages: Initial messages of the log.
+            capacity: Initial number of messages the columns are allocated
+                for. Columns grow by doubling when full.
+
+        Raises:
+            ValueError: If capacity is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+
+        self._np = _import_numpy()
+        self._length = 0
+        self._sender = self._np.empty(capacity, dtype=self._np.int32)
+        self._receiver = self._np.empty(capacity, dtype=self._np.int32)
+        self._offset = self._np.empty(capacity, dtype=self._np.int64)
+        self._size = self._np.empty(capacity, dtype=self._np.int32)
+        self._timestamp = self._np.empty(capacity, dtype=self._np.float64)
+        self._arena = bytearray()
+
+        # user ID <-> code, receiver code -1 if no receiver
+        self._codes: dict[str, int] = {}
+        self._users: list[str] = []
+
+        self._threads: dict[int, tuple[Thread, ...]] = {}
+        self._attachments: dict[int, tuple[Attachment, ...]] = {}
+        self._ids: dict[int, str] = {}
+
+        for message in messages:
+            self.append(message)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Message]: ...
+
+    def __getitem__(self, index: int | slice) -> Message | list[Message]:
+        if isinstance(index, slice):
+            return [self._view(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Log index out of range")
+        return self._view(index)
+
+    def __iter__(self) -> Iterator[Message]:
+        for i in range(self._length):
+            yield self._view(i)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def append(self, message: Message, timestamp: float | None = None):
+        """Append a message to the log.
+
+        Args:
+            message: Message to append.
+            timestamp: Time the message was added, in seconds since the
+                epoch. Defaults to the current time.
+        """
+        if self._length == len(self._sender):
+            self._grow()
+
+        i = self._length
+        content = message.content.encode()
+        self._sender[i] = self._code(message.sender)
+        self._receiver[i] = -1 if message.receiver is None else self._code(message.receiver)
+        self._offset[i] = len(self._arena)
+        self._size[i] = len(content)
+        self._timestamp[i] = time.time() if timestamp is None else timestamp
+        self._arena.extend(content)
+
+        if message.threads:
+            self._threads[i] = tuple(message.threads)
+        if message.attachments:
+            self._attachments[i] = tuple(message.attachments)
+        if message.id is not None:
+            self._ids[i] = message.id
+
+        self._length += 1
+
+    def extend(self, messages: Iterable[Message]):
+        """Append messages to the log."""
+        for message in messages:
+            self.append(message)
+
+    def copy(self) -> list[Message]:
+        """Return the messages of the log as list."""
+        return self[:]
+
+    @property
+    def senders(self) -> Any:
+        """Sender IDs of all messages, as NumPy array."""
+        return self._np.array(self._users, dtype=object)[self._sender[: self._length]]
+
+    @property
+    def lengths(self) -> Any:
+        """UTF-8 encoded content lengths of all messages, as NumPy array."""
+        return self._size[: self._length].copy()
+
+    @property
+    def timestamps(self) -> Any:
+        """Timestamps of all messages, as NumPy array."""
+        return self._timestamp[: self._length].copy()
+
+    def count(
+        self,
+        sender: str | None = None,
+        receiver: str | None = None,
+        start: int = 0,
+        end: int | None = None,
+        since: float | None = None,
+    ) -> int:
+        """Count messages matching all given filters.
+
+        Args:
+            sender: Only count messages from this sender.
+            receiver: Only count messages addressed to this receiver, e.g.
+                mentions of an owner.
+            start: Only count messages at this offset or later.
+            end: Only count messages before this offset. Defaults to the
+                length of the log.
+            since: Only count messages with a timestamp at or after this
+                time, in seconds since the epoch.
+
+        Returns:
+            Number of matching messages.
+        """
+        return int(self._np.count_nonzero(self._mask(sender, receiver, start, end, since)))
+
+    def indices(
+        self,
+        sender: str | None = None,
+        receiver: str | None = None,
+        start: int = 0,
+        end: int | None = None,
+        since: float | None = None,
+    ) -> Any:
+        """Offsets of messages matching all given filters.
+
+        Args are the same as for [`count()`][group_sense.columnar.ColumnarRoomLog.count].
+
+        Returns:
+            Ascending offsets of matching messages, as NumPy array.
+        """
+        start, end = self._bounds(start, end)
+        return self._np.flatnonzero(self._mask(sender, receiver, start, end, since)) + start
+
+    def counts_by_sender(self, start: int = 0, end: int | None = None) -> dict[str, int]:
+        """Number of messages per sender.
+
+        Args:
+            start: Only count messages at this offset or later.
+            end: Only count messages before this offset. Defaults to the
+                length of the log.
+
+        Returns:
+            Mapping of sender IDs to message counts, for senders with at least
+                one message in the range.
+        """
+        start, end = self._bounds(start, end)
+        counts = self._np.bincount(self._sender[start:end], minlength=len(self._users))
+        return {self._users[code]: int(counts[code]) for code in self._np.flatnonzero(counts)}
+
+    def _mask(
+        self,
+        sender: str | None,
+        receiver: str | None,
+        start: int,
+        end: int | None,
+        since: float | None,
+    ) -> Any:
+        start, end = self._bounds(start, end)
+        mask = self._np.ones(end - start, dtype=bool)
+        if sender is not None:
+            mask &= self._sender[start:end] == self._codes.get(sender, -2)
+        if receiver is not None:
+            mask &= self._receiver[start:end] == self._codes.get(receiver, -2)
+        if since is not None:
+            mask &= self._timestamp[start:end] >= since
+        return mask
+
+    def _bounds(self, start: int, end: int | None) -> tuple[int, int]:
+        end = self._length if end is None else min(end, self._length)
+        return min(max(start, 0), end), end
+
+    def _code(self, user: str) -> int:
+        if (code := self._codes.get(user)) is None:
+            code = self._codes[user] = len(self._users)
+            self._users.append(user)
+        return code
+
+    def _grow(self):
+        capacity = len(self._sender) * 2
+        for name in ("_sender", "_receiver", "_offset", "_size", "_timestamp"):
+            column = getattr(self, name)
+            grown = self._np.empty(capacity, dtype=column.dtype)
+            grown[: self._length] = column[: self._length]
+            setattr(self, name, grown)
+
+    def _view(self, i: int) -> Message:
+        offset = int(self._offset[i])
+        receiver = int(self._receiver[i])
+        return Message(
+            content=self._arena[offset : offset + int(self._size[i])].decode(),
+            sender=self._users[self._sender[i]],
+            receiver=None if receiver == -1 else self._users[receiver],
+            threads=self._threads.get(i, ()),
+            attachments=self._attachments.get(i, ()),
+            id=self._ids.get(i),
+        )
@@ -1,7 +1,9 @@
-from dataclasses import dataclass, field
+from collections.abc import Sequence
+from dataclasses import dataclass
+from sys import intern
 
 
-@dataclass
+@dataclass(slots=True)
 class Attachment:
     """Metadata for media or documents attached to group chat messages.
 
@@ -19,7 +21,7 @@ class Attachment:
     media_type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Thread:
     """Reference to a group chat thread other than the current one.
 
@@ -35,7 +37,7 @@ class Thread:
     messages: list["Message"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """A message in a group chat conversation.
 
@@ -43,20 +45,35 @@ class Message:
     Messages can optionally target specific recipients, reference other
     threads, and include attachments.
 
+    Messages are slotted and kept small, as large numbers of them are held
+    in memory across rooms: sender and receiver IDs are interned, and
+    threads and attachments are stored as tuples, sharing a single empty
+    tuple across the many messages without any.
+
     Attributes:
         content: The text content of the message.
         sender: User ID of the message sender.
         receiver: Optional user ID of the intended recipient. When set,
             indicates the message is directed at a specific user (e.g.,
             via @mention).
-        threads: List of referenced threads from other group chats. Used
-            for cross-conversation context.
-        attachments: List of media or document attachments accompanying
-            the message.
+        threads: Referenced threads from other group chats. Used for
+            cross-conversation context. Stored as a tuple.
+        attachments: Media or document attachments accompanying the
+            message. Stored as a tuple.
+        id: Optional unique message ID, e.g. assigned by the chat gateway.
+            Used to suppress redelivered duplicates of a message.
     """
 
     content: str
     sender: str
     receiver: str | None = None
-    threads: list[Thread] = field(default_factory=list)
-    attachments: list[Attachment] = field(default_factory=list)
+    threads: Sequence[Thread] = ()
+    attachments: Sequence[Attachment] = ()
+    id: str | None = None
+
+    def __post_init__(self):
+        self.sender = intern(self.sender)
+        if self.receiver is not None:
+            self.receiver = intern(self.receiver)
+        self.threads = tuple(self.threads)
+        self.attachments = tuple(self.attachments)
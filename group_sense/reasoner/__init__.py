@@ -1,3 +1,62 @@
-from group_sense.reasoner.base import Decision, GroupReasoner, GroupReasonerFactory, Response
-from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
-from group_sense.reasoner.default import DefaultGroupReasoner, DefaultGroupReasonerFactory
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from group_sense.reasoner.admission import Overload, RateLimit, ShedStats
+    from group_sense.reasoner.base import (
+        BatchGroupReasoner,
+        Decision,
+        GroupReasoner,
+        GroupReasonerFactory,
+        Response,
+        ResponseStream,
+        RoomSummary,
+    )
+    from group_sense.reasoner.batch import DefaultBatchGroupReasoner
+    from group_sense.reasoner.buffered import BufferedGroupReasoner
+    from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+    from group_sense.reasoner.default import DefaultGroupReasoner, DefaultGroupReasonerFactory
+    from group_sense.reasoner.profile import Profile
+    from group_sense.reasoner.prompt import PromptBudget
+    from group_sense.reasoner.summary import RoomSummarizer
+    from group_sense.reasoner.sync import SyncGroupReasoner
+    from group_sense.reasoner.validator import DecisionValidator
+
+# Submodules are imported on first access, so that importing a light submodule,
+# e.g. group_sense.reasoner.prompt, does not import pydantic-ai.
+_LAZY = {
+    "Overload": "group_sense.reasoner.admission",
+    "RateLimit": "group_sense.reasoner.admission",
+    "ShedStats": "group_sense.reasoner.admission",
+    "BatchGroupReasoner": "group_sense.reasoner.base",
+    "Decision": "group_sense.reasoner.base",
+    "GroupReasoner": "group_sense.reasoner.base",
+    "GroupReasonerFactory": "group_sense.reasoner.base",
+    "Response": "group_sense.reasoner.base",
+    "ResponseStream": "group_sense.reasoner.base",
+    "RoomSummary": "group_sense.reasoner.base",
+    "DefaultBatchGroupReasoner": "group_sense.reasoner.batch",
+    "BufferedGroupReasoner": "group_sense.reasoner.buffered",
+    "ConcurrentGroupReasoner": "group_sense.reasoner.concurrent",
+    "DefaultGroupReasoner": "group_sense.reasoner.default",
+    "DefaultGroupReasonerFactory": "group_sense.reasoner.default",
+    "Profile": "group_sense.reasoner.profile",
+    "PromptBudget": "group_sense.reasoner.prompt",
+    "RoomSummarizer": "group_sense.reasoner.summary",
+    "SyncGroupReasoner": "group_sense.reasoner.sync",
+    "DecisionValidator": "group_sense.reasoner.validator",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if (module := _LAZY.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,149 @@
+from asyncio import Future, Task
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+
+from group_sense.reasoner.base import Response
+
+
+class Overload(Enum):
+    """Shedding policy of a [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    when a trigger exceeds a pending limit.
+
+    Shed triggers never lose messages: a shed message remains in the shared
+    group chat messages and is seen by the next reasoner run of its sender.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    """Resolve the oldest waiting trigger with an IGNORE decision and admit the
+    new trigger. Rejects the new trigger if no trigger is waiting."""
+
+    MERGE = "merge"
+    """Merge the new trigger into its sender's latest waiting trigger, which then
+    also covers the new message. Both triggers resolve to the same response.
+    Rejects the new trigger if its sender has no waiting trigger."""
+
+    REJECT = "reject"
+    """Resolve the new trigger immediately with an IGNORE decision."""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket rate limit of reasoner runs.
+
+    A bucket holds up to `burst` tokens and is refilled at `rate` tokens per
+    second. Each reasoner run takes a token. Used by
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    to limit the runs per sender and per group chat.
+
+    Attributes:
+        rate: Number of tokens added per second.
+        burst: Maximum number of tokens, i.e. of runs started at once after
+            an idle period.
+    """
+
+    rate: float
+    burst: int = 1
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("Rate must be positive")
+        if self.burst < 1:
+            raise ValueError("Burst must be at least 1")
+
+
+class _TokenBucket:
+    def __init__(self, limit: RateLimit, now: float):
+        self._limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = now
+
+    def available(self, now: float) -> bool:
+        self._refill(now)
+        return self._tokens >= 1
+
+    def reserve(self, now: float) -> float:
+        """Take a token, possibly ahead of time, and return the delay until it is available."""
+        self._refill(now)
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self._limit.rate)
+
+    def _refill(self, now: float):
+        self._tokens = min(self._limit.burst, self._tokens + (now - self._updated) * self._limit.rate)
+        self._updated = now
+
+
+@dataclass
+class ShedStats:
+    """Numbers of shed and deferred triggers of a
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner].
+
+    Attributes:
+        dropped: Number of waiting triggers resolved with IGNORE to admit newer ones.
+        merged: Number of triggers merged into a waiting trigger, because of
+            a pending limit or an empty rate limit bucket.
+        rejected: Number of new triggers resolved with IGNORE.
+        deferred: Number of triggers whose run was delayed by a rate limit.
+            Deferred triggers are not shed and not included in `total`.
+        by_sender: Total number of shed triggers per sender.
+    """
+
+    dropped: int = 0
+    merged: int = 0
+    rejected: int = 0
+    deferred: int = 0
+    by_sender: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """Total number of shed triggers."""
+        return self.dropped + self.merged + self.rejected
+
+
+@dataclass(eq=False)
+class _Trigger:
+    """Trigger of a sender's reasoner run, pending until the run completes.
+
+    Holds the number of group chat messages the run covers instead of a copy
+    of the messages. The end can be extended until the run starts.
+    """
+
+    owner: str
+    end: int
+    futures: list[Future[Response]]
+    seq: int
+    task: Task | None = None
+    started: bool = False
+    # event loop time before which the run must not start (rate limits)
+    not_before: float = 0.0
+
+
+class _DedupIndex:
+    """Bounded index of recently seen message IDs.
+
+    Maps each ID to the future of its trigger, or `None` for messages added
+    without triggering. The least recently seen ID is evicted first.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._entries: OrderedDict[str, Future[Response] | None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._entries
+
+    def get(self, id: str) -> Future[Response] | None:
+        self._entries.move_to_end(id)
+        return self._entries[id]
+
+    def add(self, id: str, future: Future[Response] | None = None):
+        self._entries[id] = future
+        self._entries.move_to_end(id)
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
@@ -1,8 +1,14 @@
 import logging
 from abc import ABC, abstractmethod
+from asyncio import CancelledError, Queue, Task, create_task, get_running_loop, wait
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 
 from group_sense.message import Message
 
@@ -47,6 +53,138 @@ class Response(BaseModel):
         ),
     )
 
+    position: SkipJsonSchema[int | None] = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "Number of group chat messages the decision is based on. Set by "
+            "ConcurrentGroupReasoner, not part of the model output schema."
+        ),
+    )
+
+
+class _End:
+    def __init__(self, exception: BaseException | None = None):
+        self.exception = exception
+
+
+class ResponseStream(AsyncIterator[Response]):
+    """Asynchronous stream of partial responses of a single reasoning call.
+
+    Yields partial [`Response`][group_sense.reasoner.base.Response] objects
+    as soon as they can be parsed from the model output. The `decision` is
+    available from the first partial response on, followed by partial
+    responses with a growing `query`. The last yielded response is the
+    final response.
+
+    The reasoning call runs independently of iteration: the reasoner's state
+    is updated when the call completes, even if the consumer stops iterating
+    early (e.g. after seeing an IGNORE decision).
+
+    Example:
+        ```python
+        stream = reasoner.process_stream(updates)
+        async for partial in stream:
+            if partial.decision == Decision.IGNORE:
+                break
+            ...  # start downstream work on partial.query
+
+        response = await stream.response()
+        ```
+    """
+
+    def __init__(self):
+        self._queue: Queue[Response | _End] = Queue()
+        self._last: Response | None = None
+        self._final: Response | None = None
+        self._end: _End | None = None
+        self._task: Task | None = None
+
+    def put(self, response: Response):
+        """Add a partial response to the stream. Called by the producer."""
+        self._last = response
+        self._queue.put_nowait(response)
+
+    def complete(self, response: Response):
+        """Add the final response, unless equal to the last partial response, and end the stream.
+
+        Called by the producer.
+        """
+        self._final = response
+        if response != self._last:
+            self._queue.put_nowait(response)
+        self._queue.put_nowait(_End())
+
+    def fail(self, exception: BaseException):
+        """End the stream with an exception. Called by the producer."""
+        self._queue.put_nowait(_End(exception))
+
+    def attach(self, task: Task):
+        """Attach the producer task to keep a reference to it while the stream is in use."""
+        self._task = task
+
+    async def cancel(self):
+        """Cancel the reasoning call and wait until it has stopped.
+
+        Unlike stopping iteration early, this stops the call before it updates
+        the reasoner's state, unless the call has already completed.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await wait([self._task])
+
+    @property
+    def final(self) -> Response | None:
+        """The final response once the reasoning call has completed, otherwise `None`."""
+        return self._final
+
+    async def response(self) -> Response:
+        """Consume the remaining stream and return the final response.
+
+        Raises:
+            Exception: Any exception raised by the reasoning call.
+        """
+        async for _ in self:
+            pass
+        if self._final is None:
+            raise RuntimeError("Stream ended without response")
+        return self._final
+
+    def __aiter__(self) -> "ResponseStream":
+        return self
+
+    async def __anext__(self) -> Response:
+        if self._end is None:
+            item = await self._queue.get()
+            if isinstance(item, _End):
+                self._end = item
+            else:
+                return item
+
+        if self._end.exception is not None:
+            raise self._end.exception
+        raise StopAsyncIteration
+
+
+@dataclass
+class RoomSummary:
+    """Incremental summary of a prefix of the group chat messages.
+
+    Produced by a
+    [`RoomSummarizer`][group_sense.reasoner.summary.RoomSummarizer] once per
+    room and shared by all reasoner instances of that room. Reasoners that
+    lag behind receive the summary in place of the raw message backlog it
+    covers.
+
+    Attributes:
+        content: Summary text of the covered messages.
+        end: Number of group chat messages covered by the summary (i.e. the
+            summary covers messages with sequence numbers `0` to `end - 1`).
+    """
+
+    content: str
+    end: int
+
 
 class GroupReasoner(ABC):
     """Abstract protocol for incremental group chat message processing.
@@ -67,7 +205,7 @@ class GroupReasoner(ABC):
         ...
 
     @abstractmethod
-    async def process(self, updates: list[Message]) -> Response:
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
         """Process a message increment and decide whether to delegate.
 
         Analyzes new messages in the context of the entire conversation history
@@ -78,6 +216,12 @@ class GroupReasoner(ABC):
             updates: List of new messages to process as an increment. Must not
                 be empty. Represents messages that arrived since the last
                 [`process()`][group_sense.reasoner.base.GroupReasoner.process] call.
+                If a `summary` is given, represents messages that arrived after
+                the messages covered by the summary.
+            summary: Optional room summary that replaces the raw backlog between
+                [`processed`][group_sense.reasoner.base.GroupReasoner.processed]
+                and `summary.end`. Ignored if it doesn't cover messages beyond
+                those already processed.
 
         Returns:
             Response containing the triage decision and optional delegation
@@ -88,6 +232,219 @@ class GroupReasoner(ABC):
         """
         ...
 
+    def process_stream(self, updates: list[Message], summary: RoomSummary | None = None) -> ResponseStream:
+        """Process a message increment and stream partial responses.
+
+        Streaming variant of
+        [`process()`][group_sense.reasoner.base.GroupReasoner.process]. Must be
+        called from within a running event loop. The default implementation
+        yields the final response only. Implementations that support streaming
+        yield partial responses as soon as the decision is known.
+
+        Args:
+            updates: List of new messages to process as an increment. Must not
+                be empty.
+            summary: Optional room summary, as in
+                [`process()`][group_sense.reasoner.base.GroupReasoner.process].
+
+        Returns:
+            Stream of partial responses, ending with the final response.
+
+        Raises:
+            ValueError: If updates is empty.
+        """
+        if not updates:
+            raise ValueError("Updates must not be empty")
+
+        stream = ResponseStream()
+        stream.attach(create_task(self._process_stream(updates, summary, stream)))
+        return stream
+
+    async def _process_stream(self, updates: list[Message], summary: RoomSummary | None, stream: ResponseStream):
+        try:
+            if summary is None:
+                response = await self.process(updates)
+            else:
+                response = await self.process(updates, summary=summary)
+        except CancelledError as e:
+            stream.fail(e)
+            raise
+        except Exception as e:
+            stream.fail(e)
+        else:
+            stream.complete(response)
+
+    def get_serialized(self) -> dict[str, Any]:
+        """Serialize the reasoner's state for persistence.
+
+        The default implementation raises `NotImplementedError`. Reasoners
+        that support persistence override this method and
+        [`set_serialized()`][group_sense.reasoner.base.GroupReasoner.set_serialized].
+
+        Returns:
+            JSON-serializable dictionary containing the reasoner's state.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support serialization")
+
+    def set_serialized(self, state: dict[str, Any]):
+        """Restore the reasoner's state from serialized data.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.base.GroupReasoner.get_serialized].
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support serialization")
+
+    async def get_serialized_async(self, executor: Executor | None = None) -> dict[str, Any]:
+        """Serialize the reasoner's state without blocking the event loop.
+
+        Async variant of
+        [`get_serialized()`][group_sense.reasoner.base.GroupReasoner.get_serialized].
+        The default implementation runs `get_serialized()` in a thread.
+
+        Args:
+            executor: Thread pool executor to run serialization in. Defaults
+                to the event loop's default executor.
+
+        Returns:
+            JSON-serializable dictionary containing the reasoner's state.
+        """
+        return await get_running_loop().run_in_executor(executor, self.get_serialized)
+
+    async def set_serialized_async(self, state: dict[str, Any], executor: Executor | None = None):
+        """Restore the reasoner's state without blocking the event loop.
+
+        Async variant of
+        [`set_serialized()`][group_sense.reasoner.base.GroupReasoner.set_serialized].
+        The default implementation runs `set_serialized()` in a thread. Must
+        not be called while the reasoner is processing messages.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.base.GroupReasoner.get_serialized].
+            executor: Thread pool executor to run deserialization in. Defaults
+                to the event loop's default executor.
+        """
+        await get_running_loop().run_in_executor(executor, self.set_serialized, state)
+
+    def get_serialized_delta(self) -> dict[str, Any]:
+        """Serialize the changes of the reasoner's state since the last delta.
+
+        The default implementation returns the full state from
+        [`get_serialized()`][group_sense.reasoner.base.GroupReasoner.get_serialized].
+        Reasoners with append-only state override this method to return
+        incremental deltas.
+
+        Returns:
+            JSON-serializable dictionary that can be applied with
+                [`apply_serialized_delta()`][group_sense.reasoner.base.GroupReasoner.apply_serialized_delta].
+        """
+        return self.get_serialized()
+
+    def apply_serialized_delta(self, delta: dict[str, Any]):
+        """Apply a serialized delta to the reasoner's state.
+
+        The default implementation restores the full state with
+        [`set_serialized()`][group_sense.reasoner.base.GroupReasoner.set_serialized].
+
+        Args:
+            delta: Dictionary containing a serialized delta from
+                [`get_serialized_delta()`][group_sense.reasoner.base.GroupReasoner.get_serialized_delta].
+        """
+        self.set_serialized(delta)
+
+
+class BatchGroupReasoner(ABC):
+    """Abstract protocol for deciding on behalf of multiple owners in a single call.
+
+    Defines the interface for reasoners that process group chat messages
+    incrementally, like [`GroupReasoner`][group_sense.reasoner.base.GroupReasoner],
+    but return a separate decision for each of several owners at once. Used by
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    to serve triggers from different senders that arrive at nearly the same
+    time with a single model call.
+    """
+
+    @property
+    @abstractmethod
+    def processed(self) -> int:
+        """Number of messages processed so far by this reasoner."""
+        ...
+
+    @abstractmethod
+    async def process(
+        self,
+        updates: list[Message],
+        owners: list[str],
+        summary: RoomSummary | None = None,
+    ) -> dict[str, Response]:
+        """Process a message increment and decide for each owner whether to delegate.
+
+        Args:
+            updates: List of new messages to process as an increment. Must not
+                be empty. Represents messages that arrived since the last
+                [`process()`][group_sense.reasoner.base.BatchGroupReasoner.process] call,
+                or since the end of `summary` if a summary is used.
+            owners: User IDs of the owners to decide for. Must not be empty.
+            summary: Optional room summary that replaces the raw backlog between
+                [`processed`][group_sense.reasoner.base.BatchGroupReasoner.processed]
+                and `summary.end`.
+
+        Returns:
+            Mapping from each owner to the triage decision made on their behalf.
+
+        Raises:
+            ValueError: If updates or owners is empty.
+        """
+        ...
+
+    def get_serialized(self) -> dict[str, Any]:
+        """Serialize the reasoner's state for persistence.
+
+        The default implementation raises `NotImplementedError`. Reasoners
+        that support persistence override this method and
+        [`set_serialized()`][group_sense.reasoner.base.BatchGroupReasoner.set_serialized].
+
+        Returns:
+            JSON-serializable dictionary containing the reasoner's state.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support serialization")
+
+    def set_serialized(self, state: dict[str, Any]):
+        """Restore the reasoner's state from serialized data.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.base.BatchGroupReasoner.get_serialized].
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support serialization")
+
+    def get_serialized_delta(self) -> dict[str, Any]:
+        """Serialize the changes of the reasoner's state since the last delta.
+
+        The default implementation returns the full state from
+        [`get_serialized()`][group_sense.reasoner.base.BatchGroupReasoner.get_serialized].
+        Reasoners with append-only state override this method to return
+        incremental deltas.
+
+        Returns:
+            JSON-serializable dictionary that can be applied with
+                [`apply_serialized_delta()`][group_sense.reasoner.base.BatchGroupReasoner.apply_serialized_delta].
+        """
+        return self.get_serialized()
+
+    def apply_serialized_delta(self, delta: dict[str, Any]):
+        """Apply a serialized delta to the reasoner's state.
+
+        The default implementation restores the full state with
+        [`set_serialized()`][group_sense.reasoner.base.BatchGroupReasoner.set_serialized].
+
+        Args:
+            delta: Dictionary containing a serialized delta from
+                [`get_serialized_delta()`][group_sense.reasoner.base.BatchGroupReasoner.get_serialized_delta].
+        """
+        self.set_serialized(delta)
+
 
 class GroupReasonerFactory(ABC):
     """Abstract factory protocol for creating GroupReasoner instances.
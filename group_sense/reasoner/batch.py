@@ -0,0 +1,193 @@
+import logging
+from typing import Any
+
+from pydantic import BaseModel, Field
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter
+from pydantic_ai.models import Model
+from pydantic_ai.models.google import GoogleModelSettings
+from pydantic_ai.settings import ModelSettings
+from pydantic_core import to_jsonable_python
+
+from group_sense.message import Message
+from group_sense.reasoner.base import BatchGroupReasoner, Decision, Response, RoomSummary
+from group_sense.reasoner.prompt import PromptBudget, PromptCache, format_owners, user_prompt
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT_TEMPLATE = """You make triage decisions on behalf of several owners at once.
+
+The owners to decide for are listed in an <owners> element at the start of each
+request. For each listed owner, follow the instructions below from the perspective
+of that owner, where {{owner}} stands for the owner's user ID. Decide independently
+for each owner and return exactly one response per listed owner.
+
+<instructions>
+{instructions}
+</instructions>"""
+
+
+class OwnerResponse(Response):
+    """Triage decision made on behalf of a single owner in a batched call."""
+
+    owner: str = Field(description="User ID of the owner this decision is made for.")
+
+
+class BatchResponse(BaseModel):
+    """Triage decisions for all owners of a batched call."""
+
+    responses: list[OwnerResponse] = Field(description="One response per owner listed in the request.")
+
+
+class DefaultBatchGroupReasoner(BatchGroupReasoner):
+    """Group chat message processor that decides for multiple owners in one call.
+
+    Counterpart of [`DefaultGroupReasoner`][group_sense.reasoner.default.DefaultGroupReasoner]
+    for batched triggers. Derives a multi-owner system prompt from an owner
+    system prompt template and asks the model once for a list of per-owner
+    responses. Maintains its own conversation history across
+    [`process()`][group_sense.reasoner.base.BatchGroupReasoner.process] calls.
+
+    Example:
+        ```python
+        template = "You are assisting {owner} in a group chat..."
+        reasoner = DefaultBatchGroupReasoner(system_prompt_template=template)
+        responses = await reasoner.process([message1, message2], owners=["alice", "bob"])
+        ```
+    """
+
+    def __init__(
+        self,
+        system_prompt_template: str,
+        model: str | Model | None = None,
+        model_settings: ModelSettings | None = None,
+        prompt_budget: PromptBudget | None = None,
+    ):
+        """Initialize the reasoner with an owner system prompt template.
+
+        Args:
+            system_prompt_template: Template string containing an {owner}
+                placeholder, as used by
+                [`DefaultGroupReasonerFactory`][group_sense.reasoner.default.DefaultGroupReasonerFactory].
+            model: Optional AI model to use. Defaults to "google-gla:gemini-3-flash-preview".
+                Can be a model name string or a pydantic-ai Model instance.
+            model_settings: Optional model-specific settings. Defaults to
+                GoogleModelSettings with thinking enabled.
+            prompt_budget: Optional token budget of the user prompts. Large
+                updates are truncated and elided to fit into the budget, see
+                [`PromptBudget`][group_sense.reasoner.prompt.PromptBudget].
+
+        Raises:
+            ValueError: If the template does not contain an {owner} placeholder.
+        """
+        if "{owner}" not in system_prompt_template:
+            raise ValueError("System prompt template must contain an {owner} placeholder")
+
+        instructions = system_prompt_template.format(owner="{owner}")
+        system_prompt = SYSTEM_PROMPT_TEMPLATE.format(instructions=instructions)
+
+        self._history: list[ModelMessage] = []
+        self._processed: int = 0
+        self._prompt_budget = prompt_budget
+        self._prompt_cache = PromptCache()
+        self._agent = Agent(
+            system_prompt=system_prompt,
+            output_type=NativeOutput(BatchResponse),
+            model=model or "google-gla:gemini-3-flash-preview",
+            model_settings=model_settings
+            or GoogleModelSettings(
+                google_thinking_config={
+                    "thinking_level": "high",
+                    "include_thoughts": True,
+                }
+            ),
+        )
+
+    @property
+    def processed(self) -> int:
+        return self._processed
+
+    async def process(
+        self,
+        updates: list[Message],
+        owners: list[str],
+        summary: RoomSummary | None = None,
+    ) -> dict[str, Response]:
+        """Process a message increment and decide for each owner whether to delegate.
+
+        Owners for which the model returns no response are assigned an IGNORE
+        decision. Responses for owners that were not requested are discarded.
+
+        Args:
+            updates: List of new messages to process as an increment. Must not
+                be empty.
+            owners: User IDs of the owners to decide for. Must not be empty.
+            summary: Optional room summary that is rendered into the prompt in
+                place of the raw messages between the processed count and
+                `summary.end`.
+
+        Returns:
+            Mapping from each owner to the triage decision made on their behalf.
+
+        Raises:
+            ValueError: If updates or owners is empty.
+        """
+        if not updates:
+            raise ValueError("Updates must not be empty")
+        if not owners:
+            raise ValueError("Owners must not be empty")
+
+        if summary is None or summary.end <= self._processed:
+            summary = None
+            start_seq_nr = self._processed
+        else:
+            start_seq_nr = summary.end
+
+        updates_prompt = user_prompt(updates, start_seq_nr, summary, self._prompt_budget, self._prompt_cache)
+        reasoner_prompt = "\n\n".join([format_owners(owners), updates_prompt])
+        logger.debug(f"Batch reasoner prompt:\n{reasoner_prompt}")
+        result = await self._agent.run(reasoner_prompt, message_history=self._history)
+        self._history = result.all_messages()
+        self._processed = start_seq_nr + len(updates)
+
+        responses: dict[str, Response] = {}
+        for owner_response in result.output.responses:
+            if owner_response.owner not in owners:
+                logger.warning(f"Batch reasoner returned response for unknown owner {owner_response.owner}")
+                continue
+            response = Response(
+                decision=owner_response.decision,
+                query=owner_response.query,
+                receiver=owner_response.receiver or None,
+            )
+            responses.setdefault(owner_response.owner, response)
+
+        for owner in owners:
+            if owner not in responses:
+                logger.warning(f"Batch reasoner returned no response for owner {owner}")
+                responses[owner] = Response(decision=Decision.IGNORE)
+
+        return responses
+
+    def get_serialized(self) -> dict[str, Any]:
+        """Serialize the reasoner's state for persistence.
+
+        Returns:
+            Dictionary containing serialized conversation history and processed
+                message count.
+        """
+        return {
+            "agent": to_jsonable_python(self._history, bytes_mode="base64"),
+            "processed": self._processed,
+        }
+
+    def set_serialized(self, state: dict[str, Any]):
+        """Restore the reasoner's state from serialized data.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.batch.DefaultBatchGroupReasoner.get_serialized].
+        """
+        self._history = ModelMessagesTypeAdapter.validate_python(state["agent"])
+        self._processed = state["processed"]
@@ -0,0 +1,250 @@
+import logging
+import math
+from asyncio import CancelledError, Event, Future, Task, create_task, get_running_loop, wait_for
+from dataclasses import dataclass
+
+from group_sense.message import Message
+from group_sense.reasoner.base import GroupReasoner, Response, RoomSummary
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Item:
+    message: Message
+    future: Future[Response]
+    arrival: float
+    summary: RoomSummary | None = None
+
+
+class BufferedGroupReasoner(GroupReasoner):
+    """Buffered front-end of a group reasoner with adaptive batch sizes.
+
+    Accepts single messages via
+    [`submit()`][group_sense.reasoner.buffered.BufferedGroupReasoner.submit]
+    and forwards them in batches to the wrapped reasoner. Messages accumulate
+    while a call of the wrapped reasoner is in flight, and a batch is flushed
+    when it reaches the current target batch size or when its oldest message
+    has waited `max_wait` seconds, whichever comes first.
+
+    The target batch size adapts to load: it is the number of messages
+    expected to arrive during one call of the wrapped reasoner, estimated
+    from the observed arrival rate and call latency, clamped to
+    `[1, max_size]`. Under low load, messages are forwarded individually for
+    low latency. Under high load, batches grow so that throughput tracks the
+    arrival rate. No message is dropped: each message is forwarded in exactly
+    one batch, and its Future resolves to the response for that batch.
+
+    Example:
+        ```python
+        reasoner = BufferedGroupReasoner(DefaultGroupReasoner(system_prompt="..."))
+
+        future1 = reasoner.submit(message1)
+        future2 = reasoner.submit(message2)
+
+        # Futures of messages in the same batch resolve to the same response
+        response1 = await future1
+        response2 = await future2
+        ```
+    """
+
+    def __init__(
+        self,
+        reasoner: GroupReasoner,
+        max_wait: float = 1.0,
+        max_size: int = 20,
+        smoothing: float = 0.2,
+    ):
+        """Initialize the buffered reasoner with a wrapped reasoner and batching limits.
+
+        Args:
+            reasoner: Reasoner that processes the batches. Must not be used
+                directly while wrapped.
+            max_wait: Maximum time in seconds a message waits in the buffer
+                before its batch is flushed, unless a call is in flight.
+            max_size: Maximum number of messages per batch.
+            smoothing: Smoothing factor in `(0, 1]` of the exponential moving
+                averages of message inter-arrival time and call latency.
+                Higher values adapt faster.
+
+        Raises:
+            ValueError: If max_wait is negative, max_size is less than 1 or
+                smoothing is not in `(0, 1]`.
+        """
+        if max_wait < 0:
+            raise ValueError("Max wait must not be negative")
+        if max_size < 1:
+            raise ValueError("Max size must be at least 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError("Smoothing must be in (0, 1]")
+
+        self._reasoner = reasoner
+        self._max_wait = max_wait
+        self._max_size = max_size
+        self._smoothing = smoothing
+
+        self._buffer: list[_Item] = []
+        self._buffer_event = Event()
+        self._in_flight: int = 0
+        self._task: Task | None = None
+
+        self._last_arrival: float | None = None
+        self._interval: float | None = None
+        self._latency: float | None = None
+
+    @property
+    def processed(self) -> int:
+        """Number of messages accepted so far, including buffered and in-flight messages."""
+        return self._reasoner.processed + self.pending
+
+    @property
+    def pending(self) -> int:
+        """Number of messages accepted but not yet processed by the wrapped reasoner."""
+        return len(self._buffer) + self._in_flight
+
+    @property
+    def batch_size(self) -> int:
+        """Current target batch size derived from arrival rate and call latency."""
+        if self._interval is None or self._latency is None:
+            return 1
+        if self._interval == 0:
+            return self._max_size
+        return max(1, min(self._max_size, math.ceil(self._latency / self._interval)))
+
+    def submit(self, message: Message) -> Future[Response]:
+        """Submit a single message for buffered processing.
+
+        Must be called from within a running event loop.
+
+        Args:
+            message: Message to process.
+
+        Returns:
+            Future that resolves to the response for the batch that contains
+                the message.
+        """
+        return self._submit([message])[-1]
+
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+        """Submit a message increment and wait for the response of its last message.
+
+        The updates may be forwarded to the wrapped reasoner together with
+        other buffered messages, or split across batches if they exceed the
+        maximum batch size.
+
+        Args:
+            updates: List of new messages to process. Must not be empty.
+            summary: Optional room summary forwarded with the batch that starts
+                with the first message of `updates`.
+
+        Returns:
+            Response for the batch that contains the last message of `updates`.
+
+        Raises:
+            ValueError: If updates is empty.
+        """
+        if not updates:
+            raise ValueError("Updates must not be empty")
+        futures = self._submit(updates, summary)
+        return await futures[-1]
+
+    def _submit(self, messages: list[Message], summary: RoomSummary | None = None) -> list[Future[Response]]:
+        loop = get_running_loop()
+        now = loop.time()
+
+        futures = []
+        for i, message in enumerate(messages):
+            self._arrived(now)
+            item = _Item(
+                message=message,
+                future=loop.create_future(),
+                arrival=now,
+                summary=summary if i == 0 else None,
+            )
+            self._buffer.append(item)
+            futures.append(item.future)
+
+        self._buffer_event.set()
+        if self._task is None:
+            self._task = create_task(self._flush_loop())
+        return futures
+
+    def _arrived(self, now: float):
+        if self._last_arrival is not None:
+            self._interval = self._average(self._interval, now - self._last_arrival)
+        self._last_arrival = now
+
+    def _average(self, current: float | None, sample: float) -> float:
+        if current is None:
+            return sample
+        return self._smoothing * sample + (1 - self._smoothing) * current
+
+    async def _flush_loop(self):
+        loop = get_running_loop()
+        try:
+            while self._buffer:
+                await self._fill()
+                batch = self._next_batch()
+
+                self._in_flight = len(batch)
+                start = loop.time()
+                try:
+                    await self._flush(batch)
+                finally:
+                    self._in_flight = 0
+                self._latency = self._average(self._latency, loop.time() - start)
+        except CancelledError:
+            for item in self._buffer:
+                item.future.cancel()
+            self._buffer.clear()
+            raise
+        finally:
+            self._task = None
+
+    async def _fill(self):
+        loop = get_running_loop()
+        deadline = self._buffer[0].arrival + self._max_wait
+        while len(self._buffer) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._buffer_event.clear()
+            try:
+                await wait_for(self._buffer_event.wait(), remaining)
+            except TimeoutError:
+                break
+
+    def _next_batch(self) -> list[_Item]:
+        size = min(len(self._buffer), self.batch_size)
+        # a summary applies to the first message of a batch only
+        for i in range(1, size):
+            if self._buffer[i].summary is not None:
+                size = i
+                break
+
+        batch = self._buffer[:size]
+        del self._buffer[:size]
+        return batch
+
+    async def _flush(self, batch: list[_Item]):
+        updates = [item.message for item in batch]
+        summary = batch[0].summary
+        logger.debug(f"Flushing batch of {len(batch)} messages (target size {self.batch_size})")
+
+        try:
+            if summary is not None:
+                response = await self._reasoner.process(updates, summary=summary)
+            else:
+                response = await self._reasoner.process(updates)
+        except CancelledError:
+            for item in batch:
+                item.future.cancel()
+            raise
+        except Exception as e:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+        else:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_result(response)
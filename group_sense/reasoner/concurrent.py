@@ -1,7 +1,92 @@
-from asyncio import Future, Lock, create_task
+import logging
+from asyncio import (
+    CancelledError,
+    Future,
+    Lock,
+    Queue,
+    Semaphore,
+    Task,
+    create_task,
+    gather,
+    get_running_loop,
+    sleep,
+    wait,
+)
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Container, Iterable
+from contextlib import AsyncExitStack
+from dataclasses import replace
+from functools import partial
+from itertools import count
+from typing import TYPE_CHECKING, Any
 
+from pydantic import TypeAdapter
+
+from group_sense.columnar import ColumnarRoomLog
 from group_sense.message import Message
-from group_sense.reasoner.base import GroupReasoner, GroupReasonerFactory, Response
+from group_sense.reasoner.admission import Overload, RateLimit, ShedStats, _DedupIndex, _TokenBucket, _Trigger
+from group_sense.reasoner.base import (
+    BatchGroupReasoner,
+    Decision,
+    GroupReasoner,
+    GroupReasonerFactory,
+    Response,
+    ResponseStream,
+    RoomSummary,
+)
+from group_sense.storage.blob import BlobStore, expand, release
+from group_sense.storage.blob import deduplicate as deduplicate_state
+from group_sense.storage.sqlite import SQLiteStore
+from group_sense.storage.wal import WriteAheadLog
+
+if TYPE_CHECKING:
+    from group_sense.reasoner.summary import RoomSummarizer
+    from group_sense.reasoner.validator import DecisionValidator
+
+logger = logging.getLogger(__name__)
+
+_message_adapter = TypeAdapter(Message)
+_messages_adapter = TypeAdapter(list[Message])
+
+
+def _convert_states(
+    states: dict[str, dict[str, Any]],
+    restored: set[str],
+    source: BlobStore | None,
+    target: BlobStore | None,
+) -> dict[str, dict[str, Any]]:
+    result = {}
+    for owner, state in states.items():
+        if source is not None and owner in restored:
+            state = expand(state, source)
+        result[owner] = deduplicate_state(state, target) if target is not None else state
+    return result
+
+
+def _positioned(response: Response, position: int) -> Response:
+    return response.model_copy(update={"position": position})
+
+
+def _fail_cancelled(stream: ResponseStream, future: Future[Response] | None, task: Task):
+    if task.cancelled():
+        stream.fail(CancelledError())
+        if future is not None:
+            future.cancel()
+
+
+def _complete_stream(stream: ResponseStream, future: Future[Response]):
+    if future.cancelled():
+        stream.fail(CancelledError())
+    elif (exc := future.exception()) is not None:
+        stream.fail(exc)
+    else:
+        stream.complete(future.result())
+
+
+def _retrieve_exception(future: Future[Response]):
+    # futures of streamed messages are only awaited by duplicates
+    if not future.cancelled():
+        future.exception()
 
 
 class ConcurrentGroupReasoner:
@@ -39,23 +124,222 @@ class ConcurrentGroupReasoner:
         ```
     """
 
-    def __init__(self, factory: GroupReasonerFactory):
+    def __init__(
+        self,
+        factory: GroupReasonerFactory,
+        summarizer: "RoomSummarizer | None" = None,
+        batch_reasoner: BatchGroupReasoner | None = None,
+        batch_window: float = 0.02,
+        wal: WriteAheadLog | None = None,
+        store: SQLiteStore | None = None,
+        room: str | None = None,
+        max_pending: int | None = None,
+        max_pending_per_sender: int | None = None,
+        overload: Overload | str = Overload.MERGE,
+        sender_rate_limit: RateLimit | Callable[[str], RateLimit | None] | None = None,
+        room_rate_limit: RateLimit | None = None,
+        validator: "DecisionValidator | None" = None,
+        dedup_size: int = 10_000,
+        columnar: bool = False,
+    ):
         """Initialize the concurrent reasoner with a factory.
 
         Args:
             factory: Factory used to create per-sender reasoner instances.
                 Each unique sender gets their own reasoner created via this
                 factory.
+            summarizer: Optional room summarizer. When set, the shared group
+                chat messages are summarized once per window for all reasoner
+                instances, and reasoner instances that lag behind the summary
+                receive it in place of the raw message backlog.
+            batch_reasoner: Optional multi-owner reasoner that enables
+                micro-batching. When set, triggers arriving within
+                `batch_window` are collected, and triggers from different
+                senders are decided by a single call of this reasoner instead
+                of one call per sender.
+            batch_window: Time in seconds to collect triggers after the first
+                trigger of a batch. Only used if `batch_reasoner` is set.
+            wal: Optional write-ahead log. When set, each message and each
+                completed reasoner turn is recorded in the log, and responses
+                resolve only after the turn is durable. After a crash, the
+                group chat state is rebuilt with
+                [`recover()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.recover].
+            store: Optional store. When set, messages, reasoner turns and the
+                states of the summarizer and batch reasoner are written to the
+                store under `room`. A room is restored with
+                [`load()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.load],
+                and the state of a reasoner instance is loaded from the store
+                only when its owner sends the next message.
+            room: ID of the group chat in the store. Required if `store` is set.
+            max_pending: Optional maximum number of pending triggers of the
+                group chat. A trigger is pending from
+                [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process]
+                until its reasoner run completes. Pending limits and rate
+                limits do not apply to
+                [`process_stream()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process_stream].
+            max_pending_per_sender: Optional maximum number of pending triggers
+                per sender.
+            overload: Shedding policy for triggers that exceed a pending limit.
+                Shed triggers are counted in
+                [`shed`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.shed].
+            sender_rate_limit: Optional rate limit of reasoner runs per sender,
+                or a function that returns the rate limit of a sender (or
+                `None` for no limit), e.g. to configure different limits for
+                admins and guests. When a sender's bucket is empty, a new
+                trigger is merged into the sender's waiting trigger, if any,
+                or its run is deferred until a token is available.
+            room_rate_limit: Optional rate limit of reasoner runs of the group
+                chat, applied like `sender_rate_limit`.
+            validator: Optional validator that re-validates stale DELEGATE
+                decisions of
+                [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process]
+                against the messages added during the reasoner run, before
+                they are returned. Required by
+                [`revalidate()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.revalidate].
+            dedup_size: Number of most recently seen message IDs that are
+                remembered to suppress duplicates. Messages without an ID
+                are never considered duplicates.
+            columnar: Whether to store group chat messages in a
+                [`ColumnarRoomLog`][group_sense.columnar.ColumnarRoomLog]
+                instead of a list, for vectorized scans over the history with
+                [`messages`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.messages].
+                Requires the optional `columnar` dependencies
+                (`pip install group-sense[columnar]`).
+
+        Raises:
+            ValueError: If store is set without room, if a pending limit or
+                dedup_size is less than 1, or if a pending limit or rate limit
+                is set together with a batch reasoner.
         """
+        if store is not None and room is None:
+            raise ValueError("Room must be set if store is set")
+        if dedup_size < 1:
+            raise ValueError("Dedup size must be at least 1")
+        for limit in (max_pending, max_pending_per_sender):
+            if limit is not None and limit < 1:
+                raise ValueError("Pending limits must be at least 1")
+        if batch_reasoner is not None and (max_pending is not None or max_pending_per_sender is not None):
+            raise ValueError("Pending limits are not supported with a batch reasoner")
+        if batch_reasoner is not None and (sender_rate_limit is not None or room_rate_limit is not None):
+            raise ValueError("Rate limits are not supported with a batch reasoner")
+
         self._factory = factory
-        self._messages: list[Message] = []
+        self._summarizer = summarizer
+        self._summary_task: Task | None = None
+        self._columnar = columnar
+        self._messages = self._log()
         self._reasoner: dict[str, tuple[GroupReasoner, Lock]] = {}
+        self._states: dict[str, dict[str, Any]] = {}
+        # blob store of deduplicated states, if restored from a deduplicated snapshot
+        self._blobs: BlobStore | None = None
+        self._tasks: set[Task] = set()
+        self._owner_tasks: dict[str, set[Task]] = {}
+        self._closed = False
+
+        self._batch_reasoner = batch_reasoner
+        self._batch_window = batch_window
+        self._batch_lock = Lock()
+        self._batch: list[tuple[str, Future[Response]]] = []
+        self._batch_task: Task | None = None
+
+        self._wal = wal
+        self._store = store
+        self._room = room
+        # owners whose state has not been loaded from the store yet
+        self._unloaded: set[str] = set()
+
+        self._max_pending = max_pending
+        self._max_pending_per_sender = max_pending_per_sender
+        self._overload = Overload(overload)
+        # pending triggers of process() by owner, in arrival order
+        self._pending: dict[str, deque[_Trigger]] = {}
+        self._num_pending = 0
+        self._trigger_seq = count()
+        self._shed = ShedStats()
+
+        if isinstance(sender_rate_limit, RateLimit):
+            sender_limit = sender_rate_limit
+            self._sender_rate_limit: Callable[[str], RateLimit | None] | None = lambda _: sender_limit
+        else:
+            self._sender_rate_limit = sender_rate_limit
+        self._room_rate_limit = room_rate_limit
+        self._validator = validator
+        self._seen = _DedupIndex(dedup_size)
+        self._duplicates = 0
+        self._sender_buckets: dict[str, _TokenBucket | None] = {}
+        self._room_bucket: _TokenBucket | None = None
 
     @property
-    def messages(self) -> list[Message]:
-        """The shared list of all group chat messages stored internally."""
+    def messages(self) -> list[Message] | ColumnarRoomLog:
+        """The shared list of all group chat messages stored internally.
+
+        A [`ColumnarRoomLog`][group_sense.columnar.ColumnarRoomLog] if the
+        reasoner was created with `columnar=True`.
+        """
         return self._messages
 
+    @property
+    def pending(self) -> int:
+        """Number of pending triggers of [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process]."""
+        return self._num_pending
+
+    @property
+    def shed(self) -> ShedStats:
+        """Numbers of triggers shed because a pending limit was exceeded."""
+        return replace(self._shed, by_sender=dict(self._shed.by_sender))
+
+    @property
+    def duplicates(self) -> int:
+        """Number of suppressed duplicate messages."""
+        return self._duplicates
+
+    def is_stale(self, response: Response, senders: Container[str] | None = None) -> bool:
+        """Whether messages were added to the group chat after a decision was made.
+
+        A slow reasoner run may return a decision after the group chat has
+        moved on, e.g. after a question was answered by another user or by an
+        assistant message. Responses of this reasoner carry the number of
+        group chat messages they are based on as
+        [`position`][group_sense.reasoner.base.Response].
+
+        Args:
+            response: Response of this reasoner.
+            senders: If set, only messages of these senders count, e.g. the
+                sender of assistant messages added with
+                [`append()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.append].
+
+        Returns:
+            Whether messages (of `senders`) were added after the response's position.
+
+        Raises:
+            ValueError: If the response has no position, e.g. because it was shed.
+        """
+        if response.position is None:
+            raise ValueError("Response has no position")
+        newer = self._messages[response.position :]
+        return any(senders is None or message.sender in senders for message in newer)
+
+    async def revalidate(self, response: Response) -> Response:
+        """Re-validate a stale DELEGATE decision against the messages added after it.
+
+        Typically called right before starting a downstream call for a
+        decision that has been queued for some time.
+
+        Args:
+            response: Response of this reasoner.
+
+        Returns:
+            The response itself if it is an IGNORE decision or not stale,
+                otherwise the response of the validator, positioned at the
+                current number of group chat messages.
+
+        Raises:
+            ValueError: If no validator is set or the response has no position.
+        """
+        if self._validator is None:
+            raise ValueError("Revalidation requires a validator")
+        return await self._validated(response)
+
     def append(self, message: Message):
         """Add a message to the shared group chat context without triggering reasoning.
 
@@ -67,8 +351,17 @@ class ConcurrentGroupReasoner:
         Args:
             message: Message to add to the shared group chat context. Typically
                 messages with sender="system" or other AI-generated content.
+
+        Raises:
+            RuntimeError: If the reasoner is closed.
         """
+        self._check_open()
+        if self._duplicate(message):
+            return
         self._messages.append(message)
+        self._record_message(message, trigger=False)
+        self._remember(message)
+        self._summarize()
 
     def process(self, message: Message) -> Future[Response]:
         """Process a message and return a Future for the reasoning result.
@@ -85,6 +378,20 @@ class ConcurrentGroupReasoner:
         sequentially to prevent concurrent state corruption to that sender's
         reasoner instance.
 
+        In batching mode, the message's trigger is first collected with other
+        triggers arriving within the batch window. Triggers from a single sender
+        are processed by that sender's reasoner instance, triggers from multiple
+        senders by the batch reasoner in a single call. Multiple triggers from
+        the same sender within a batch window resolve to the same response.
+
+        If a pending limit is set and exceeded, the trigger is shed according
+        to the overload policy: it is merged into a waiting trigger of the same
+        sender, or the oldest waiting trigger or the new trigger is resolved
+        immediately with an IGNORE decision. If a rate limit bucket is empty,
+        the trigger is merged into a waiting trigger of the same sender, or its
+        run is deferred. The message is added to the shared group chat
+        messages in any case.
+
         Args:
             message: User message to process. The sender field determines which
                 reasoner instance is triggered.
@@ -94,6 +401,9 @@ class ConcurrentGroupReasoner:
                 and optional delegation parameters. Use await or asyncio utilities
                 to retrieve the result.
 
+        Raises:
+            RuntimeError: If the reasoner is closed.
+
         Example:
             ```python
             # Store messages internally in arrival order, process concurrently
@@ -105,19 +415,900 @@ class ConcurrentGroupReasoner:
             # Processing: msg1 and msg2 run concurrently, msg3 waits for msg1
             ```
         """
+        self._check_open()
+        if self._duplicate(message):
+            return self._original_future(message)
         self._messages.append(message)
+        self._record_message(message, trigger=True)
+        self._summarize()
+
+        future = self._trigger(message.sender)
+        self._remember(message, future)
+        return future
+
+    def _trigger(self, sender: str) -> Future[Response]:
+        if self._batch_reasoner is not None:
+            return self._enqueue(sender)
+
+        future: Future[Response] = get_running_loop().create_future()
+        if self._overloaded(sender) and self._shed_trigger(sender, future):
+            return future
+        if self._rate_limited(sender) and self._merge(sender, future):
+            return future
+
+        trigger = _Trigger(sender, len(self._messages), [future], next(self._trigger_seq))
+        trigger.not_before = self._reserve(sender)
+        self._submit(trigger)
+        return future
+
+    def process_iter(
+        self,
+        messages: AsyncIterable[Message],
+        ordered: bool = False,
+        max_pending: int = 100,
+    ) -> AsyncIterator[tuple[Message, Response]]:
+        """Process a stream of messages and iterate over their responses.
+
+        Consumes `messages` and calls
+        [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process]
+        for each message in arrival order, so the internal message order
+        matches the source. Responses are yielded together with their
+        messages, either as soon as they complete or in arrival order.
+
+        At most `max_pending` messages are in flight: processed messages whose
+        responses have not been consumed yet, including completed responses
+        waiting for a slow consumer. When this limit is reached, no further
+        messages are pulled from the source until a response is consumed, so
+        a high-rate source cannot grow internal buffers without bound.
+
+        Iteration ends after the responses of all source messages have been
+        yielded. If the source or a reasoner call raises an exception, it is
+        raised by the iterator. Messages that are already processed when the
+        consumer stops iterating are still processed to completion.
+
+        Args:
+            messages: Asynchronous source of user messages.
+            ordered: Whether to yield responses in message arrival order
+                instead of completion order. In arrival order, a slow
+                response delays the responses of later messages.
+            max_pending: Maximum number of messages whose responses have not
+                been consumed yet.
+
+        Returns:
+            Asynchronous iterator of (message, response) tuples.
+
+        Raises:
+            ValueError: If max_pending is less than 1.
+
+        Example:
+            ```python
+            async for message, response in reasoner.process_iter(incoming()):
+                if response.decision == Decision.DELEGATE:
+                    ...
+            ```
+        """
+        if max_pending < 1:
+            raise ValueError("Max pending must be at least 1")
+        return self._process_iter(messages, ordered, max_pending)
+
+    async def _process_iter(
+        self,
+        messages: AsyncIterable[Message],
+        ordered: bool,
+        max_pending: int,
+    ) -> AsyncIterator[tuple[Message, Response]]:
+        # items are (message, future) tuples, an exception raised by the source,
+        # or None after the source is exhausted
+        results: Queue[tuple[Message, Future[Response]] | Exception | None] = Queue()
+        slots = Semaphore(max_pending)
+        issued = 0
+
+        def deliver(message: Message, future: Future[Response]):
+            results.put_nowait((message, future))
+
+        async def pump():
+            nonlocal issued
+            try:
+                async for message in messages:
+                    await slots.acquire()
+                    future = self.process(message)
+                    issued += 1
+                    if ordered:
+                        deliver(message, future)
+                    else:
+                        future.add_done_callback(partial(deliver, message))
+            except Exception as e:
+                results.put_nowait(e)
+            else:
+                results.put_nowait(None)
+
+        pump_task = create_task(pump())
+        total: int | None = None
+        yielded = 0
+        try:
+            while total is None or yielded < total:
+                item = await results.get()
+                if item is None:
+                    # in completion order, responses may still be outstanding
+                    total = issued
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                message, future = item
+                response = await future
+                slots.release()
+                yielded += 1
+                yield message, response
+        finally:
+            pump_task.cancel()
+
+    def process_stream(self, message: Message) -> ResponseStream:
+        """Process a message and stream partial reasoning results.
+
+        Streaming variant of
+        [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process].
+        The message is added to the shared group chat message list immediately,
+        so calling this method in the order messages arrive preserves that order
+        internally. Partial responses of the sender's reasoner instance are
+        streamed as soon as they are available, allowing callers to drop IGNORE
+        decisions early or to start downstream processing on a partial query.
+
+        The message is always processed by the sender's reasoner instance, also
+        in batching mode. Pending limits and rate limits do not apply: each
+        call starts a reasoner run, and streams are not counted in
+        [`pending`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.pending].
+        Callers that stream a message flood must bound the number of open
+        streams themselves.
+
+        Args:
+            message: User message to process. The sender field determines which
+                reasoner instance is triggered.
+
+        Returns:
+            Stream of partial responses, ending with the final response.
+
+        Raises:
+            RuntimeError: If the reasoner is closed.
+        """
+        self._check_open()
+        if self._duplicate(message):
+            duplicate = ResponseStream()
+            self._original_future(message).add_done_callback(partial(_complete_stream, duplicate))
+            return duplicate
+        self._messages.append(message)
+        self._record_message(message, trigger=True)
+        self._summarize()
+
+        # resolves with the final response, for duplicates of the message
+        future: Future[Response] | None = None
+        if message.id is not None:
+            future = get_running_loop().create_future()
+            future.add_done_callback(_retrieve_exception)
+            self._remember(message, future)
+
         reasoner, lock = self._get_reasoner(message.sender)
-        return create_task(self._run(self._messages.copy(), reasoner, lock))
+        stream = ResponseStream()
+        run = self._run_stream(len(self._messages), message.sender, reasoner, lock, stream, future)
+        task = self._track(create_task(run), message.sender)
+        # also ends the stream if the run is cancelled before it started
+        task.add_done_callback(partial(_fail_cancelled, stream, future))
+        stream.attach(task)
+        return stream
+
+    def tasks(self, owner: str | None = None) -> list[Task]:
+        """Return the tasks of pending reasoner runs.
+
+        Args:
+            owner: If set, only the tasks of this owner's reasoner instance are
+                returned. Runs of the batch reasoner are not owned by a single
+                owner and only returned if `owner` is `None`.
+
+        Returns:
+            Tasks that have not completed yet.
+        """
+        tasks = self._tasks if owner is None else self._owner_tasks.get(owner, set())
+        return [task for task in tasks if not task.done()]
+
+    def cancel_pending(self, owner: str) -> int:
+        """Cancel all pending triggers of an owner.
+
+        Cancels the futures and streams of the owner's waiting and running
+        triggers, including triggers collected for the next batch. Messages
+        remain in the shared group chat messages, and the owner's reasoner
+        state is unchanged by cancelled runs, so the next trigger of the owner
+        covers their messages.
+
+        Args:
+            owner: Owner whose triggers are cancelled.
+
+        Returns:
+            Number of cancelled triggers.
+        """
+        triggers = list(self._pending.get(owner, ()))
+        streams = set(self.tasks(owner)) - {trigger.task for trigger in triggers}
+
+        cancelled = 0
+        for trigger in triggers:
+            self._remove_pending(trigger)
+            if trigger.task is not None:
+                trigger.task.cancel()
+            for future in trigger.futures:
+                future.cancel()
+            cancelled += 1
+
+        for sender, future in self._batch:
+            if sender == owner:
+                future.cancel()
+                cancelled += 1
+        self._batch = [(sender, future) for sender, future in self._batch if sender != owner]
+
+        for task in streams:
+            task.cancel()
+        return cancelled + len(streams)
+
+    async def aclose(self, timeout: float | None = None):
+        """Stop accepting messages, drain pending work and commit state.
+
+        New calls of [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process],
+        [`process_stream()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process_stream]
+        and [`append()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.append]
+        raise a `RuntimeError`. Pending reasoner runs are awaited for up to
+        `timeout` seconds, then remaining runs are cancelled. A running room
+        summary update is cancelled. Finally, the write-ahead log is committed
+        and the store is flushed, if set.
+
+        Cancelled runs do not change reasoner states. With a write-ahead log,
+        their triggers are processed again by
+        [`recover()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.recover].
+        The write-ahead log and the store are not closed, as they may be shared.
+
+        Args:
+            timeout: Maximum time in seconds to wait for pending runs, or
+                `None` to wait until all runs complete.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+
+        if self._tasks:
+            _, pending = await wait(list(self._tasks), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await wait(pending)
+
+        if self._wal is not None:
+            await self._wal.commit()
+        if self._store is not None:
+            await self._store.flush()
+
+    async def __aenter__(self) -> "ConcurrentGroupReasoner":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # drain on normal exit, cancel pending runs on errors
+        await self.aclose(timeout=None if exc_type is None else 0)
+
+    async def get_serialized(self, deduplicate: bool = False) -> dict[str, Any]:
+        """Serialize the state of the entire group chat for persistence.
+
+        Waits for all triggers issued before the call to be processed, then
+        holds all reasoner instance locks while capturing the shared group chat
+        messages and the states of all reasoner instances, the summarizer and
+        the batch reasoner. The snapshot is therefore consistent: each reasoner
+        state corresponds to a prefix of the captured messages. Messages that
+        arrive while waiting are included in the snapshot, but their triggers
+        are processed by this instance only. Reasoner instances created while
+        waiting for the locks are not included, so their owners are restored
+        to their state before the call.
+
+        States restored with
+        [`set_serialized()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.set_serialized]
+        but not yet used are included without creating reasoner instances for
+        them.
+
+        Args:
+            deduplicate: Whether to store the content of the reasoner
+                instances' conversation histories in a shared, content-addressed
+                blob store (see [`deduplicate()`][group_sense.storage.blob.deduplicate]).
+                Group chat messages rendered into the histories of several
+                owners are then stored only once.
+
+        Returns:
+            Dictionary containing the serialized group chat messages, the
+                states of all reasoner instances keyed by owner, the states
+                of the summarizer and batch reasoner, if set, and the blob
+                store, if deduplicated.
+
+        Raises:
+            NotImplementedError: If a reasoner instance does not support
+                serialization.
+        """
+        if self._tasks:
+            await wait(list(self._tasks))
+
+        # reasoner instances created while the locks are acquired are excluded, as their first runs
+        # may already be under way; restored states are captured before they are hydrated meanwhile
+        owners = sorted(self._reasoner)
+        reasoners = [self._reasoner[owner] for owner in owners]
+        restored = dict(self._states)
+
+        async with AsyncExitStack() as stack:
+            # acquire locks in the same order as batched runs to avoid deadlocks
+            for owner, (reasoner, lock) in zip(owners, reasoners):
+                await stack.enter_async_context(lock)
+                await self._load_reasoner(owner, reasoner)
+            await stack.enter_async_context(self._batch_lock)
+
+            states = await gather(*(reasoner.get_serialized_async() for reasoner, _ in reasoners))
+
+            state: dict[str, Any] = {
+                "messages": _messages_adapter.dump_python(list(self._messages), mode="json"),
+                "reasoners": {**restored, **dict(zip(owners, states))},
+            }
+            if deduplicate or self._blobs is not None:
+                # expand restored states and (re-)deduplicate all states against a fresh blob store
+                # off the event loop, on copies that are not modified by reasoners hydrated meanwhile
+                source = None
+                if self._blobs is not None:
+                    source = BlobStore()
+                    source.set_serialized(self._blobs.get_serialized())
+                blobs = BlobStore() if deduplicate else None
+                state["reasoners"] = await get_running_loop().run_in_executor(
+                    None, _convert_states, state["reasoners"], set(restored), source, blobs
+                )
+                if blobs is not None:
+                    state["blobs"] = blobs.get_serialized()
+            if self._summarizer is not None:
+                state["summarizer"] = self._summarizer.get_serialized()
+            if self._batch_reasoner is not None:
+                state["batch_reasoner"] = self._batch_reasoner.get_serialized()
+            if self._wal is not None:
+                state["lsn"] = self._wal.lsn
+            return state
+
+    def set_serialized(self, state: dict[str, Any]):
+        """Restore the state of the entire group chat from serialized data.
+
+        Replaces the shared group chat messages and discards existing reasoner
+        instances. Reasoner states are restored lazily: a reasoner instance is
+        created and its state deserialized only when its owner sends the next
+        message. Must not be called while messages are being processed.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.get_serialized].
+                Summarizer and batch reasoner states are only restored if a
+                summarizer or batch reasoner is set.
+        """
+        self._messages = self._log(_messages_adapter.validate_python(state["messages"]))
+        self._remember_all(self._messages)
+        self._states = dict(state["reasoners"])
+        self._reasoner = {}
+        self._blobs = None
+
+        if "blobs" in state:
+            self._blobs = BlobStore()
+            self._blobs.set_serialized(state["blobs"])
+
+        if self._summarizer is not None and "summarizer" in state:
+            self._summarizer.set_serialized(state["summarizer"])
+        if self._batch_reasoner is not None and "batch_reasoner" in state:
+            self._batch_reasoner.set_serialized(state["batch_reasoner"])
 
-    async def _run(self, messages: list[Message], reasoner: GroupReasoner, lock: Lock) -> Response:
+    async def _run_stream(
+        self,
+        end: int,
+        owner: str,
+        reasoner: GroupReasoner,
+        lock: Lock,
+        stream: ResponseStream,
+        future: Future[Response] | None = None,
+    ):
+        try:
+            async with lock:
+                await self._load_reasoner(owner, reasoner)
+                updates, summary = self._updates(end, reasoner.processed)
+                reasoner_stream = reasoner.process_stream(updates, summary=summary)
+                try:
+                    async for partial_response in reasoner_stream:
+                        stream.put(_positioned(partial_response, end))
+                    response = _positioned(await reasoner_stream.response(), end)
+                except CancelledError:
+                    # stop the reasoner run before releasing the lock, so that the next
+                    # run of the owner starts from an unchanged reasoner state
+                    await reasoner_stream.cancel()
+                    raise
+                lsn = self._record_turn(owner, end, reasoner)
+            await self._commit(lsn)
+        except Exception as e:
+            stream.fail(e)
+            if future is not None:
+                future.set_exception(e)
+        else:
+            stream.complete(response)
+            if future is not None:
+                future.set_result(response)
+
+    async def _run(self, trigger: _Trigger, reasoner: GroupReasoner, lock: Lock) -> Response:
         async with lock:
-            updates = messages[reasoner.processed :]
-            return await reasoner.process(updates)
+            # the end of a started trigger is fixed, later triggers cannot be merged into it anymore
+            trigger.started = True
+            await self._load_reasoner(trigger.owner, reasoner)
+            updates, summary = self._updates(trigger.end, reasoner.processed)
+            if summary is not None:
+                response = await reasoner.process(updates, summary=summary)
+            else:
+                response = await reasoner.process(updates)
+            lsn = self._record_turn(trigger.owner, trigger.end, reasoner)
+        await self._commit(lsn)
+        return _positioned(response, trigger.end)
+
+    async def _run_trigger(self, trigger: _Trigger, reasoner: GroupReasoner, lock: Lock):
+        try:
+            if (delay := trigger.not_before - get_running_loop().time()) > 0:
+                # later triggers of the same sender are merged into this trigger while deferred
+                await sleep(delay)
+            response = await self._validated(await self._run(trigger, reasoner, lock))
+        except CancelledError:
+            for future in trigger.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in trigger.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in trigger.futures:
+                if not future.done():
+                    future.set_result(response)
+        finally:
+            self._remove_pending(trigger)
+
+    async def _validated(self, response: Response) -> Response:
+        if self._validator is None or response.decision != Decision.DELEGATE or not self.is_stale(response):
+            return response
+        return await self._validator.validate(response, self._messages)
+
+    def _submit(self, trigger: _Trigger):
+        reasoner, lock = self._get_reasoner(trigger.owner)
+        self._pending.setdefault(trigger.owner, deque()).append(trigger)
+        self._num_pending += 1
+        trigger.task = self._track(create_task(self._run_trigger(trigger, reasoner, lock)), trigger.owner)
+        for future in trigger.futures:
+            future.add_done_callback(partial(self._cancel_abandoned, trigger))
+
+    def _cancel_abandoned(self, trigger: _Trigger, _: Future[Response]):
+        # cancel the run of a trigger whose futures have all been cancelled by callers
+        if trigger.task is not None and all(future.cancelled() for future in trigger.futures):
+            trigger.task.cancel()
+
+    def _remove_pending(self, trigger: _Trigger):
+        pending = self._pending.get(trigger.owner)
+        if pending is not None and trigger in pending:
+            pending.remove(trigger)
+            self._num_pending -= 1
+            if not pending:
+                del self._pending[trigger.owner]
+
+    def _overloaded(self, owner: str) -> bool:
+        return self._sender_overloaded(owner) or (
+            self._max_pending is not None and self._num_pending >= self._max_pending
+        )
+
+    def _sender_overloaded(self, owner: str) -> bool:
+        return (
+            self._max_pending_per_sender is not None
+            and len(self._pending.get(owner, ())) >= self._max_pending_per_sender
+        )
+
+    def _shed_trigger(self, owner: str, future: Future[Response]) -> bool:
+        """Shed a new trigger of owner, or make room for it.
+
+        Returns `True` if the new trigger has been merged or rejected, `False`
+        if it can be admitted after dropping a waiting trigger.
+        """
+        if self._overload == Overload.MERGE and self._merge(owner, future):
+            return True
+
+        elif self._overload == Overload.DROP_OLDEST:
+            # drop a trigger of the same sender if its limit is exceeded, otherwise the oldest of the room
+            owners = [owner] if self._sender_overloaded(owner) else list(self._pending)
+            waiting = [t for o in owners for t in self._pending.get(o, ()) if not t.started]
+            if waiting:
+                oldest = min(waiting, key=lambda trigger: trigger.seq)
+                self._remove_pending(oldest)
+                for dropped in oldest.futures:
+                    if not dropped.done():
+                        dropped.set_result(Response(decision=Decision.IGNORE))
+                if oldest.task is not None:
+                    oldest.task.cancel()
+                self._count_shed(oldest.owner, "dropped")
+                return False
+
+        future.set_result(Response(decision=Decision.IGNORE))
+        self._count_shed(owner, "rejected")
+        return True
+
+    def _merge(self, owner: str, future: Future[Response]) -> bool:
+        """Merge a new trigger of owner into its latest waiting trigger, if any."""
+        waiting = [trigger for trigger in self._pending.get(owner, ()) if not trigger.started]
+        if not waiting:
+            return False
+
+        waiting[-1].end = len(self._messages)
+        waiting[-1].futures.append(future)
+        future.add_done_callback(partial(self._cancel_abandoned, waiting[-1]))
+        self._count_shed(owner, "merged")
+        return True
+
+    def _buckets(self, owner: str) -> list[_TokenBucket]:
+        now = get_running_loop().time()
+        if self._room_bucket is None and self._room_rate_limit is not None:
+            self._room_bucket = _TokenBucket(self._room_rate_limit, now)
+        if owner not in self._sender_buckets:
+            limit = self._sender_rate_limit(owner) if self._sender_rate_limit is not None else None
+            self._sender_buckets[owner] = _TokenBucket(limit, now) if limit is not None else None
+        return [bucket for bucket in (self._sender_buckets[owner], self._room_bucket) if bucket is not None]
+
+    def _rate_limited(self, owner: str) -> bool:
+        now = get_running_loop().time()
+        return any(not bucket.available(now) for bucket in self._buckets(owner))
+
+    def _reserve(self, owner: str) -> float:
+        """Take a token from the owner's buckets and return the time the run may start."""
+        now = get_running_loop().time()
+        delay = max((bucket.reserve(now) for bucket in self._buckets(owner)), default=0.0)
+        if delay > 0:
+            self._shed.deferred += 1
+        return now + delay
+
+    def _count_shed(self, owner: str, policy: str):
+        setattr(self._shed, policy, getattr(self._shed, policy) + 1)
+        self._shed.by_sender[owner] = self._shed.by_sender.get(owner, 0) + 1
+
+    async def _run_batch(self, end: int, owners: list[str]) -> dict[str, Response]:
+        assert self._batch_reasoner is not None
+
+        async with AsyncExitStack() as stack:
+            # acquire owner locks in a fixed order to preserve
+            # per-sender sequential processing without deadlocks
+            for owner in sorted(owners):
+                _, lock = self._get_reasoner(owner)
+                await stack.enter_async_context(lock)
+            await stack.enter_async_context(self._batch_lock)
+
+            updates, summary = self._updates(end, self._batch_reasoner.processed)
+            responses = await self._batch_reasoner.process(updates, owners, summary=summary)
+            lsn = self._record_batch_turn(owners, end)
+        await self._commit(lsn)
+        return {owner: _positioned(response, end) for owner, response in responses.items()}
+
+    def _updates(self, end: int, processed: int) -> tuple[list[Message], RoomSummary | None]:
+        if self._summarizer is not None:
+            summary = self._summarizer.summary
+            if summary is not None and processed < summary.end < end:
+                return self._messages[summary.end : end], summary
+        return self._messages[processed:end], None
+
+    def _enqueue(self, sender: str) -> Future[Response]:
+        future: Future[Response] = get_running_loop().create_future()
+        self._batch.append((sender, future))
+        if self._batch_task is None:
+            self._batch_task = self._track(create_task(self._flush()))
+        return future
+
+    async def _flush(self):
+        await sleep(self._batch_window)
+
+        batch, self._batch = self._batch, []
+        self._batch_task = None
+        if not batch:
+            # all triggers of the batch have been cancelled
+            return
+
+        end = len(self._messages)
+        owners = list(dict.fromkeys(sender for sender, _ in batch))
+
+        try:
+            if len(owners) == 1:
+                reasoner, lock = self._get_reasoner(owners[0])
+                trigger = _Trigger(owners[0], end, [], next(self._trigger_seq))
+                responses = {owners[0]: await self._run(trigger, reasoner, lock)}
+            else:
+                responses = await self._run_batch(end, owners)
+            for owner, response in responses.items():
+                responses[owner] = await self._validated(response)
+        except CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for sender, future in batch:
+                if not future.done():
+                    future.set_result(responses[sender])
+
+    async def load(self):
+        """Restore the group chat state of the room from the store.
+
+        Loads the shared group chat messages and the states of the summarizer
+        and batch reasoner. Reasoner instance states are not loaded upfront,
+        but when their owners send the next message. Must be called before any
+        message is processed.
+
+        The shared group chat messages of the room are held in memory
+        completely. Memory of loaded reasoner instances can be released with
+        [`unload()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.unload].
+
+        Raises:
+            ValueError: If no store is set.
+        """
+        if self._store is None or self._room is None:
+            raise ValueError("Loading requires a store")
+
+        self._messages = self._log(await self._store.load_messages(self._room))
+        self._remember_all(self._messages)
+        if self._summarizer is not None:
+            if (state := await self._store.load_room_state(self._room, "summarizer")) is not None:
+                self._summarizer.set_serialized(state)
+        if self._batch_reasoner is not None:
+            if (state := await self._store.load_room_state(self._room, "batch_reasoner")) is not None:
+                self._batch_reasoner.set_serialized(state)
+
+    def unload(self, owner: str) -> bool:
+        """Drop an owner's reasoner instance from memory.
+
+        The reasoner state is loaded from the store again when the owner sends
+        the next message. Every completed turn is written to the store, so no
+        state is lost. Instances with pending runs are not unloaded.
+
+        Args:
+            owner: Owner of the reasoner instance.
+
+        Returns:
+            Whether the reasoner instance was unloaded.
+
+        Raises:
+            ValueError: If no store is set.
+        """
+        if self._store is None:
+            raise ValueError("Unloading requires a store")
+        if owner not in self._reasoner or self._pending.get(owner) or self.tasks(owner):
+            return False
+        _, lock = self._reasoner[owner]
+        if lock.locked():
+            return False
+
+        del self._reasoner[owner]
+        self._unloaded.discard(owner)
+        return True
+
+    def recover(self, state: dict[str, Any] | None = None) -> list[tuple[Message, Future[Response]]]:
+        """Rebuild the group chat state from the write-ahead log after a crash.
+
+        Restores the snapshot `state`, if given, and replays the log records
+        written after it: messages are appended to the shared group chat
+        messages and completed reasoner turns are applied to the reasoner
+        states. Triggers without a completed turn are processed again. Must be
+        called from within a running event loop, before any other message is
+        processed.
+
+        A response is only returned to the caller of
+        [`process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process]
+        after its turn is durable, so triggers whose responses have been
+        returned are not processed again.
+
+        Args:
+            state: Optional snapshot from
+                [`get_serialized()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.get_serialized],
+                taken with the same log. Only log records written after the
+                snapshot are replayed. If `None`, the entire log is replayed.
+
+        Returns:
+            Re-processed messages in group chat order, each paired with a
+                Future that resolves to the reasoning result.
+
+        Raises:
+            ValueError: If no write-ahead log is set.
+        """
+        if self._wal is None:
+            raise ValueError("Recovery requires a write-ahead log")
+
+        start = 0
+        if state is not None:
+            self.set_serialized(state)
+            start = state.get("lsn", 0)
+
+        # trigger positions in the shared message list by owner
+        triggers: dict[str, list[int]] = {}
+
+        for record in self._wal.records(start):
+            if record["type"] == "message":
+                message = _message_adapter.validate_python(record["message"])
+                if record["trigger"]:
+                    triggers.setdefault(message.sender, []).append(len(self._messages))
+                self._messages.append(message)
+                self._remember(message)
+            elif record["type"] == "turn":
+                reasoner, _ = self._get_reasoner(record["owner"])
+                reasoner.apply_serialized_delta(record["delta"])
+                self._committed(triggers, [record["owner"]], record["end"])
+            elif record["type"] == "batch_turn":
+                if self._batch_reasoner is not None:
+                    self._batch_reasoner.apply_serialized_delta(record["delta"])
+                self._committed(triggers, record["owners"], record["end"])
+
+        results: list[tuple[Message, Future[Response]]] = []
+        for i, owner in sorted((i, owner) for owner, positions in triggers.items() for i in positions):
+            future: Future[Response] = get_running_loop().create_future()
+            self._submit(_Trigger(owner, i + 1, [future], next(self._trigger_seq)))
+            self._remember(self._messages[i], future)
+            results.append((self._messages[i], future))
+
+        self._summarize()
+        return results
+
+    @staticmethod
+    def _committed(triggers: dict[str, list[int]], owners: list[str], end: int):
+        for owner in owners:
+            if owner in triggers:
+                triggers[owner] = [i for i in triggers[owner] if i >= end]
+
+    def _log(self, messages: Iterable[Message] = ()) -> list[Message] | ColumnarRoomLog:
+        return ColumnarRoomLog(messages) if self._columnar else list(messages)
+
+    def _duplicate(self, message: Message) -> bool:
+        if message.id is None or message.id not in self._seen:
+            return False
+        self._duplicates += 1
+        return True
+
+    def _original_future(self, message: Message) -> Future[Response]:
+        assert message.id is not None
+        if (future := self._seen.get(message.id)) is not None:
+            return future
+        # the original message was added without triggering
+        future = get_running_loop().create_future()
+        future.set_result(Response(decision=Decision.IGNORE))
+        return future
+
+    def _remember(self, message: Message, future: Future[Response] | None = None):
+        if message.id is not None:
+            self._seen.add(message.id, future)
+
+    def _remember_all(self, messages: Iterable[Message]):
+        self._seen.clear()
+        for message in messages:
+            self._remember(message)
+
+    def _record_message(self, message: Message, trigger: bool):
+        if self._store is not None:
+            assert self._room is not None
+            self._store.append_messages(self._room, len(self._messages) - 1, [message])
+        if self._wal is not None:
+            self._wal.append(
+                {
+                    "type": "message",
+                    "message": _message_adapter.dump_python(message, mode="json"),
+                    "trigger": trigger,
+                }
+            )
+
+    def _record_turn(self, owner: str, end: int, reasoner: GroupReasoner) -> int | None:
+        if self._wal is None and self._store is None:
+            return None
+
+        # a delta is taken once per turn and shared by log and store
+        delta = reasoner.get_serialized_delta()
+        if self._store is not None:
+            assert self._room is not None
+            self._store.save_reasoner_delta(self._room, owner, delta)
+        if self._wal is None:
+            return None
+        return self._wal.append(
+            {
+                "type": "turn",
+                "owner": owner,
+                "end": end,
+                "delta": delta,
+            }
+        )
+
+    def _record_batch_turn(self, owners: list[str], end: int) -> int | None:
+        assert self._batch_reasoner is not None
+        if self._store is not None:
+            assert self._room is not None
+            self._store.save_room_state(self._room, "batch_reasoner", self._batch_reasoner.get_serialized())
+        if self._wal is None:
+            return None
+        return self._wal.append(
+            {
+                "type": "batch_turn",
+                "owners": owners,
+                "end": end,
+                "delta": self._batch_reasoner.get_serialized_delta(),
+            }
+        )
+
+    async def _load_reasoner(self, owner: str, reasoner: GroupReasoner):
+        if owner not in self._unloaded:
+            return
+        assert self._store is not None and self._room is not None
+        self._unloaded.discard(owner)
+        state = await self._store.load_reasoner(self._room, owner)
+        if state is not None:
+            await reasoner.set_serialized_async(state)
+
+    async def _commit(self, lsn: int | None):
+        if self._wal is not None and lsn is not None:
+            await self._wal.commit(lsn)
+
+    def _summarize(self):
+        if self._closed or self._summarizer is None or not self._summarizer.due(len(self._messages)):
+            return
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+        self._summary_task = create_task(self._summarizer.update(self._messages.copy()))
+        self._summary_task.add_done_callback(self._summarize_done)
+
+    def _summarize_done(self, task: Task):
+        if task.cancelled():
+            return
+        if (exc := task.exception()) is not None:
+            logger.error("Room summary update failed", exc_info=exc)
+        else:
+            if self._store is not None:
+                assert self._summarizer is not None and self._room is not None
+                self._store.save_room_state(self._room, "summarizer", self._summarizer.get_serialized())
+            # catch up with messages that arrived during the update
+            self._summarize()
+
+    def _track(self, task: Task, owner: str | None = None) -> Task:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if owner is not None:
+            owner_tasks = self._owner_tasks.setdefault(owner, set())
+            owner_tasks.add(task)
+            task.add_done_callback(lambda t: self._untrack(t, owner))
+        return task
+
+    def _untrack(self, task: Task, owner: str):
+        owner_tasks = self._owner_tasks.get(owner)
+        if owner_tasks is not None:
+            owner_tasks.discard(task)
+            if not owner_tasks:
+                del self._owner_tasks[owner]
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("Reasoner is closed")
+
+    def _hydrate(self, state: dict[str, Any]) -> dict[str, Any]:
+        if self._blobs is None:
+            return state
+        expanded = expand(state, self._blobs)
+        # the restored reasoner owns its history now, drop blobs no other restored state refers to
+        release(state, self._blobs)
+        self._blobs.gc()
+        return expanded
 
     def _get_reasoner(self, sender: str) -> tuple[GroupReasoner, Lock]:
         if sender in self._reasoner:
             reasoner, lock = self._reasoner[sender]
         else:
             reasoner, lock = self._factory.create_group_reasoner(owner=sender), Lock()
+            if sender in self._states:
+                # hydrate restored state lazily on first use
+                reasoner.set_serialized(self._hydrate(self._states.pop(sender)))
+            elif self._store is not None:
+                self._unloaded.add(sender)
             self._reasoner[sender] = (reasoner, lock)
         return reasoner, lock
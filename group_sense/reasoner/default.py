@@ -1,20 +1,62 @@
 import logging
+from asyncio import CancelledError, Lock, get_running_loop
+from concurrent.futures import Executor
 from typing import Any
 
 from pydantic_ai import Agent, NativeOutput
-from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelRequestPart,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
 from pydantic_ai.models import Model
-from pydantic_ai.models.google import GoogleModelSettings
 from pydantic_ai.settings import ModelSettings
 from pydantic_core import to_jsonable_python
 
 from group_sense.message import Message
-from group_sense.reasoner.base import GroupReasoner, GroupReasonerFactory, Response
-from group_sense.reasoner.prompt import user_prompt
+from group_sense.reasoner.base import (
+    BatchGroupReasoner,
+    Decision,
+    GroupReasoner,
+    GroupReasonerFactory,
+    Response,
+    ResponseStream,
+    RoomSummary,
+)
+from group_sense.reasoner.batch import DefaultBatchGroupReasoner
+from group_sense.reasoner.profile import Profile, limit_history, profile_settings, select_profile
+from group_sense.reasoner.prompt import PromptBudget, PromptCache, user_prompt
 
 logger = logging.getLogger(__name__)
 
 
+# encode and decode long histories in chunks, so that the GIL is released between chunks
+# when running in a thread, which bounds the stall of a concurrently running event loop
+_CHUNK_SIZE = 100
+
+
+def _dump_history(history: list[ModelMessage]) -> list[Any]:
+    data = []
+    for i in range(0, len(history), _CHUNK_SIZE):
+        data.extend(to_jsonable_python(history[i : i + _CHUNK_SIZE], bytes_mode="base64"))
+    return data
+
+
+def _load_history(data: list[Any]) -> list[ModelMessage]:
+    history = []
+    for i in range(0, len(data), _CHUNK_SIZE):
+        history.extend(ModelMessagesTypeAdapter.validate_python(data[i : i + _CHUNK_SIZE]))
+    return history
+
+
+_INGESTED_RESPONSE = Response(decision=Decision.IGNORE).model_dump_json()
+
+
 class DefaultGroupReasoner(GroupReasoner):
     """Sequential group chat message processor with single shared context.
 
@@ -41,6 +83,8 @@ class DefaultGroupReasoner(GroupReasoner):
         system_prompt: str,
         model: str | Model | None = None,
         model_settings: ModelSettings | None = None,
+        profile: Profile | str = Profile.THOROUGH,
+        prompt_budget: PromptBudget | None = None,
     ):
         """Initialize the reasoner with a system prompt and optional model configuration.
 
@@ -49,30 +93,48 @@ class DefaultGroupReasoner(GroupReasoner):
                 decision-making criteria. Should not contain an {owner} placeholder.
             model: Optional AI model to use. Defaults to "google-gla:gemini-3-flash-preview".
                 Can be a model name string or a pydantic-ai Model instance.
-            model_settings: Optional model-specific settings. Defaults to
-                GoogleModelSettings with thinking enabled.
+            model_settings: Optional model-specific settings. Defaults to the
+                model settings of the selected profile. With the adaptive
+                profile, the model settings selected per call are merged into
+                these settings.
+            profile: Latency profile that determines the thinking effort and
+                the amount of conversation history sent with each request.
+                Defaults to the thorough profile (high thinking effort, full
+                history).
+            prompt_budget: Optional token budget of the user prompts. Large
+                updates are truncated and elided to fit into the budget, see
+                [`PromptBudget`][group_sense.reasoner.prompt.PromptBudget].
         """
         super().__init__()
         self._history: list[ModelMessage] = []
         self._processed: int = 0
+        self._checkpoint: int = 0
+        self._lock = Lock()
+        self._profile = Profile(profile)
+        self._system_prompt = system_prompt
+        self._prompt_budget = prompt_budget
+        self._prompt_cache = PromptCache()
+
+        if model_settings is None and self._profile != Profile.ADAPTIVE:
+            model_settings = profile_settings(self._profile).model_settings
+
         self._agent = Agent(
             system_prompt=system_prompt,
             output_type=NativeOutput(Response),
             model=model or "google-gla:gemini-3-flash-preview",
-            model_settings=model_settings
-            or GoogleModelSettings(
-                google_thinking_config={
-                    "thinking_level": "high",
-                    "include_thoughts": True,
-                }
-            ),
+            model_settings=model_settings,
         )
 
+    @property
+    def profile(self) -> Profile:
+        """Latency profile of this reasoner."""
+        return self._profile
+
     @property
     def processed(self) -> int:
         return self._processed
 
-    async def process(self, updates: list[Message]) -> Response:
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
         """Process a message increment and decide whether to delegate.
 
         Analyzes new messages in the context of the entire conversation history
@@ -82,7 +144,12 @@ class DefaultGroupReasoner(GroupReasoner):
         Args:
             updates: List of new messages to process as an increment. Must not
                 be empty. Represents messages that arrived since the last
-                [`process()`][group_sense.reasoner.base.GroupReasoner.process] call.
+                [`process()`][group_sense.reasoner.base.GroupReasoner.process] call,
+                or since the end of `summary` if a summary is used.
+            summary: Optional room summary that is rendered into the prompt in
+                place of the raw messages between the processed count and
+                `summary.end`. Only used if `summary.end` is greater than the
+                processed count.
 
         Returns:
             Response containing the triage decision (IGNORE or DELEGATE) and
@@ -94,13 +161,141 @@ class DefaultGroupReasoner(GroupReasoner):
         if not updates:
             raise ValueError("Updates must not be empty")
 
-        reasoner_prompt = user_prompt(updates, self._processed)
+        async with self._lock:
+            reasoner_prompt, start_seq_nr = self._prompt(updates, summary)
+            model_settings, history = self._settings(updates)
+            result = await self._agent.run(
+                reasoner_prompt,
+                message_history=history,
+                model_settings=model_settings,
+            )
+            self._history = [*self._history, *result.new_messages()]
+            self._processed = start_seq_nr + len(updates)
+
+        return self._normalize(result.output)
+
+    async def ingest(self, updates: list[Message], summary: RoomSummary | None = None):
+        """Add a message increment to the conversation history without a model call.
+
+        Warm-starts a reasoner with a historical transcript, e.g. when
+        onboarding an existing group chat. The messages are rendered into the
+        conversation history exactly like in
+        [`process()`][group_sense.reasoner.default.DefaultGroupReasoner.process],
+        followed by an IGNORE decision, and the processed count is advanced.
+        Subsequent calls see the ingested messages as context, but no
+        decision is made on them.
+
+        Long backlogs can be summarized first with a
+        [`RoomSummarizer`][group_sense.reasoner.summary.RoomSummarizer], so
+        that only the summary and the most recent messages are added:
+
+        ```python
+        summary = await summarizer.update(transcript)
+        await reasoner.ingest(transcript[summarizer.end :], summary=summary)
+        ```
+
+        Args:
+            updates: List of messages to add as an increment. Must not be
+                empty. Represents messages since the processed count, or since
+                the end of `summary` if a summary is used.
+            summary: Optional room summary, as in
+                [`process()`][group_sense.reasoner.default.DefaultGroupReasoner.process].
+
+        Raises:
+            ValueError: If updates is empty.
+        """
+        if not updates:
+            raise ValueError("Updates must not be empty")
+
+        async with self._lock:
+            reasoner_prompt, start_seq_nr = self._prompt(updates, summary)
+            # the agent only adds the system prompt to runs without message history
+            parts: list[ModelRequestPart] = [] if self._history else [SystemPromptPart(content=self._system_prompt)]
+            parts.append(UserPromptPart(content=reasoner_prompt))
+            # a synthetic IGNORE decision keeps requests and responses alternating in the history
+            self._history = [
+                *self._history,
+                ModelRequest(parts=parts),
+                ModelResponse(parts=[TextPart(content=_INGESTED_RESPONSE)]),
+            ]
+            self._processed = start_seq_nr + len(updates)
+
+    def process_stream(self, updates: list[Message], summary: RoomSummary | None = None) -> ResponseStream:
+        """Process a message increment and stream partial responses.
+
+        Streaming variant of
+        [`process()`][group_sense.reasoner.default.DefaultGroupReasoner.process]
+        based on a streamed agent run. Partial responses are yielded as soon as
+        they can be parsed from the model output, i.e. the decision is
+        available before the query has been generated completely. The
+        conversation history is updated when the run completes, even if the
+        stream is not consumed to the end.
+
+        Must be called from within a running event loop.
+
+        Args:
+            updates: List of new messages to process as an increment. Must not
+                be empty.
+            summary: Optional room summary, as in
+                [`process()`][group_sense.reasoner.default.DefaultGroupReasoner.process].
+
+        Returns:
+            Stream of partial responses, ending with the final response.
+
+        Raises:
+            ValueError: If updates is empty.
+        """
+        return super().process_stream(updates, summary)
+
+    async def _process_stream(self, updates: list[Message], summary: RoomSummary | None, stream: ResponseStream):
+        try:
+            async with self._lock:
+                reasoner_prompt, start_seq_nr = self._prompt(updates, summary)
+                model_settings, history = self._settings(updates)
+                response: Response | None = None
+                async with self._agent.run_stream(
+                    reasoner_prompt,
+                    message_history=history,
+                    model_settings=model_settings,
+                ) as result:
+                    # the last streamed output is the complete, fully validated response
+                    async for response in result.stream_output(debounce_by=None):
+                        stream.put(response)
+                if response is None:
+                    raise RuntimeError("Reasoner stream ended without response")
+                self._history = [*self._history, *result.new_messages()]
+                self._processed = start_seq_nr + len(updates)
+        except CancelledError as e:
+            stream.fail(e)
+            raise
+        except Exception as e:
+            stream.fail(e)
+        else:
+            stream.complete(self._normalize(response))
+
+    def _prompt(self, updates: list[Message], summary: RoomSummary | None) -> tuple[str, int]:
+        if summary is None or summary.end <= self._processed:
+            summary = None
+            start_seq_nr = self._processed
+        else:
+            start_seq_nr = summary.end
+
+        reasoner_prompt = user_prompt(updates, start_seq_nr, summary, self._prompt_budget, self._prompt_cache)
         logger.debug(f"Reasoner prompt:\n{reasoner_prompt}")
-        result = await self._agent.run(reasoner_prompt, message_history=self._history)
-        self._history = result.all_messages()
-        self._processed += len(updates)
+        return reasoner_prompt, start_seq_nr
 
-        response = result.output
+    def _settings(self, updates: list[Message]) -> tuple[ModelSettings | None, list[ModelMessage]]:
+        if self._profile == Profile.ADAPTIVE:
+            profile = select_profile(updates)
+            logger.debug(f"Selected profile: {profile.value}")
+            settings = profile_settings(profile)
+            return settings.model_settings, limit_history(self._history, settings.history_limit)
+
+        settings = profile_settings(self._profile)
+        return None, limit_history(self._history, settings.history_limit)
+
+    @staticmethod
+    def _normalize(response: Response) -> Response:
         if response.receiver == "":
             response.receiver = None
         return response
@@ -119,7 +314,7 @@ class DefaultGroupReasoner(GroupReasoner):
                 message count.
         """
         return {
-            "agent": to_jsonable_python(self._history, bytes_mode="base64"),
+            "agent": _dump_history(self._history),
             "processed": self._processed,
         }
 
@@ -136,8 +331,139 @@ class DefaultGroupReasoner(GroupReasoner):
                 Must include 'agent' (conversation history) and 'processed'
                 (message count) keys.
         """
-        self._history = ModelMessagesTypeAdapter.validate_python(state["agent"])
+        self._history = _load_history(state["agent"])
+        self._processed = state["processed"]
+        self._checkpoint = len(self._history)
+
+    async def get_serialized_async(self, executor: Executor | None = None) -> dict[str, Any]:
+        """Serialize the reasoner's state without blocking the event loop.
+
+        Async variant of
+        [`get_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized].
+        The state is captured on the event loop and encoded in an executor.
+        Messages can be processed concurrently; their turns are not included
+        in the returned state.
+
+        Args:
+            executor: Executor to encode the conversation history in. Can be
+                a thread or process pool executor. Defaults to the event
+                loop's default executor. The history is encoded in chunks, so
+                a thread keeps event loop stalls short. A process pool moves
+                encoding out of the process, but pickles the history on the
+                event loop.
+
+        Returns:
+            Dictionary containing serialized conversation history and processed
+                message count.
+        """
+        history, processed = list(self._history), self._processed
+        agent = await get_running_loop().run_in_executor(executor, _dump_history, history)
+        return {
+            "agent": agent,
+            "processed": processed,
+        }
+
+    async def set_serialized_async(self, state: dict[str, Any], executor: Executor | None = None):
+        """Restore the reasoner's state without blocking the event loop.
+
+        Async variant of
+        [`set_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.set_serialized].
+        The conversation history is decoded in an executor, and the state is
+        replaced on the event loop once decoding is complete.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized].
+            executor: Executor to decode the conversation history in. Can be
+                a thread or process pool executor. Defaults to the event
+                loop's default executor.
+        """
+        history = await get_running_loop().run_in_executor(executor, _load_history, state["agent"])
+        self._history = history
         self._processed = state["processed"]
+        self._checkpoint = len(self._history)
+
+    def get_serialized_delta(self) -> dict[str, Any]:
+        """Serialize the changes of the reasoner's state since the last delta.
+
+        Incremental counterpart of
+        [`get_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized]
+        for checkpointing after each turn. The conversation history is
+        append-only, so a delta contains only the messages added since the
+        previous delta (or since the state was restored), and its size and
+        encoding cost are independent of the history length.
+
+        Deltas are applied in order with
+        [`apply_serialized_delta()`][group_sense.reasoner.default.DefaultGroupReasoner.apply_serialized_delta],
+        or periodically merged into a full state with
+        [`compact_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.compact_serialized].
+
+        Returns:
+            Dictionary containing the history position the delta starts at
+                ('start'), the serialized messages added since then ('agent')
+                and the processed message count.
+        """
+        start, self._checkpoint = self._checkpoint, len(self._history)
+        return {
+            "start": start,
+            "agent": _dump_history(self._history[start : self._checkpoint]),
+            "processed": self._processed,
+        }
+
+    def apply_serialized_delta(self, delta: dict[str, Any]):
+        """Apply a serialized delta to the reasoner's state.
+
+        Args:
+            delta: Dictionary containing a serialized delta from
+                [`get_serialized_delta()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized_delta].
+                Must start at the current end of the conversation history.
+
+        Raises:
+            ValueError: If the delta does not start at the end of the
+                conversation history.
+        """
+        if delta["start"] != len(self._history):
+            raise ValueError(f"Delta starts at {delta['start']}, expected {len(self._history)}")
+
+        self._history = [*self._history, *_load_history(delta["agent"])]
+        self._processed = delta["processed"]
+        self._checkpoint = len(self._history)
+
+    @staticmethod
+    def compact_serialized(state: dict[str, Any], deltas: list[dict[str, Any]]) -> dict[str, Any]:
+        """Merge a serialized state and subsequent deltas into a full state.
+
+        Operates on serialized data only, without deserializing messages.
+        Compacting is cheaper than replaying many deltas on restore, and
+        allows dropping the compacted deltas from storage.
+
+        Args:
+            state: Full state from
+                [`get_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized]
+                or from a previous compaction.
+            deltas: Deltas from
+                [`get_serialized_delta()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized_delta],
+                in order, with the first delta starting at the end of the
+                state's history.
+
+        Returns:
+            Full state that can be restored with
+                [`set_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.set_serialized].
+
+        Raises:
+            ValueError: If a delta does not start where the previous state or
+                delta ends.
+        """
+        agent = list(state["agent"])
+        processed = state["processed"]
+
+        for delta in deltas:
+            if delta["start"] != len(agent):
+                raise ValueError(f"Delta starts at {delta['start']}, expected {len(agent)}")
+            agent.extend(delta["agent"])
+            processed = delta["processed"]
+
+        return {"agent": agent, "processed": processed}
 
 
 class DefaultGroupReasonerFactory(GroupReasonerFactory):
@@ -157,13 +483,24 @@ class DefaultGroupReasonerFactory(GroupReasonerFactory):
         ```
     """
 
-    def __init__(self, system_prompt_template: str):
+    def __init__(
+        self,
+        system_prompt_template: str,
+        profile: Profile | str = Profile.THOROUGH,
+        prompt_budget: PromptBudget | None = None,
+    ):
         """Initialize the factory with a system prompt template.
 
         Args:
             system_prompt_template: Template string containing an {owner}
                 placeholder that will be replaced with the actual owner ID
                 when creating reasoner instances.
+            profile: Latency profile of the created reasoner instances. Can be
+                overridden per instance with a `profile` keyword argument to
+                [`create_group_reasoner()`][group_sense.reasoner.default.DefaultGroupReasonerFactory.create_group_reasoner].
+            prompt_budget: Optional token budget of the user prompts of the
+                created reasoner instances, including batch reasoners. Can be
+                overridden per instance with a `prompt_budget` keyword argument.
 
         Raises:
             ValueError: If the template does not contain an {owner} placeholder.
@@ -172,6 +509,8 @@ class DefaultGroupReasonerFactory(GroupReasonerFactory):
             raise ValueError("System prompt template must contain an {owner} placeholder")
 
         self._system_prompt_template = system_prompt_template
+        self._profile = Profile(profile)
+        self._prompt_budget = prompt_budget
 
     def create_group_reasoner(self, owner: str, **kwargs: Any) -> GroupReasoner:
         """Create a DefaultGroupReasoner instance for the specified owner.
@@ -182,11 +521,32 @@ class DefaultGroupReasonerFactory(GroupReasonerFactory):
         Args:
             owner: User ID to substitute into the {owner} placeholder.
             **kwargs: Additional keyword arguments passed to DefaultGroupReasoner
-                constructor (e.g., model, model_settings).
+                constructor (e.g., model, model_settings, profile).
 
         Returns:
             A new DefaultGroupReasoner instance configured with the owner-specific
                 system prompt.
         """
         system_prompt = self._system_prompt_template.format(owner=owner)
+        kwargs.setdefault("profile", self._profile)
+        kwargs.setdefault("prompt_budget", self._prompt_budget)
         return DefaultGroupReasoner(system_prompt=system_prompt, **kwargs)
+
+    def create_batch_group_reasoner(self, **kwargs: Any) -> BatchGroupReasoner:
+        """Create a DefaultBatchGroupReasoner instance from the system prompt template.
+
+        The returned reasoner decides on behalf of multiple owners in a single
+        model call and can be passed to
+        [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+        to enable micro-batching.
+
+        Args:
+            **kwargs: Additional keyword arguments passed to DefaultBatchGroupReasoner
+                constructor (e.g., model, model_settings).
+
+        Returns:
+            A new DefaultBatchGroupReasoner instance configured with the system
+                prompt template of this factory.
+        """
+        kwargs.setdefault("prompt_budget", self._prompt_budget)
+        return DefaultBatchGroupReasoner(system_prompt_template=self._system_prompt_template, **kwargs)
@@ -0,0 +1,143 @@
+from dataclasses import dataclass, replace
+from enum import Enum
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, SystemPromptPart, UserPromptPart
+from pydantic_ai.models.google import GoogleModelSettings
+
+from group_sense.message import Message
+
+
+class Profile(Enum):
+    """Latency profile of a reasoner.
+
+    Trades decision quality for latency and cost by selecting the model's
+    thinking effort and the amount of conversation history sent with each
+    request.
+    """
+
+    FAST = "fast"
+    """No thinking, only the most recent turns of the conversation history."""
+
+    BALANCED = "balanced"
+    """Low thinking effort, full conversation history."""
+
+    THOROUGH = "thorough"
+    """High thinking effort with thoughts included, full conversation history."""
+
+    ADAPTIVE = "adaptive"
+    """Per-call choice between `BALANCED` and `THOROUGH` settings, based on
+    cheap signals of the message increment (see
+    [`select_profile()`][group_sense.reasoner.profile.select_profile])."""
+
+
+@dataclass(frozen=True)
+class ProfileSettings:
+    """Model settings and history limit of a latency profile.
+
+    Attributes:
+        model_settings: Model settings used for reasoning calls.
+        history_limit: Maximum number of past conversation turns (at least 1)
+            sent with a request, or `None` to send the full history.
+    """
+
+    model_settings: GoogleModelSettings
+    history_limit: int | None = None
+
+
+PROFILE_SETTINGS: dict[Profile, ProfileSettings] = {
+    Profile.FAST: ProfileSettings(
+        model_settings=GoogleModelSettings(
+            google_thinking_config={
+                "thinking_level": "minimal",
+                "include_thoughts": False,
+            }
+        ),
+        history_limit=2,
+    ),
+    Profile.BALANCED: ProfileSettings(
+        model_settings=GoogleModelSettings(
+            google_thinking_config={
+                "thinking_level": "low",
+                "include_thoughts": False,
+            }
+        ),
+    ),
+    Profile.THOROUGH: ProfileSettings(
+        model_settings=GoogleModelSettings(
+            google_thinking_config={
+                "thinking_level": "high",
+                "include_thoughts": True,
+            }
+        ),
+    ),
+}
+
+
+def profile_settings(profile: Profile) -> ProfileSettings:
+    """Return the settings of a non-adaptive profile.
+
+    Raises:
+        ValueError: If profile is `Profile.ADAPTIVE`, which has no fixed settings.
+    """
+    if profile == Profile.ADAPTIVE:
+        raise ValueError("Adaptive profile has no fixed settings")
+    return PROFILE_SETTINGS[profile]
+
+
+def select_profile(updates: list[Message], large_update: int = 5) -> Profile:
+    """Select the profile for a message increment from cheap signals.
+
+    Selects `THOROUGH` if any message is addressed to a specific user (via the
+    receiver field or an @mention in the content), contains a question mark,
+    or if the increment has at least `large_update` messages. Selects
+    `BALANCED` otherwise.
+
+    Args:
+        updates: Message increment to process.
+        large_update: Minimum number of messages of an increment that is
+            processed thoroughly regardless of content.
+
+    Returns:
+        `Profile.THOROUGH` or `Profile.BALANCED`.
+    """
+    if len(updates) >= large_update:
+        return Profile.THOROUGH
+
+    for message in updates:
+        if message.receiver or "@" in message.content or "?" in message.content:
+            return Profile.THOROUGH
+
+    return Profile.BALANCED
+
+
+def limit_history(history: list[ModelMessage], limit: int | None) -> list[ModelMessage]:
+    """Return the last `limit` conversation turns of a history, keeping the system prompt.
+
+    A turn starts with a request that contains a user prompt. System prompt
+    parts of the first request are moved into the first retained request.
+
+    Args:
+        history: Full conversation history.
+        limit: Maximum number of turns to retain (at least 1), or `None` to
+            retain all.
+
+    Returns:
+        The (possibly) shortened history.
+    """
+    if limit is None:
+        return history
+
+    starts = [
+        i
+        for i, message in enumerate(history)
+        if isinstance(message, ModelRequest) and any(isinstance(part, UserPromptPart) for part in message.parts)
+    ]
+    if len(starts) <= limit:
+        return history
+
+    retained = history[starts[-limit] :]
+    system_parts = [part for part in history[0].parts if isinstance(part, SystemPromptPart)]
+
+    first = retained[0]
+    assert isinstance(first, ModelRequest)
+    return [replace(first, parts=[*system_parts, *first.parts]), *retained[1:]]
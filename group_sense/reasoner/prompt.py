@@ -1,4 +1,24 @@
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Any
+
 from group_sense.message import Attachment, Message, Thread
+from group_sense.reasoner.base import RoomSummary
+
+SUMMARY_TEMPLATE = """<summary end_seq_nr="{end_seq_nr}">
+{content}
+</summary>"""
+
+
+OWNERS_TEMPLATE = """<owners>
+{owners}
+</owners>"""
+
+
+OWNER_TEMPLATE = """<owner id="{owner}"/>"""
+
 
 UPDATE_TEMPLATE = """<update>
 {messages}
@@ -30,16 +50,305 @@ THREAD_MESSAGE_TEMPLATE = """<thread-message sender="{sender}" receiver="{receiv
 </thread-message>"""
 
 
-def user_prompt(messages: list[Message], start_seq_nr: int) -> str:
+ELIDED_CONTENT_TEMPLATE = """[... {tokens} tokens elided ...]"""
+
+
+ELIDED_ATTACHMENTS_TEMPLATE = """<elided-attachments count="{count}"/>"""
+
+
+ELIDED_MESSAGES_TEMPLATE = """<elided-messages start_seq_nr="{start_seq_nr}" end_seq_nr="{end_seq_nr}"/>"""
+
+
+ELIDED_THREAD_MESSAGES_TEMPLATE = """<elided-thread-messages count="{count}"/>"""
+
+
+ELIDED_THREADS_TEMPLATE = """<elided-threads ids="{ids}"/>"""
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """Token budget of the user prompts of reasoners.
+
+    Limits the estimated size of prompts, so that a single huge update, e.g.
+    the long backlog of an owner who has been quiet, a pasted log file or a
+    large referenced thread, does not exceed the context window of the model.
+    Token counts are estimated locally with
+    [`estimate_tokens()`][group_sense.reasoner.prompt.estimate_tokens]. A
+    prompt is fit into the budget in these steps:
+
+    1. Message contents longer than `max_message_tokens` are truncated,
+       keeping their beginning and end, and attachments beyond
+       `max_attachments` are elided.
+    2. Threads longer than `max_thread_tokens` keep their most recent messages.
+    3. If the prompt still exceeds `max_tokens`, referenced threads are
+       elided, then the oldest messages of the update, and finally the content
+       of the most recent message is truncated.
+
+    Elided parts are replaced by markers. Remaining messages keep their
+    `seq_nr`, and elided update messages are marked with their `seq_nr` range.
+
+    Attributes:
+        max_tokens: Maximum number of tokens of a prompt.
+        max_message_tokens: Optional maximum number of content tokens of a
+            single message.
+        max_thread_tokens: Optional maximum number of tokens of a single
+            referenced thread.
+        max_attachments: Optional maximum number of attachments listed per
+            message.
+        max_thread_depth: Optional maximum depth of nested thread references
+            that are resolved. Directly referenced threads have depth 1.
+        max_threads: Optional maximum number of resolved threads. Further
+            threads are elided.
+    """
+
+    max_tokens: int
+    max_message_tokens: int | None = None
+    max_thread_tokens: int | None = None
+    max_attachments: int | None = None
+    max_thread_depth: int | None = None
+    max_threads: int | None = None
+
+    def __post_init__(self):
+        if self.max_tokens < 1:
+            raise ValueError("Max tokens must be at least 1")
+        for limit in (self.max_message_tokens, self.max_thread_tokens):
+            if limit is not None and limit < 1:
+                raise ValueError("Token limits must be at least 1")
+        for count in (self.max_attachments, self.max_threads):
+            if count is not None and count < 0:
+                raise ValueError("Max attachments and threads must not be negative")
+        if self.max_thread_depth is not None and self.max_thread_depth < 1:
+            raise ValueError("Max thread depth must be at least 1")
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the number of tokens of a text.
+
+    Counts 4 ASCII characters and each non-ASCII character as one token,
+    which rather over- than underestimates the token counts of common
+    tokenizers.
+    """
+    if text.isascii():
+        return -(-len(text) // 4)
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return -(-ascii_chars // 4) + len(text) - ascii_chars
+
+
+class _RenderCache:
+    """Bounded LRU cache of values derived from objects, e.g. rendered threads.
+
+    An entry is valid while the version it was stored with compares equal to
+    the current version, e.g. a tuple of the parts the value is derived from.
+    Identical parts compare by identity, so lookups of unchanged objects do
+    not compare contents.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._entries: OrderedDict[Hashable, tuple[tuple, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, version: tuple) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, version: tuple, value: Any):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+
+class PromptCache:
+    """Bounded cache of the token estimates and threads rendered into a reasoner's prompts.
+
+    Token estimates of messages are cached per sequence number, and rendered
+    threads per thread ID and budget. Entries are revalidated against the
+    sender, receiver, content and attachments of the messages they were
+    derived from, so that messages created on access, e.g. by a
+    [`ColumnarRoomLog`][group_sense.columnar.ColumnarRoomLog], hit the cache
+    and edited messages are rendered again. A cache is owned by a single
+    reasoner and released with it.
+    """
+
+    def __init__(self, capacity: int = 1024, thread_capacity: int = 256):
+        """Initialize the cache.
+
+        Args:
+            capacity: Maximum number of cached message token estimates.
+            thread_capacity: Maximum number of cached rendered threads.
+
+        Raises:
+            ValueError: If a capacity is less than 1.
+        """
+        if capacity < 1 or thread_capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self._message_tokens = _RenderCache(capacity)
+        self._threads = _RenderCache(thread_capacity)
+
+
+def message_tokens(message: Message, seq_nr: int = 0, cache: PromptCache | None = None) -> int:
+    """Estimated number of tokens of a rendered message, cached per sequence number if a cache is given."""
+    return _message_tokens(message, seq_nr, cache)
+
+
+def _message_tokens(message: Message, seq_nr: int, cache: PromptCache | None, formatted: str | None = None) -> int:
+    if cache is None:
+        return estimate_tokens(format_message(message, seq_nr) if formatted is None else formatted)
+    version = _message_version(message)
+    if (tokens := cache._message_tokens.get(seq_nr, version)) is None:
+        tokens = estimate_tokens(format_message(message, seq_nr) if formatted is None else formatted)
+        cache._message_tokens.put(seq_nr, version, tokens)
+    return tokens
+
+
+def _message_version(message: Message) -> tuple:
+    return message.sender, message.receiver, message.content, message.attachments
+
+
+def user_prompt(
+    messages: list[Message],
+    start_seq_nr: int,
+    summary: RoomSummary | None = None,
+    budget: PromptBudget | None = None,
+    cache: PromptCache | None = None,
+) -> str:
+    if budget is not None:
+        return fit_user_prompt(messages, start_seq_nr, summary, budget, cache)
+
     prompt = []
 
-    if threads := unique_threads(messages):
-        prompt.append(format_threads(threads))
+    if summary is not None:
+        prompt.append(format_summary(summary))
+
+    if threads := resolve_threads(messages):
+        prompt.append(format_threads(threads, cache))
 
     prompt.append(format_update(messages, start_seq_nr))
     return "\n\n".join(prompt)
 
 
+def fit_user_prompt(
+    messages: list[Message],
+    start_seq_nr: int,
+    summary: RoomSummary | None,
+    budget: PromptBudget,
+    cache: PromptCache | None = None,
+) -> str:
+    prompt = []
+    remaining = budget.max_tokens
+
+    if summary is not None:
+        prompt.append(format_summary(summary))
+        remaining -= estimate_tokens(prompt[-1])
+
+    updates = [fit_message(message, seq_nr, budget, cache) for seq_nr, message in enumerate(messages, start_seq_nr)]
+    remaining -= estimate_tokens(UPDATE_TEMPLATE.format(messages="")) + sum(tokens for _, tokens in updates)
+
+    if threads := resolve_threads(messages, budget.max_thread_depth):
+        remaining -= estimate_tokens(THREADS_TEMPLATE.format(threads=""))
+        kept: list[str] = []
+        elided = [thread.id for thread in threads[budget.max_threads :]] if budget.max_threads is not None else []
+        for thread in threads[: budget.max_threads]:
+            formatted_thread, tokens = fit_thread(thread, budget, cache)
+            if tokens <= remaining:
+                kept.append(formatted_thread)
+                remaining -= tokens
+            else:
+                elided.append(thread.id)
+        if elided:
+            kept.append(ELIDED_THREADS_TEMPLATE.format(ids=",".join(elided)))
+            remaining -= estimate_tokens(kept[-1])
+        prompt.append(THREADS_TEMPLATE.format(threads="\n".join(kept)))
+
+    # elide the oldest messages of the update, but not the most recent one
+    elided_count = 0
+    marker = ""
+    while remaining < 0 and elided_count < len(updates) - 1:
+        remaining += updates[elided_count][1] + estimate_tokens(marker)
+        elided_count += 1
+        marker = ELIDED_MESSAGES_TEMPLATE.format(
+            start_seq_nr=start_seq_nr,
+            end_seq_nr=start_seq_nr + elided_count - 1,
+        )
+        remaining -= estimate_tokens(marker)
+
+    formatted_updates = [formatted for formatted, _ in updates[elided_count:]]
+    if remaining < 0:
+        # truncate the content of the most recent message to the remaining budget
+        last = messages[-1]
+        content_tokens = estimate_tokens(last.content)
+        if budget.max_message_tokens is not None:
+            content_tokens = min(content_tokens, budget.max_message_tokens)
+        last_budget = replace(budget, max_message_tokens=max(1, content_tokens + remaining))
+        formatted_updates[-1], _ = fit_message(last, start_seq_nr + len(messages) - 1, last_budget)
+
+    if marker:
+        formatted_updates.insert(0, marker)
+    prompt.append(UPDATE_TEMPLATE.format(messages="\n".join(formatted_updates)))
+    return "\n\n".join(prompt)
+
+
+def fit_message(
+    message: Message, seq_nr: int | None, budget: PromptBudget, cache: PromptCache | None = None
+) -> tuple[str, int]:
+    """Render a message within the message limits of a budget and estimate its tokens."""
+    attachments = message.attachments
+    elided_attachments = 0
+    if budget.max_attachments is not None and len(attachments) > budget.max_attachments:
+        elided_attachments = len(attachments) - budget.max_attachments
+        attachments = attachments[: budget.max_attachments]
+
+    content = message.content
+    if budget.max_message_tokens is not None:
+        content = truncate_content(content, budget.max_message_tokens)
+
+    if not elided_attachments and content is message.content:
+        formatted = format_message(message, seq_nr)
+        if seq_nr is None:
+            return formatted, estimate_tokens(formatted)
+        return formatted, _message_tokens(message, seq_nr, cache, formatted)
+
+    content_parts = []
+    if attachments:
+        content_parts.append(format_attachments(attachments))
+    if elided_attachments:
+        content_parts.append(ELIDED_ATTACHMENTS_TEMPLATE.format(count=elided_attachments))
+    content_parts.append(content)
+
+    formatted = format_content(message, "\n".join(content_parts), seq_nr)
+    return formatted, estimate_tokens(formatted)
+
+
+def truncate_content(content: str, max_tokens: int) -> str:
+    """Truncate a content to about `max_tokens` tokens, keeping its beginning and end."""
+    tokens = estimate_tokens(content)
+    if tokens <= max_tokens:
+        return content
+
+    marker = ELIDED_CONTENT_TEMPLATE.format(tokens=tokens - max_tokens)
+    # one token for the line breaks around the marker
+    chars = len(content) * max(0, max_tokens - estimate_tokens(marker) - 1) // tokens
+    tail = chars // 2
+    parts = [content[: chars - tail], marker]
+    if tail:
+        parts.append(content[-tail:])
+    return "\n".join(parts)
+
+
+def format_owners(owners: list[str]) -> str:
+    return OWNERS_TEMPLATE.format(owners="\n".join(OWNER_TEMPLATE.format(owner=owner) for owner in owners))
+
+
+def format_summary(summary: RoomSummary) -> str:
+    return SUMMARY_TEMPLATE.format(end_seq_nr=summary.end - 1, content=summary.content)
+
+
 def format_update(messages: list[Message], start_seq_nr: int) -> str:
     return UPDATE_TEMPLATE.format(messages=format_update_messages(messages, start_seq_nr))
 
@@ -48,7 +357,7 @@ def format_update_messages(messages: list[Message], start_seq_nr: int) -> str:
     return "\n".join([format_message(message, seq_nr) for seq_nr, message in enumerate(messages, start_seq_nr)])
 
 
-def format_attachments(attachments: list[Attachment]) -> str:
+def format_attachments(attachments: Sequence[Attachment]) -> str:
     return "\n".join(format_attachment(attachment) for attachment in attachments)
 
 
@@ -60,24 +369,92 @@ def format_attachment(attachment: Attachment) -> str:
     )
 
 
-def format_threads(threads: list[Thread]) -> str:
-    formatted_threads = [format_thread(thread) for thread in threads]
+def format_threads(threads: list[Thread], cache: PromptCache | None = None) -> str:
+    formatted_threads = [format_thread(thread, cache=cache) for thread in threads]
     return THREADS_TEMPLATE.format(threads="\n".join(formatted_threads))
 
 
-def format_thread(thread: Thread) -> str:
-    formatted_messages = [format_message(message) for message in thread.messages]
+def format_thread(thread: Thread, budget: PromptBudget | None = None, cache: PromptCache | None = None) -> str:
+    return fit_thread(thread, budget, cache)[0]
+
+
+def fit_thread(thread: Thread, budget: PromptBudget | None = None, cache: PromptCache | None = None) -> tuple[str, int]:
+    """Render a thread and estimate its tokens, memoized per thread ID and budget if a cache is given."""
+    if cache is None:
+        formatted = _format_thread(thread, budget)
+        return formatted, estimate_tokens(formatted)
+
+    key = (thread.id, budget)
+    version = tuple(_message_version(message) for message in thread.messages)
+    if (fitted := cache._threads.get(key, version)) is None:
+        formatted = _format_thread(thread, budget)
+        fitted = formatted, estimate_tokens(formatted)
+        cache._threads.put(key, version, fitted)
+    return fitted
+
+
+def _format_thread(thread: Thread, budget: PromptBudget | None) -> str:
+    if budget is None:
+        formatted_messages = [format_message(message) for message in thread.messages]
+        return THREAD_TEMPLATE.format(thread_id=thread.id, messages="\n".join(formatted_messages))
+
+    fitted = [fit_message(message, None, budget) for message in thread.messages]
+    if budget.max_thread_tokens is not None:
+        # keep the most recent thread messages that fit
+        remaining = budget.max_thread_tokens
+        start = len(fitted)
+        while start > 0 and fitted[start - 1][1] <= remaining:
+            remaining -= fitted[start - 1][1]
+            start -= 1
+        if start:
+            fitted = [(ELIDED_THREAD_MESSAGES_TEMPLATE.format(count=start), 0)] + fitted[start:]
+
+    formatted_messages = [formatted for formatted, _ in fitted]
     return THREAD_TEMPLATE.format(thread_id=thread.id, messages="\n".join(formatted_messages))
 
 
 def unique_threads(messages: list[Message]) -> list[Thread]:
-    thread_ids = set()
-    threads = []
-    for message in messages:
-        for thread in message.threads:
-            if thread.id not in thread_ids:
-                thread_ids.add(thread.id)
+    return resolve_threads(messages, max_depth=1)
+
+
+def resolve_threads(
+    messages: Sequence[Message],
+    max_depth: int | None = None,
+    max_threads: int | None = None,
+) -> list[Thread]:
+    """Resolve the threads referenced by messages, including nested references.
+
+    Walks the thread reference graph breadth-first, once per thread ID:
+    threads are ordered by reference depth and then by first reference, and
+    reference cycles end at threads that were already visited.
+
+    Args:
+        messages: Messages whose thread references are resolved.
+        max_depth: Optional maximum reference depth. Threads referenced
+            directly by `messages` have depth 1.
+        max_threads: Optional maximum number of resolved threads.
+
+    Returns:
+        Unique resolved threads.
+    """
+    visited: set[str] = set()
+    threads: list[Thread] = []
+    level: Sequence[Message] = messages
+    depth = 0
+
+    while level and (max_depth is None or depth < max_depth):
+        next_level: list[Message] = []
+        for message in level:
+            for thread in message.threads:
+                if thread.id in visited:
+                    continue
+                if max_threads is not None and len(threads) >= max_threads:
+                    return threads
+                visited.add(thread.id)
                 threads.append(thread)
+                next_level.extend(thread.messages)
+        level = next_level
+        depth += 1
 
     return threads
 
@@ -89,8 +466,10 @@ def format_message(message: Message, seq_nr: int | None = None) -> str:
         content_parts.append(format_attachments(message.attachments))
 
     content_parts.append(message.content)
-    content = "\n".join(content_parts)
+    return format_content(message, "\n".join(content_parts), seq_nr)
+
 
+def format_content(message: Message, content: str, seq_nr: int | None = None) -> str:
     if seq_nr is None:
         message_template = THREAD_MESSAGE_TEMPLATE
     else:
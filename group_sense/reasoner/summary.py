@@ -0,0 +1,167 @@
+import logging
+from asyncio import Lock
+from typing import Any
+
+from pydantic_ai import Agent
+from pydantic_ai.models import Model
+from pydantic_ai.models.google import GoogleModelSettings
+from pydantic_ai.settings import ModelSettings
+
+from group_sense.message import Message
+from group_sense.reasoner.base import RoomSummary
+from group_sense.reasoner.prompt import PromptBudget, PromptCache, user_prompt
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT = """You maintain a running summary of a group chat.
+
+You receive the previous summary (if any) in a <summary> element and the next
+window of group chat messages in an <update> element. Messages may reference
+threads from other group chats in a <threads> element.
+
+Write an updated summary that replaces the previous one. Preserve everything
+that later messages may depend on: who said what to whom, open questions and
+requests (with the user ID of the asker and the addressee), answers given,
+decisions, commitments, facts, dates, numbers and corrections. Drop greetings
+and small talk. Refer to users by their user IDs. Write plain text only."""
+
+
+class RoomSummarizer:
+    """Incremental summarizer of a group chat shared by all reasoners of a room.
+
+    Folds windows of group chat messages into a running
+    [`RoomSummary`][group_sense.reasoner.base.RoomSummary]. Each message is
+    summarized once per room, independent of the number of reasoner instances.
+    The most recent `tail` messages are never summarized so that reasoners
+    always see them raw.
+
+    Used by
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    to replace the raw backlog of lagging per-sender reasoners with the room
+    summary, reducing total token usage from O(owners x messages) toward
+    O(messages + owners x tail).
+
+    Example:
+        ```python
+        summarizer = RoomSummarizer(window=50, tail=20)
+        reasoner = ConcurrentGroupReasoner(factory=factory, summarizer=summarizer)
+        ```
+    """
+
+    def __init__(
+        self,
+        model: str | Model | None = None,
+        model_settings: ModelSettings | None = None,
+        window: int = 50,
+        tail: int = 20,
+        prompt_budget: PromptBudget | None = None,
+    ):
+        """Initialize the summarizer with a window size and optional model configuration.
+
+        Args:
+            model: Optional AI model to use. Defaults to "google-gla:gemini-3-flash-preview".
+                Can be a model name string or a pydantic-ai Model instance.
+            model_settings: Optional model-specific settings. Defaults to
+                GoogleModelSettings with low thinking level.
+            window: Minimum number of new messages (excluding the tail) that
+                triggers a summary update.
+            tail: Number of most recent messages that are excluded from
+                summarization. Must be at least 1.
+            prompt_budget: Optional token budget of the summary prompts. Large
+                windows are truncated and elided to fit into the budget, see
+                [`PromptBudget`][group_sense.reasoner.prompt.PromptBudget].
+
+        Raises:
+            ValueError: If window or tail is less than 1.
+        """
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+        if tail < 1:
+            raise ValueError("Tail must be at least 1")
+
+        self._window = window
+        self._tail = tail
+        self._prompt_budget = prompt_budget
+        self._prompt_cache = PromptCache()
+        self._summary: RoomSummary | None = None
+        self._lock = Lock()
+        self._agent = Agent(
+            system_prompt=SYSTEM_PROMPT,
+            output_type=str,
+            model=model or "google-gla:gemini-3-flash-preview",
+            model_settings=model_settings
+            or GoogleModelSettings(
+                google_thinking_config={
+                    "thinking_level": "low",
+                }
+            ),
+        )
+
+    @property
+    def summary(self) -> RoomSummary | None:
+        """The most recent room summary or `None` if no summary has been created yet."""
+        return self._summary
+
+    @property
+    def end(self) -> int:
+        """Number of group chat messages covered by the current summary."""
+        return self._summary.end if self._summary else 0
+
+    def due(self, num_messages: int) -> bool:
+        """Whether a summary update is due for a room with `num_messages` messages."""
+        return num_messages - self._tail - self.end >= self._window
+
+    async def update(self, messages: list[Message]) -> RoomSummary | None:
+        """Fold the next window of messages into the room summary.
+
+        Summarizes all messages after the current summary except the most
+        recent `tail` messages, if these are at least `window` messages.
+        Otherwise, the current summary is returned unchanged. Concurrent
+        calls are serialized.
+
+        Args:
+            messages: All group chat messages of the room so far.
+
+        Returns:
+            The updated (or unchanged) room summary.
+        """
+        async with self._lock:
+            if not self.due(len(messages)):
+                return self._summary
+
+            start = self.end
+            end = len(messages) - self._tail
+
+            summary_prompt = user_prompt(
+                messages[start:end], start, self._summary, self._prompt_budget, self._prompt_cache
+            )
+            logger.debug(f"Summary prompt:\n{summary_prompt}")
+            result = await self._agent.run(summary_prompt)
+
+            self._summary = RoomSummary(content=result.output, end=end)
+            return self._summary
+
+    def get_serialized(self) -> dict[str, Any]:
+        """Serialize the summarizer's state for persistence.
+
+        Returns:
+            Dictionary containing the summary content and the number of
+                covered messages, or an empty dictionary if no summary has
+                been created yet.
+        """
+        if self._summary is None:
+            return {}
+        return {
+            "content": self._summary.content,
+            "end": self._summary.end,
+        }
+
+    def set_serialized(self, state: dict[str, Any]):
+        """Restore the summarizer's state from serialized data.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.reasoner.summary.RoomSummarizer.get_serialized].
+        """
+        self._summary = RoomSummary(content=state["content"], end=state["end"]) if state else None
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from asyncio import AbstractEventLoop, run_coroutine_threadsafe
+from collections.abc import Coroutine, Iterable
+from concurrent.futures import CancelledError, Future, wait
+from functools import partial
+from threading import Thread
+from typing import Any, TypeVar
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Response
+from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SyncGroupReasoner:
+    """Thread-safe, synchronous facade of a concurrent group reasoner.
+
+    Runs a
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    on a background event loop thread, for integration into threaded
+    services without a running event loop, e.g. thread-pool web servers or
+    message queue consumers. Methods can be called from any thread. Calls are
+    handed over to the loop thread without locking, and
+    [`process()`][group_sense.reasoner.sync.SyncGroupReasoner.process]
+    returns a `concurrent.futures.Future` that can be waited on with a
+    timeout. Calls from the same thread are applied in call order.
+
+    The reasoner must only be used through the facade after it is wrapped.
+    Several facades can share a loop thread, e.g. one per room:
+
+    Example:
+        ```python
+        with SyncGroupReasoner(ConcurrentGroupReasoner(factory=factory)) as room1:
+            room2 = SyncGroupReasoner(ConcurrentGroupReasoner(factory=factory), loop=room1.loop)
+
+            future = room1.process(Message(content="Hi", sender="alice"))
+            response = future.result(timeout=30)
+
+            responses = room2.process_batch(messages, timeout=30)
+            room2.close()
+        ```
+    """
+
+    def __init__(self, reasoner: ConcurrentGroupReasoner, loop: AbstractEventLoop | None = None):
+        """Initialize the facade with a reasoner and an optional event loop.
+
+        Args:
+            reasoner: Concurrent group reasoner to run on the loop thread.
+            loop: Optional event loop that runs in another thread, e.g. the
+                [`loop`][group_sense.reasoner.sync.SyncGroupReasoner.loop] of
+                another facade. If not set, a new event loop is started in a
+                daemon thread that is stopped on
+                [`close()`][group_sense.reasoner.sync.SyncGroupReasoner.close].
+        """
+        self._reasoner = reasoner
+        self._thread: Thread | None = None
+
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = Thread(target=loop.run_forever, name="group-sense-loop", daemon=True)
+            self._thread.start()
+        self._loop = loop
+
+    def __enter__(self) -> "SyncGroupReasoner":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close(timeout=None if exc_type is None else 0)
+
+    @property
+    def loop(self) -> AbstractEventLoop:
+        """Event loop the reasoner runs on."""
+        return self._loop
+
+    @property
+    def reasoner(self) -> ConcurrentGroupReasoner:
+        """The wrapped reasoner. Must only be accessed from the loop thread."""
+        return self._reasoner
+
+    def append(self, message: Message):
+        """Add a message to the group chat context without triggering reasoning.
+
+        Does not wait for the message to be added. Errors, e.g. of a closed
+        reasoner, are logged.
+
+        Args:
+            message: Message to add to the group chat context.
+        """
+        self._loop.call_soon_threadsafe(self._append, message)
+
+    def process(self, message: Message) -> Future[Response]:
+        """Add a message to the group chat context and trigger reasoning.
+
+        Args:
+            message: Message to process.
+
+        Returns:
+            Future that resolves to the reasoning result, or to the error
+                raised by
+                [`ConcurrentGroupReasoner.process()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.process].
+        """
+        future: Future[Response] = Future()
+        self._loop.call_soon_threadsafe(self._process, [message], [future])
+        return future
+
+    def process_batch(self, messages: Iterable[Message], timeout: float | None = None) -> list[Response]:
+        """Process messages in order and wait for all responses.
+
+        The messages are handed over to the loop thread in a single call.
+
+        Args:
+            messages: Messages to process.
+            timeout: Maximum time in seconds to wait for all responses.
+
+        Returns:
+            Responses in the order of `messages`.
+
+        Raises:
+            TimeoutError: If not all responses are available within the timeout.
+        """
+        messages = list(messages)
+        futures: list[Future[Response]] = [Future() for _ in messages]
+        self._loop.call_soon_threadsafe(self._process, messages, futures)
+        _, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            raise TimeoutError(f"{len(not_done)} of {len(futures)} responses not available within timeout")
+        return [future.result() for future in futures]
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Run a coroutine on the loop thread, e.g. of an async reasoner method.
+
+        Example:
+            ```python
+            reasoner.submit(reasoner.reasoner.load()).result()
+            ```
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            Future that resolves to the result of the coroutine.
+        """
+        return run_coroutine_threadsafe(coro, self._loop)
+
+    def close(self, timeout: float | None = None):
+        """Close the reasoner and stop the loop thread, if owned.
+
+        Blocks until the reasoner is closed with
+        [`aclose()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.aclose].
+
+        Args:
+            timeout: Maximum time in seconds to wait for pending runs before
+                they are cancelled. Waits until all runs completed if `None`.
+        """
+        if self._loop.is_closed():
+            return
+        self.submit(self._reasoner.aclose(timeout=timeout)).result()
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def _append(self, message: Message):
+        try:
+            self._reasoner.append(message)
+        except Exception:
+            logger.exception("Failed to append message")
+
+    def _process(self, messages: list[Message], futures: list[Future[Response]]):
+        for message, future in zip(messages, futures):
+            if not future.set_running_or_notify_cancel():
+                # cancelled before it was handed over
+                continue
+            try:
+                result = self._reasoner.process(message)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                result.add_done_callback(partial(_copy_result, future))
+
+
+def _copy_result(future: Future[Response], result: asyncio.Future[Response]):
+    if result.cancelled():
+        future.set_exception(CancelledError())
+    elif (exc := result.exception()) is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result.result())
@@ -0,0 +1,119 @@
+import logging
+from collections.abc import Sequence
+
+from google.genai.types import ThinkingLevel
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.models import Model
+from pydantic_ai.models.google import GoogleModelSettings
+from pydantic_ai.settings import ModelSettings
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, Response
+from group_sense.reasoner.prompt import user_prompt
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT = """You check whether a delegation decision made for a group chat is still needed.
+
+A triage reasoner decided to delegate a query to a downstream application on
+behalf of a user, based on the group chat messages up to a certain point. Since
+then, new messages were added to the group chat. You receive the delegated query
+and its receiver in a <delegation> element and the new group chat messages in an
+<update> element.
+
+Decide "ignore" if the new messages make the query irrelevant, e.g. because it
+has already been answered by another user or the assistant, or because it was
+withdrawn. Otherwise decide "delegate" and return the query and receiver,
+updated if the new messages refine the query."""
+
+
+DELEGATION_TEMPLATE = """<delegation receiver="{receiver}">
+{query}
+</delegation>"""
+
+
+class DecisionValidator:
+    """Cheap re-validation of stale DELEGATE decisions.
+
+    A reasoning call may return a DELEGATE decision after the group chat has
+    moved on, e.g. after the question was answered by another user or by an
+    assistant message added with
+    [`append()`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner.append].
+    The validator checks the delegated query against the messages added since
+    the decision's [`position`][group_sense.reasoner.base.Response] only, with
+    minimal thinking, which is much cheaper than a downstream call whose
+    answer is irrelevant.
+
+    Used by
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    to re-validate stale decisions before they are returned.
+
+    Example:
+        ```python
+        reasoner = ConcurrentGroupReasoner(factory=factory, validator=DecisionValidator())
+        ```
+    """
+
+    def __init__(
+        self,
+        model: str | Model | None = None,
+        model_settings: ModelSettings | None = None,
+    ):
+        """Initialize the validator with optional model configuration.
+
+        Args:
+            model: Optional AI model to use. Defaults to "google-gla:gemini-3-flash-preview".
+                Can be a model name string or a pydantic-ai Model instance.
+            model_settings: Optional model-specific settings. Defaults to
+                GoogleModelSettings with minimal thinking level.
+        """
+        self._agent = Agent(
+            system_prompt=SYSTEM_PROMPT,
+            output_type=NativeOutput(Response),
+            model=model or "google-gla:gemini-3-flash-preview",
+            model_settings=model_settings
+            or GoogleModelSettings(
+                google_thinking_config={
+                    "thinking_level": ThinkingLevel.MINIMAL,
+                    "include_thoughts": False,
+                }
+            ),
+        )
+
+    async def validate(self, response: Response, messages: Sequence[Message]) -> Response:
+        """Re-validate a DELEGATE decision against the messages added after it.
+
+        Args:
+            response: Response with a DELEGATE decision and a position.
+            messages: All group chat messages of the room so far.
+
+        Returns:
+            The original response if no messages were added after its
+                position, otherwise the re-validated response, positioned at
+                the end of `messages`.
+
+        Raises:
+            ValueError: If the response is not a DELEGATE decision or has no position.
+        """
+        if response.decision != Decision.DELEGATE:
+            raise ValueError("Only DELEGATE decisions can be validated")
+        if response.position is None:
+            raise ValueError("Response has no position")
+        if response.position >= len(messages):
+            return response
+
+        delegation = DELEGATION_TEMPLATE.format(receiver=response.receiver or "", query=response.query or "")
+        validation_prompt = f"{delegation}\n\n{user_prompt(list(messages[response.position :]), response.position)}"
+        logger.debug(f"Validation prompt:\n{validation_prompt}")
+        result = await self._agent.run(validation_prompt)
+
+        validated = result.output
+        if validated.decision == Decision.IGNORE:
+            return Response(decision=Decision.IGNORE, position=len(messages))
+        return Response(
+            decision=Decision.DELEGATE,
+            query=validated.query or response.query,
+            receiver=validated.receiver or response.receiver,
+            position=len(messages),
+        )
@@ -0,0 +1,328 @@
+import json
+import logging
+import re
+import time
+from asyncio import CancelledError, Queue, Semaphore, TaskGroup, create_task, sleep, to_thread
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from pydantic import TypeAdapter
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, GroupReasoner, Response
+from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+
+logger = logging.getLogger(__name__)
+
+_message_adapter = TypeAdapter(Message)
+
+_WHITESPACE = re.compile(r"\s*")
+_ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+
+SUFFIXES = (".json", ".ndjson", ".jsonl")
+"""File suffixes of chat exports found in input directories."""
+
+
+@dataclass
+class ReplayStats:
+    """Counters of a [`replay()`][group_sense.replay.replay] run.
+
+    Attributes:
+        rooms: Number of rooms seen so far.
+        messages: Number of messages processed so far.
+        decisions: Number of decisions written so far.
+        delegations: Number of DELEGATE decisions written so far.
+        errors: Number of failed reasoner calls and unreadable sources.
+        elapsed: Seconds since the start of the run.
+    """
+
+    rooms: int = 0
+    messages: int = 0
+    decisions: int = 0
+    delegations: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Processed messages per second."""
+        return self.messages / self.elapsed if self.elapsed > 0 else 0.0
+
+
+async def read_records(
+    path: Path, chunk_size: int = 1 << 16, max_record_size: int = 1 << 24
+) -> AsyncIterator[dict[str, Any]]:
+    """Incrementally read the records of a chat export.
+
+    Supports JSON arrays of message objects and newline-delimited JSON
+    (NDJSON) with one message object per line. The format is detected from
+    the first non-whitespace character. The file is read in chunks of
+    `chunk_size` characters in a thread, so that memory usage is bounded by
+    the size of the largest record and the event loop is not blocked.
+
+    Args:
+        path: Path of the chat export.
+        chunk_size: Number of characters read at once.
+        max_record_size: Maximum number of characters of a single record,
+            including surrounding whitespace.
+
+    Yields:
+        Decoded records, in file order.
+
+    Raises:
+        ValueError: If the file contains invalid or truncated JSON, or a
+            record exceeds `max_record_size`.
+    """
+    decoder = json.JSONDecoder()
+    array: bool | None = None
+    buffer = ""
+    pos = 0
+    eof = False
+
+    with open(path, encoding="utf-8") as f:
+
+        async def fill():
+            # read at least as much as is buffered, or up to the next line of NDJSON, so
+            # that a record spanning many chunks is joined and decoded only a few times
+            nonlocal buffer, pos, eof
+            chunks = [buffer[pos:]]
+            size = len(chunks[0])
+            while True:
+                chunk = await to_thread(f.read, chunk_size)
+                eof = not chunk
+                chunks.append(chunk)
+                size += len(chunk)
+                if eof or size >= 2 * len(chunks[0]) or size > max_record_size or (not array and "\n" in chunk):
+                    break
+            buffer, pos = "".join(chunks), 0
+
+        while True:
+            pos = (_ARRAY_SEPARATOR if array else _WHITESPACE).match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos == len(buffer):
+                if eof:
+                    break
+                await fill()
+                continue
+
+            if array is None:
+                array = buffer[pos] == "["
+                if array:
+                    pos += 1
+                continue
+            if array and buffer[pos] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof or _complete_line(buffer, pos, e.pos, array):
+                    raise ValueError(f"Invalid JSON in {path}: {e}") from e
+                if len(buffer) - pos > max_record_size:
+                    raise ValueError(f"Record in {path} exceeds {max_record_size} characters") from e
+                # record continues in the next chunk
+                await fill()
+                continue
+
+            pos = end
+            yield record
+
+        if array:
+            raise ValueError(f"Unterminated JSON array in {path}")
+
+
+def _complete_line(buffer: str, start: int, error: int, array: bool) -> bool:
+    # whether a decoding error of NDJSON is within a newline-terminated line, i.e. not caused by a truncated record
+    if array:
+        return False
+    newline = buffer.find("\n", start)
+    return newline != -1 and error <= newline
+
+
+def expand_sources(paths: Iterable[Path]) -> list[Path]:
+    """Expand directories to the chat exports they contain, recursively.
+
+    Args:
+        paths: Paths of chat exports or directories.
+
+    Returns:
+        Paths of chat exports, with the files of each directory sorted.
+    """
+    sources = []
+    for path in paths:
+        if path.is_dir():
+            sources.extend(sorted(p for p in path.rglob("*") if p.suffix in SUFFIXES and p.is_file()))
+        else:
+            sources.append(path)
+    return sources
+
+
+async def replay(
+    sources: Iterable[Path],
+    output: TextIO,
+    create_reasoner: Callable[[str], GroupReasoner | ConcurrentGroupReasoner],
+    concurrency: int = 8,
+    batch_size: int = 1,
+    context_senders: Iterable[str] = ("system",),
+    room_key: str = "room",
+    queue_size: int = 1000,
+    on_progress: Callable[[ReplayStats], None] | None = None,
+    progress_interval: float = 10.0,
+) -> ReplayStats:
+    """Replay chat exports through reasoners and write their decisions as NDJSON.
+
+    Streams the messages of all sources with
+    [`read_records()`][group_sense.replay.read_records] and dispatches them
+    to one reasoner per room. Rooms are processed in parallel, messages of a
+    room in order. The room of a message is its `room_key` field, or the
+    source path without suffix if the field is missing, so each file of a
+    directory of exports is a separate room.
+
+    A [`GroupReasoner`][group_sense.reasoner.base.GroupReasoner] processes
+    messages in batches of `batch_size`, one batch at a time. A
+    [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    processes each message, except messages from `context_senders` which are
+    only appended to the room's context. Its messages are submitted in order
+    and their responses awaited concurrently, so that the triggers of
+    different senders of a room run in parallel. Decisions are then written
+    in completion order.
+
+    Memory usage is bounded: at most `concurrency` sources are read at a
+    time, and readers wait while a room has `queue_size` pending messages.
+
+    Sources that cannot be read or contain invalid records are logged and
+    skipped from the first invalid record on.
+
+    Each decision is written as a JSON line with the room, the sequence
+    number and sender of the last message it covers, and the response fields.
+    Failed reasoner calls are logged, counted and written with an `error`
+    field instead.
+
+    Args:
+        sources: Paths of chat exports, see
+            [`expand_sources()`][group_sense.replay.expand_sources].
+        output: Text stream the decisions are written to.
+        create_reasoner: Creates the reasoner of a room, called with the room ID.
+        concurrency: Maximum number of concurrent reasoner calls, and of
+            concurrently read sources.
+        batch_size: Number of messages per call of a `GroupReasoner`.
+        context_senders: Senders whose messages are appended to the context of
+            a `ConcurrentGroupReasoner` without reasoning.
+        room_key: Name of the record field that contains the room ID.
+        queue_size: Maximum number of pending messages per room.
+        on_progress: Optional callback that receives the current stats every
+            `progress_interval` seconds.
+        progress_interval: Seconds between progress callbacks.
+
+    Returns:
+        Final stats of the run.
+
+    Raises:
+        ValueError: If concurrency, batch_size or queue_size is less than 1.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+    if queue_size < 1:
+        raise ValueError("Queue size must be at least 1")
+
+    context_senders = set(context_senders)
+    calls = Semaphore(concurrency)
+    readers = Semaphore(concurrency)
+    queues: dict[str, Queue[Message | None]] = {}
+    stats = ReplayStats()
+    start = time.perf_counter()
+
+    def write(room: str, seq_nr: int, sender: str, response: Response | None, error: BaseException | None = None):
+        record: dict[str, Any] = {"room": room, "seq_nr": seq_nr, "sender": sender}
+        if response is not None:
+            record.update(response.model_dump(mode="json"))
+            stats.delegations += response.decision == Decision.DELEGATE
+        else:
+            record["error"] = repr(error)
+            stats.errors += 1
+        output.write(json.dumps(record) + "\n")
+        stats.decisions += 1
+
+    async def complete(room: str, seq_nr: int, sender: str, response: Awaitable[Response]):
+        # completes a call that holds a slot of the calls semaphore
+        try:
+            result = await response
+        except CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Reasoner call failed in room {room} at seq_nr {seq_nr}")
+            write(room, seq_nr, sender, None, e)
+        else:
+            write(room, seq_nr, sender, result)
+        finally:
+            calls.release()
+
+    async def run_room(room: str, queue: Queue[Message | None]):
+        reasoner = create_reasoner(room)
+        seq_nr = 0
+        batch: list[Message] = []
+
+        async with TaskGroup() as pending:
+            while (message := await queue.get()) is not None:
+                if isinstance(reasoner, ConcurrentGroupReasoner):
+                    if message.sender in context_senders:
+                        reasoner.append(message)
+                    else:
+                        # process() is called in message order, its responses are awaited concurrently,
+                        # so that triggers of different senders of a room run in parallel
+                        await calls.acquire()
+                        pending.create_task(complete(room, seq_nr, message.sender, reasoner.process(message)))
+                else:
+                    batch.append(message)
+                    if len(batch) == batch_size:
+                        await calls.acquire()
+                        await complete(room, seq_nr, message.sender, reasoner.process(batch))
+                        batch = []
+                seq_nr += 1
+                stats.messages += 1
+
+        if batch and isinstance(reasoner, GroupReasoner):
+            await calls.acquire()
+            await complete(room, seq_nr - 1, batch[-1].sender, reasoner.process(batch))
+
+    async def read_source(path: Path, tasks: TaskGroup):
+        default_room = str(path.with_suffix(""))
+        async with readers:
+            try:
+                async for record in read_records(path):
+                    room = str(record.pop(room_key, default_room))
+                    message = _message_adapter.validate_python(record)
+                    if room not in queues:
+                        queues[room] = Queue(maxsize=queue_size)
+                        stats.rooms += 1
+                        tasks.create_task(run_room(room, queues[room]))
+                    await queues[room].put(message)
+            except (OSError, ValueError) as e:
+                # skip the rest of an unreadable source, messages read so far are processed
+                logger.error(f"Failed to read {path}: {e}")
+                stats.errors += 1
+
+    async def report():
+        while True:
+            await sleep(progress_interval)
+            stats.elapsed = time.perf_counter() - start
+            on_progress(stats)  # type: ignore[misc]
+
+    reporter = create_task(report()) if on_progress is not None else None
+    try:
+        async with TaskGroup() as rooms:
+            async with TaskGroup() as sources_group:
+                for path in sources:
+                    sources_group.create_task(read_source(path, rooms))
+            # all sources read, let rooms finish their pending messages
+            for queue in queues.values():
+                await queue.put(None)
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
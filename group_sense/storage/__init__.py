@@ -0,0 +1,4 @@
+from group_sense.storage.blob import BlobStore, deduplicate, expand, release
+from group_sense.storage.codec import decode_compact, encode_compact
+from group_sense.storage.sqlite import SQLiteStore
+from group_sense.storage.wal import WriteAheadLog
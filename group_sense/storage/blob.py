@@ -0,0 +1,192 @@
+import hashlib
+import re
+from typing import Any
+
+# rendered group chat messages and threads start on a new line, so that identical
+# messages and threads in the prompts of different owners become identical chunks
+_CHUNK_BOUNDARY = re.compile(r"(?<=\n)(?=<(?:message|thread|summary) |</(?:update|threads)>)")
+
+_CHUNKS_KEY = "$chunks"
+
+
+class BlobStore:
+    """Content-addressed store of text blobs with reference counts.
+
+    Each distinct text is stored once under the hash of its content. Putting
+    the same text again increments its reference count instead of storing it
+    again. Blobs whose reference count dropped to zero are deleted by
+    [`gc()`][group_sense.storage.blob.BlobStore.gc].
+
+    Used by [`deduplicate()`][group_sense.storage.blob.deduplicate] to share
+    the content of conversation histories across reasoner states.
+
+    Example:
+        ```python
+        blobs = BlobStore()
+        key = blobs.put("<message ...>Hello</message>")
+        assert blobs.put("<message ...>Hello</message>") == key
+
+        blobs.release(key)
+        blobs.release(key)
+        blobs.gc()  # deletes the blob
+        ```
+    """
+
+    def __init__(self):
+        self._blobs: dict[str, str] = {}
+        self._refs: dict[str, int] = {}
+        self._unreferenced: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._blobs
+
+    @property
+    def size(self) -> int:
+        """Total number of characters of all stored blobs."""
+        return sum(len(data) for data in self._blobs.values())
+
+    def put(self, data: str) -> str:
+        """Store a text blob, or add a reference to an existing identical blob.
+
+        Args:
+            data: Text to store.
+
+        Returns:
+            Key of the blob, derived from its content.
+        """
+        key = hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+        if key not in self._blobs:
+            self._blobs[key] = data
+        self._refs[key] = self._refs.get(key, 0) + 1
+        self._unreferenced.discard(key)
+        return key
+
+    def get(self, key: str) -> str:
+        """Return the text of a blob.
+
+        Raises:
+            KeyError: If no blob is stored under key.
+        """
+        return self._blobs[key]
+
+    def release(self, key: str):
+        """Remove a reference to a blob.
+
+        Raises:
+            KeyError: If the blob has no references.
+        """
+        if self._refs.get(key, 0) < 1:
+            raise KeyError(key)
+        self._refs[key] -= 1
+        if self._refs[key] == 0:
+            self._unreferenced.add(key)
+
+    def gc(self) -> int:
+        """Delete all blobs without references.
+
+        Returns:
+            Number of deleted blobs.
+        """
+        unreferenced, self._unreferenced = self._unreferenced, set()
+        for key in unreferenced:
+            del self._refs[key]
+            del self._blobs[key]
+        return len(unreferenced)
+
+    def get_serialized(self) -> dict[str, Any]:
+        """Serialize the blobs and their reference counts for persistence."""
+        return {"blobs": dict(self._blobs), "refs": dict(self._refs)}
+
+    def set_serialized(self, state: dict[str, Any]):
+        """Restore blobs and reference counts from serialized data.
+
+        Args:
+            state: Dictionary containing serialized state from
+                [`get_serialized()`][group_sense.storage.blob.BlobStore.get_serialized].
+        """
+        self._blobs = dict(state["blobs"])
+        self._refs = dict(state["refs"])
+        self._unreferenced = {key for key, refs in self._refs.items() if refs == 0}
+
+
+def deduplicate(state: dict[str, Any], blobs: BlobStore, min_size: int = 256) -> dict[str, Any]:
+    """Move the content of a reasoner state's conversation history into a blob store.
+
+    Splits string content of at least `min_size` characters of all history
+    message parts into chunks at the boundaries of rendered group chat
+    messages and threads, stores the chunks in `blobs` and replaces the
+    content with references. Group chat messages that appear in the
+    histories of several owners are stored only once. States without a
+    conversation history (`agent` key) are returned unchanged.
+
+    Args:
+        state: Serialized reasoner state, e.g. from
+            [`DefaultGroupReasoner.get_serialized()`][group_sense.reasoner.default.DefaultGroupReasoner.get_serialized].
+        blobs: Blob store that receives the chunks.
+        min_size: Minimum length of content that is moved into the blob store.
+
+    Returns:
+        The state with chunk references in place of long content. Must be
+            expanded with [`expand()`][group_sense.storage.blob.expand]
+            before it can be restored.
+    """
+    if "agent" not in state:
+        return state
+
+    def chunked(part: dict[str, Any]) -> dict[str, Any]:
+        content = part.get("content")
+        if not isinstance(content, str) or len(content) < min_size:
+            return part
+        chunks = [chunk for chunk in _CHUNK_BOUNDARY.split(content) if chunk]
+        return {**part, "content": {_CHUNKS_KEY: [blobs.put(chunk) for chunk in chunks]}}
+
+    agent = [{**message, "parts": [chunked(part) for part in message["parts"]]} for message in state["agent"]]
+    return {**state, "agent": agent}
+
+
+def expand(state: dict[str, Any], blobs: BlobStore) -> dict[str, Any]:
+    """Replace the chunk references of a deduplicated state with their content.
+
+    Args:
+        state: State from [`deduplicate()`][group_sense.storage.blob.deduplicate].
+        blobs: Blob store that contains the chunks.
+
+    Returns:
+        The state as it was before deduplication.
+    """
+    if "agent" not in state:
+        return state
+
+    def expanded(part: dict[str, Any]) -> dict[str, Any]:
+        if (keys := _chunk_keys(part)) is None:
+            return part
+        return {**part, "content": "".join(blobs.get(key) for key in keys)}
+
+    agent = [{**message, "parts": [expanded(part) for part in message["parts"]]} for message in state["agent"]]
+    return {**state, "agent": agent}
+
+
+def release(state: dict[str, Any], blobs: BlobStore):
+    """Release the references of a deduplicated state that is no longer stored.
+
+    Blobs that are no longer referenced by any state are deleted by the next
+    [`BlobStore.gc()`][group_sense.storage.blob.BlobStore.gc].
+
+    Args:
+        state: State from [`deduplicate()`][group_sense.storage.blob.deduplicate].
+        blobs: Blob store that contains the chunks.
+    """
+    for message in state.get("agent", []):
+        for part in message["parts"]:
+            for key in _chunk_keys(part) or []:
+                blobs.release(key)
+
+
+def _chunk_keys(part: dict[str, Any]) -> list[str] | None:
+    content = part.get("content")
+    if isinstance(content, dict) and _CHUNKS_KEY in content:
+        return content[_CHUNKS_KEY]
+    return None
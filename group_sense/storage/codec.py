@@ -0,0 +1,46 @@
+from typing import Any
+
+
+def _import_compact():
+    try:
+        import msgpack
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Compact encoding requires the msgpack and zstandard packages. "
+            "Install them with: pip install group-sense[compact]"
+        ) from e
+    return msgpack, zstandard
+
+
+def encode_compact(state: dict[str, Any], level: int = 3) -> bytes:
+    """Encode a serialized state with MessagePack and Zstandard compression.
+
+    Compact binary alternative to JSON encoding of the states returned by
+    `get_serialized()` methods. Requires the optional `compact` dependencies
+    (`pip install group-sense[compact]`). Encoding large states is CPU-bound
+    and should run in an executor, e.g. via `loop.run_in_executor()`.
+
+    Args:
+        state: JSON-serializable state.
+        level: Zstandard compression level. Higher levels compress better but
+            slower.
+
+    Returns:
+        Compressed binary encoding of the state.
+    """
+    msgpack, zstandard = _import_compact()
+    return zstandard.ZstdCompressor(level=level).compress(msgpack.packb(state))
+
+
+def decode_compact(data: bytes) -> dict[str, Any]:
+    """Decode a state encoded with [`encode_compact()`][group_sense.storage.codec.encode_compact].
+
+    Args:
+        data: Compressed binary encoding of a state.
+
+    Returns:
+        The decoded state, that can be restored with `set_serialized()`.
+    """
+    msgpack, zstandard = _import_compact()
+    return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(data))
@@ -0,0 +1,342 @@
+import json
+import logging
+import sqlite3
+import threading
+from asyncio import wrap_future
+from collections.abc import Callable
+from concurrent.futures import Future as ThreadFuture
+from pathlib import Path
+from queue import Empty, SimpleQueue
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+
+from group_sense.message import Message
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_message_adapter = TypeAdapter(Message)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    room TEXT NOT NULL,
+    seq_nr INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (room, seq_nr)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reasoners (
+    room TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    processed INTEGER NOT NULL,
+    state TEXT,
+    PRIMARY KEY (room, owner)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS history (
+    room TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (room, owner, idx)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS room_state (
+    room TEXT NOT NULL,
+    name TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (room, name)
+) WITHOUT ROWID;
+"""
+
+
+class _Stop:
+    pass
+
+
+_Operation = tuple[Callable[[sqlite3.Connection], Any], ThreadFuture | None]
+
+
+class SQLiteStore:
+    """SQLite store of group chat messages and reasoner states of many rooms.
+
+    Stores the messages of each room, and the processed message count and
+    conversation history of each reasoner instance, keyed by room and owner.
+    Reasoner states are stored as deltas from
+    [`get_serialized_delta()`][group_sense.reasoner.base.GroupReasoner.get_serialized_delta]:
+    conversation history messages are stored as individual rows, so a turn
+    writes only the messages it added. Full states of reasoners without delta
+    support are stored as a whole.
+
+    All database access runs on a dedicated background thread, so the event
+    loop is never blocked. Writes are enqueued without waiting and executed in
+    batches of up to `batch_size` operations per transaction. A failed
+    operation is rolled back as a whole, without affecting the other
+    operations of its batch. Reads are executed in order with writes, so they
+    always see previously enqueued writes. The database uses SQLite's WAL
+    journal mode.
+
+    Used by [`ConcurrentGroupReasoner`][group_sense.reasoner.concurrent.ConcurrentGroupReasoner]
+    to persist rooms and to load reasoner states on demand. States are loaded
+    as a whole, i.e. a loaded room holds all its messages and a loaded
+    reasoner instance its full conversation history.
+
+    Example:
+        ```python
+        store = SQLiteStore("group-sense.db")
+        store.append_messages("room-1", 0, [message])
+        messages = await store.load_messages("room-1")
+        await store.aclose()
+        ```
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = 1000):
+        """Open or create a database and start the background thread.
+
+        Args:
+            path: Path of the SQLite database file.
+            batch_size: Maximum number of operations per transaction.
+
+        Raises:
+            ValueError: If batch_size is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+        self._path = Path(path)
+        self._batch_size = batch_size
+        self._queue: SimpleQueue[_Operation | _Stop] = SimpleQueue()
+        self._closed = False
+
+        ready: ThreadFuture[None] = ThreadFuture()
+        self._thread = threading.Thread(target=self._worker, args=(ready,), name="group-sense-sqlite", daemon=True)
+        self._thread.start()
+        ready.result()
+
+    def append_messages(self, room: str, start: int, messages: list[Message]):
+        """Enqueue writing messages of a room.
+
+        Args:
+            room: Room ID.
+            start: Sequence number of the first message.
+            messages: Messages to write.
+        """
+        rows = [(room, start + i, _message_adapter.dump_json(message).decode()) for i, message in enumerate(messages)]
+
+        def write(conn: sqlite3.Connection):
+            conn.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?)", rows)
+
+        self._submit(write)
+
+    async def load_messages(self, room: str, start: int = 0, end: int | None = None) -> list[Message]:
+        """Load messages of a room.
+
+        Args:
+            room: Room ID.
+            start: Sequence number of the first message to load.
+            end: Sequence number after the last message to load, or `None` to
+                load all remaining messages.
+
+        Returns:
+            Messages with sequence numbers in `[start, end)`, in order.
+        """
+
+        def read(conn: sqlite3.Connection) -> list[str]:
+            rows = conn.execute(
+                "SELECT message FROM messages WHERE room = ? AND seq_nr >= ? AND seq_nr < ? ORDER BY seq_nr",
+                (room, start, end if end is not None else 2**63 - 1),
+            )
+            return [message for (message,) in rows]
+
+        return [_message_adapter.validate_json(message) for message in await self._call(read)]
+
+    async def count_messages(self, room: str) -> int:
+        """Return the number of stored messages of a room."""
+
+        def read(conn: sqlite3.Connection) -> int:
+            return conn.execute("SELECT COUNT(*) FROM messages WHERE room = ?", (room,)).fetchone()[0]
+
+        return await self._call(read)
+
+    def save_reasoner_delta(self, room: str, owner: str, delta: dict[str, Any]):
+        """Enqueue writing a reasoner state delta.
+
+        Args:
+            room: Room ID.
+            owner: Owner of the reasoner instance.
+            delta: Delta from
+                [`get_serialized_delta()`][group_sense.reasoner.base.GroupReasoner.get_serialized_delta].
+                Deltas with a `start` key append conversation history
+                messages from that position, other deltas replace the state.
+        """
+        if "start" in delta:
+            start = delta["start"]
+            rows = [(room, owner, start + i, json.dumps(message)) for i, message in enumerate(delta["agent"])]
+
+            def write(conn: sqlite3.Connection):
+                conn.execute("DELETE FROM history WHERE room = ? AND owner = ? AND idx >= ?", (room, owner, start))
+                conn.executemany("INSERT INTO history VALUES (?, ?, ?, ?)", rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO reasoners VALUES (?, ?, ?, NULL)",
+                    (room, owner, delta["processed"]),
+                )
+        else:
+            state = json.dumps(delta)
+
+            def write(conn: sqlite3.Connection):
+                conn.execute("DELETE FROM history WHERE room = ? AND owner = ?", (room, owner))
+                conn.execute(
+                    "INSERT OR REPLACE INTO reasoners VALUES (?, ?, ?, ?)",
+                    (room, owner, delta.get("processed", 0), state),
+                )
+
+        self._submit(write)
+
+    async def load_reasoner(self, room: str, owner: str) -> dict[str, Any] | None:
+        """Load the state of a reasoner instance.
+
+        Args:
+            room: Room ID.
+            owner: Owner of the reasoner instance.
+
+        Returns:
+            Full state that can be restored with `set_serialized()`, or `None`
+                if no state is stored.
+        """
+
+        def read(conn: sqlite3.Connection) -> dict[str, Any] | None:
+            row = conn.execute(
+                "SELECT processed, state FROM reasoners WHERE room = ? AND owner = ?", (room, owner)
+            ).fetchone()
+            if row is None:
+                return None
+
+            processed, state = row
+            if state is not None:
+                return json.loads(state)
+
+            rows = conn.execute("SELECT message FROM history WHERE room = ? AND owner = ? ORDER BY idx", (room, owner))
+            return {"agent": [json.loads(message) for (message,) in rows], "processed": processed}
+
+        return await self._call(read)
+
+    def save_room_state(self, room: str, name: str, state: dict[str, Any]):
+        """Enqueue writing a named state of a room, e.g. of the room summarizer.
+
+        Args:
+            room: Room ID.
+            name: Name of the state.
+            state: JSON-serializable state.
+        """
+        data = json.dumps(state)
+
+        def write(conn: sqlite3.Connection):
+            conn.execute("INSERT OR REPLACE INTO room_state VALUES (?, ?, ?)", (room, name, data))
+
+        self._submit(write)
+
+    async def load_room_state(self, room: str, name: str) -> dict[str, Any] | None:
+        """Load a named state of a room, or `None` if it is not stored."""
+
+        def read(conn: sqlite3.Connection) -> str | None:
+            row = conn.execute("SELECT state FROM room_state WHERE room = ? AND name = ?", (room, name)).fetchone()
+            return row[0] if row else None
+
+        data = await self._call(read)
+        return json.loads(data) if data is not None else None
+
+    async def flush(self):
+        """Wait until all enqueued writes are committed."""
+        await self._call(lambda conn: None)
+
+    async def aclose(self):
+        """Commit all enqueued writes and stop the background thread."""
+        if self._closed:
+            return
+        await self.flush()
+        self._closed = True
+        self._queue.put(_Stop())
+        self._thread.join()
+
+    def _submit(self, operation: Callable[[sqlite3.Connection], Any], future: ThreadFuture | None = None):
+        if self._closed:
+            raise RuntimeError("Store is closed")
+        self._queue.put((operation, future))
+
+    async def _call(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        future: ThreadFuture[T] = ThreadFuture()
+        self._submit(operation, future)
+        return await wrap_future(future)
+
+    def _worker(self, ready: ThreadFuture[None]):
+        try:
+            conn = sqlite3.connect(self._path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                self._execute(conn, batch)
+        finally:
+            conn.close()
+
+    def _next_batch(self) -> list[_Operation] | None:
+        item = self._queue.get()
+        if isinstance(item, _Stop):
+            return None
+
+        batch = [item]
+        while len(batch) < self._batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if isinstance(item, _Stop):
+                # re-enqueue to stop after this batch
+                self._queue.put(item)
+                break
+            batch.append(item)
+        return batch
+
+    def _execute(self, conn: sqlite3.Connection, batch: list[_Operation]):
+        results: list[tuple[ThreadFuture, Any, BaseException | None]] = []
+        try:
+            with conn:
+                conn.execute("BEGIN")
+                for operation, future in batch:
+                    # roll back the partial writes of a failed operation, but not those of the other operations
+                    conn.execute("SAVEPOINT operation")
+                    try:
+                        result = operation(conn)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO operation")
+                        conn.execute("RELEASE operation")
+                        # also non-database errors, e.g. of decoding a row, must not stop the worker
+                        if future is None:
+                            logger.error("Store write failed", exc_info=e)
+                        else:
+                            results.append((future, None, e))
+                    else:
+                        conn.execute("RELEASE operation")
+                        if future is not None:
+                            results.append((future, result, None))
+        except sqlite3.Error as e:
+            logger.error("Store commit failed", exc_info=e)
+            results = [(future, None, e) for _, future in batch if future is not None]
+
+        # resolve reads after the transaction of their batch is committed
+        for future, result, exception in results:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
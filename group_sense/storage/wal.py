@@ -0,0 +1,275 @@
+import json
+import logging
+import os
+from asyncio import Future, Task, create_task, get_running_loop, sleep, to_thread
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".wal"
+
+
+class WriteAheadLog:
+    """Segmented, append-only log of JSON records with group commit.
+
+    Records are appended synchronously to an in-memory buffer and assigned
+    consecutive log sequence numbers (LSNs). A background task writes buffered
+    records in batches: it waits `commit_interval` seconds after the first
+    record of a batch, writes all records appended in the meantime with a
+    single write, and makes them durable with a single fsync in a worker
+    thread, so the event loop is never blocked by disk I/O.
+    [`commit()`][group_sense.storage.wal.WriteAheadLog.commit] waits until a
+    record is durable.
+
+    Records are stored as JSON lines in segment files named after the LSN of
+    their first record. A new segment is started when the current segment
+    exceeds `segment_size` bytes. Segments that are covered by a snapshot can
+    be deleted with
+    [`truncate()`][group_sense.storage.wal.WriteAheadLog.truncate]. A record
+    that was only partially written before a crash is discarded when the log
+    is opened.
+
+    Example:
+        ```python
+        wal = WriteAheadLog("data/room-1")
+        lsn = wal.append({"type": "message", "content": "Hi"})
+        await wal.commit(lsn)  # record is durable
+
+        for record in wal.records():
+            print(record["lsn"], record["type"])
+        ```
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_size: int = 64 * 1024 * 1024,
+        commit_interval: float = 0.002,
+        fsync: bool = True,
+    ):
+        """Open or create a log in a directory.
+
+        Args:
+            directory: Directory of the segment files. Created if it does not
+                exist.
+            segment_size: Size in bytes after which a new segment is started.
+            commit_interval: Time in seconds to collect records after the
+                first record of a batch before writing the batch. Larger
+                values trade commit latency for fewer writes and fsyncs.
+            fsync: Whether to fsync each batch. If `False`, records are durable
+                against process crashes but not against OS crashes or power
+                loss.
+
+        Raises:
+            ValueError: If segment_size is less than 1 or commit_interval is
+                negative.
+        """
+        if segment_size < 1:
+            raise ValueError("Segment size must be at least 1")
+        if commit_interval < 0:
+            raise ValueError("Commit interval must not be negative")
+
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._segment_size = segment_size
+        self._commit_interval = commit_interval
+        self._fsync = fsync
+
+        self._buffer: list[bytes] = []
+        self._error: OSError | None = None
+        self._waiters: list[tuple[int, Future[None]]] = []
+        self._task: Task | None = None
+        self._file: BinaryIO | None = None
+
+        self._lsn = self._recover()
+        self._durable = self._lsn
+
+    @property
+    def lsn(self) -> int:
+        """Log sequence number that will be assigned to the next record."""
+        return self._lsn
+
+    @property
+    def durable(self) -> int:
+        """Number of records that are durable, i.e. records with a lower LSN are durable."""
+        return self._durable
+
+    @property
+    def segments(self) -> list[Path]:
+        """Paths of the segment files in log order."""
+        return sorted(self._directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def append(self, record: dict[str, Any]) -> int:
+        """Append a record to the log.
+
+        The record is written by the next group commit. Must be called from
+        within a running event loop.
+
+        Args:
+            record: JSON-serializable record. Must not contain an `lsn` key,
+                which is added by the log.
+
+        Returns:
+            Log sequence number of the record.
+
+        Raises:
+            OSError: If a previous commit failed. The log cannot be used after
+                a failed commit.
+        """
+        if self._error is not None:
+            raise self._error
+
+        lsn = self._lsn
+        self._lsn += 1
+        self._buffer.append(json.dumps({"lsn": lsn, **record}, separators=(",", ":")).encode() + b"\n")
+
+        if self._task is None:
+            self._task = create_task(self._commit_loop())
+        return lsn
+
+    async def commit(self, lsn: int | None = None):
+        """Wait until a record and all records before it are durable.
+
+        Args:
+            lsn: Log sequence number of the record. Defaults to the last
+                appended record.
+
+        Raises:
+            OSError: If a commit failed.
+        """
+        if self._error is not None:
+            raise self._error
+        if lsn is None:
+            lsn = self._lsn - 1
+        if lsn < self._durable:
+            return
+
+        future: Future[None] = get_running_loop().create_future()
+        self._waiters.append((lsn, future))
+        await future
+
+    def records(self, start: int = 0) -> Iterator[dict[str, Any]]:
+        """Iterate over durable and written records in log order.
+
+        Args:
+            start: Log sequence number of the first record to return.
+
+        Yields:
+            Records with an `lsn` key, starting at `start`.
+        """
+        segments = self.segments
+        for i, segment in enumerate(segments):
+            if i + 1 < len(segments) and int(segments[i + 1].stem) <= start:
+                continue
+            for record in self._read(segment):
+                if record["lsn"] >= start:
+                    yield record
+
+    def truncate(self, lsn: int):
+        """Delete segments that only contain records before an LSN.
+
+        Typically called with the LSN of a snapshot after the snapshot has
+        been persisted. The current segment is never deleted.
+
+        Args:
+            lsn: Log sequence number of the first record to keep.
+        """
+        segments = self.segments
+        for segment, successor in zip(segments, segments[1:]):
+            if int(successor.stem) > lsn:
+                break
+            segment.unlink()
+
+    async def aclose(self):
+        """Commit all appended records and close the current segment."""
+        if self._lsn > self._durable and self._error is None:
+            await self.commit()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _commit_loop(self):
+        try:
+            while self._buffer:
+                await sleep(self._commit_interval)
+                batch, self._buffer = self._buffer, []
+
+                try:
+                    await to_thread(self._write, batch, self._durable)
+                except OSError as e:
+                    logger.error("Write-ahead log commit failed", exc_info=e)
+                    self._error = e
+                    self._buffer.clear()
+                    self._resolve(self._lsn)
+                    return
+
+                self._durable += len(batch)
+                self._resolve(self._durable)
+        finally:
+            self._task = None
+
+    def _resolve(self, end: int):
+        waiters = []
+        for lsn, future in self._waiters:
+            if lsn >= end:
+                waiters.append((lsn, future))
+            elif future.done():
+                continue
+            elif self._error is not None:
+                future.set_exception(self._error)
+            else:
+                future.set_result(None)
+        self._waiters = waiters
+
+    def _write(self, batch: list[bytes], first: int):
+        data = b"".join(batch)
+        if self._file is None or (self._file.tell() > 0 and self._file.tell() + len(data) > self._segment_size):
+            self._roll(first)
+
+        assert self._file is not None
+        self._file.write(data)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def _roll(self, first: int):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._directory / f"{first:020d}{SEGMENT_SUFFIX}", "ab")
+
+    def _recover(self) -> int:
+        segments = self.segments
+        if not segments:
+            return 0
+
+        last = segments[-1]
+        lsn = int(last.stem)
+        valid = 0
+        with open(last, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                lsn = record["lsn"] + 1
+                valid += len(line)
+
+        if valid < last.stat().st_size:
+            logger.warning(f"Discarding partially written record at the end of {last}")
+            with open(last, "r+b") as f:
+                f.truncate(valid)
+
+        self._file = open(last, "ab")
+        return lsn
+
+    @staticmethod
+    def _read(segment: Path) -> Iterator[dict[str, Any]]:
+        with open(segment, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                yield json.loads(line)
@@ -0,0 +1,100 @@
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.models.test import TestModel
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, Response
+from group_sense.reasoner.batch import BatchResponse, DefaultBatchGroupReasoner, OwnerResponse
+from group_sense.reasoner.default import DefaultGroupReasonerFactory
+
+
+class TestableDefaultBatchGroupReasoner(DefaultBatchGroupReasoner):
+    """Test subclass that allows configuring output_type for testing."""
+
+    def __init__(self, system_prompt_template: str, model: TestModel):
+        super().__init__(system_prompt_template=system_prompt_template, model=model)
+        self._agent = Agent(
+            system_prompt=self._agent._system_prompts,
+            output_type=BatchResponse,  # Use BatchResponse directly, not NativeOutput
+            model=model,
+        )
+
+
+def create_reasoner(*responses: OwnerResponse) -> TestableDefaultBatchGroupReasoner:
+    model = TestModel(custom_output_args=BatchResponse(responses=list(responses)))
+    return TestableDefaultBatchGroupReasoner(
+        system_prompt_template="You are a helpful assistant for {owner}",
+        model=model,
+    )
+
+
+class TestDefaultBatchGroupReasoner:
+    def test_template_without_owner_placeholder_raises_value_error(self):
+        with pytest.raises(ValueError, match="must contain an {owner} placeholder"):
+            DefaultBatchGroupReasoner(system_prompt_template="No placeholder", model=TestModel())
+
+    def test_system_prompt_keeps_owner_placeholder(self):
+        reasoner = DefaultBatchGroupReasoner(system_prompt_template="Assist {owner}", model=TestModel())
+        system_prompt = reasoner._agent._system_prompts[0]
+        assert "Assist {owner}" in system_prompt
+        assert "<owners>" in system_prompt
+
+    @pytest.mark.asyncio
+    async def test_process_fans_out_responses(self):
+        reasoner = create_reasoner(
+            OwnerResponse(owner="alice", decision=Decision.DELEGATE, query="Query for alice", receiver=""),
+            OwnerResponse(owner="bob", decision=Decision.IGNORE),
+        )
+        updates = [
+            Message(content="Question?", sender="alice"),
+            Message(content="Hello", sender="bob"),
+        ]
+
+        responses = await reasoner.process(updates, owners=["alice", "bob"])
+
+        assert responses["alice"] == Response(decision=Decision.DELEGATE, query="Query for alice")
+        assert responses["bob"] == Response(decision=Decision.IGNORE)
+        assert reasoner.processed == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_owner_defaults_to_ignore(self):
+        reasoner = create_reasoner(
+            OwnerResponse(owner="alice", decision=Decision.DELEGATE, query="Query"),
+            OwnerResponse(owner="mallory", decision=Decision.DELEGATE, query="Unknown"),
+        )
+
+        responses = await reasoner.process([Message(content="Hi", sender="bob")], owners=["alice", "bob"])
+
+        assert set(responses) == {"alice", "bob"}
+        assert responses["bob"].decision == Decision.IGNORE
+
+    @pytest.mark.asyncio
+    async def test_empty_updates_raises_value_error(self):
+        reasoner = create_reasoner()
+        with pytest.raises(ValueError, match="Updates must not be empty"):
+            await reasoner.process([], owners=["alice"])
+
+    @pytest.mark.asyncio
+    async def test_empty_owners_raises_value_error(self):
+        reasoner = create_reasoner()
+        with pytest.raises(ValueError, match="Owners must not be empty"):
+            await reasoner.process([Message(content="Hi", sender="bob")], owners=[])
+
+    @pytest.mark.asyncio
+    async def test_serialization_roundtrip(self):
+        reasoner = create_reasoner(OwnerResponse(owner="alice", decision=Decision.IGNORE))
+        await reasoner.process([Message(content="Hi", sender="alice")], owners=["alice"])
+
+        restored = create_reasoner()
+        restored.set_serialized(reasoner.get_serialized())
+
+        assert restored.processed == 1
+        assert len(restored._history) == len(reasoner._history)
+
+
+class TestDefaultGroupReasonerFactoryBatch:
+    def test_create_batch_group_reasoner(self):
+        factory = DefaultGroupReasonerFactory(system_prompt_template="Assist {owner}")
+        reasoner = factory.create_batch_group_reasoner(model=TestModel())
+        assert isinstance(reasoner, DefaultBatchGroupReasoner)
+        assert reasoner.processed == 0
@@ -0,0 +1,118 @@
+import pytest
+
+from group_sense.storage.blob import BlobStore, deduplicate, expand, release
+
+
+def rendered(*contents: tuple[int, str]) -> str:
+    messages = "".join(f'<message seq_nr="{i}" sender="user1">\n{content}\n</message>\n' for i, content in contents)
+    return f"<update>\n{messages}</update>"
+
+
+def state(*contents: tuple[int, str], processed: int = 0) -> dict:
+    request = {"kind": "request", "parts": [{"part_kind": "user-prompt", "content": rendered(*contents)}]}
+    response = {"kind": "response", "parts": [{"part_kind": "text", "content": '{"decision": "ignore"}'}]}
+    return {"agent": [request, response], "processed": processed}
+
+
+LONG_1 = (0, "Let's discuss the release plan. " * 10)
+LONG_2 = (1, "The release is scheduled for next week. " * 10)
+LONG_3 = (2, "Who is going to write the release notes? " * 10)
+
+
+class TestBlobStore:
+    def test_put_deduplicates_identical_blobs(self):
+        blobs = BlobStore()
+
+        key = blobs.put("Hello")
+
+        assert blobs.put("Hello") == key
+        assert blobs.put("World") != key
+        assert len(blobs) == 2
+        assert blobs.get(key) == "Hello"
+
+    def test_gc_deletes_unreferenced_blobs(self):
+        blobs = BlobStore()
+        key = blobs.put("Hello")
+        blobs.put("Hello")
+
+        blobs.release(key)
+        assert blobs.gc() == 0
+        assert key in blobs
+
+        blobs.release(key)
+        assert blobs.gc() == 1
+        assert key not in blobs
+
+    def test_release_unreferenced_blob_raises(self):
+        blobs = BlobStore()
+
+        with pytest.raises(KeyError):
+            blobs.release("unknown")
+
+    def test_put_after_release_retains_blob(self):
+        blobs = BlobStore()
+        key = blobs.put("Hello")
+        blobs.release(key)
+        blobs.put("Hello")
+
+        assert blobs.gc() == 0
+        assert blobs.get(key) == "Hello"
+
+    def test_serialization_roundtrip(self):
+        blobs = BlobStore()
+        key = blobs.put("Hello")
+        released = blobs.put("World")
+        blobs.release(released)
+
+        restored = BlobStore()
+        restored.set_serialized(blobs.get_serialized())
+
+        assert restored.get(key) == "Hello"
+        assert restored.gc() == 1
+        assert released not in restored
+
+
+class TestDeduplicate:
+    def test_roundtrip(self):
+        blobs = BlobStore()
+        original = state(LONG_1, LONG_2, processed=2)
+
+        deduplicated = deduplicate(original, blobs)
+
+        assert deduplicated != original
+        assert expand(deduplicated, blobs) == original
+
+    def test_shares_messages_across_states(self):
+        blobs = BlobStore()
+        state_1 = state(LONG_1, LONG_2)
+        state_2 = state(LONG_1, LONG_2, LONG_3)
+
+        deduplicate(state_1, blobs)
+        size = blobs.size
+        deduplicate(state_2, blobs)
+
+        # only the third message and the closing tag are added
+        assert blobs.size - size < len(LONG_3[1]) + 100
+
+    def test_short_content_is_not_deduplicated(self):
+        blobs = BlobStore()
+        original = state((0, "Hi"))
+
+        assert deduplicate(original, blobs) == original
+        assert len(blobs) == 0
+
+    def test_state_without_history_is_unchanged(self):
+        blobs = BlobStore()
+
+        assert deduplicate({"processed": 3}, blobs) == {"processed": 3}
+
+    def test_release_deletes_unshared_chunks(self):
+        blobs = BlobStore()
+        state_1 = deduplicate(state(LONG_1, LONG_2), blobs)
+        state_2 = deduplicate(state(LONG_1, LONG_3), blobs)
+
+        release(state_1, blobs)
+        blobs.gc()
+
+        assert expand(state_2, blobs) == state(LONG_1, LONG_3)
+        assert all(LONG_2[1] not in blobs.get(key) for key in blobs.get_serialized()["blobs"])
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, GroupReasoner, Response, RoomSummary
+from group_sense.reasoner.buffered import BufferedGroupReasoner
+
+
+class MockGroupReasoner(GroupReasoner):
+    """Mock reasoner with configurable latency for testing."""
+
+    def __init__(self, latency: float = 0.05):
+        self._processed = 0
+        self._latency = latency
+        self.process_calls: list[list[Message]] = []
+        self.summaries: list[RoomSummary | None] = []
+
+    @property
+    def processed(self) -> int:
+        return self._processed
+
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+        self.process_calls.append(updates)
+        self.summaries.append(summary)
+        await asyncio.sleep(self._latency)
+        self._processed += len(updates)
+        return Response(decision=Decision.DELEGATE, query=" ".join(m.content for m in updates))
+
+
+def make_messages(n: int) -> list[Message]:
+    return [Message(content=f"m{i}", sender="user1") for i in range(n)]
+
+
+class TestBufferedGroupReasoner:
+    def test_invalid_arguments_raise_value_error(self):
+        with pytest.raises(ValueError, match="Max wait"):
+            BufferedGroupReasoner(MockGroupReasoner(), max_wait=-1)
+        with pytest.raises(ValueError, match="Max size"):
+            BufferedGroupReasoner(MockGroupReasoner(), max_size=0)
+        with pytest.raises(ValueError, match="Smoothing"):
+            BufferedGroupReasoner(MockGroupReasoner(), smoothing=0)
+
+    @pytest.mark.asyncio
+    async def test_empty_updates_raises_value_error(self):
+        reasoner = BufferedGroupReasoner(MockGroupReasoner())
+        with pytest.raises(ValueError, match="Updates must not be empty"):
+            await reasoner.process([])
+
+    @pytest.mark.asyncio
+    async def test_single_message_is_forwarded_immediately(self):
+        wrapped = MockGroupReasoner()
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=10.0)
+
+        response = await asyncio.wait_for(reasoner.submit(Message(content="m0", sender="user1")), timeout=1.0)
+
+        assert response.query == "m0"
+        assert wrapped.process_calls == [[Message(content="m0", sender="user1")]]
+
+    @pytest.mark.asyncio
+    async def test_messages_accumulate_while_call_in_flight(self):
+        wrapped = MockGroupReasoner(latency=0.05)
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=0.0)
+        messages = make_messages(4)
+
+        first = reasoner.submit(messages[0])
+        await asyncio.sleep(0.01)
+        rest = [reasoner.submit(message) for message in messages[1:]]
+        assert reasoner.pending == 4
+        assert reasoner.processed == 4
+
+        await asyncio.gather(first, *rest)
+
+        assert wrapped.process_calls == [messages[:1], messages[1:]]
+        assert first.result().query == "m0"
+        assert all(future.result().query == "m1 m2 m3" for future in rest)
+        assert reasoner.pending == 0
+        assert reasoner.processed == 4
+
+    @pytest.mark.asyncio
+    async def test_batch_size_adapts_to_arrival_rate_and_latency(self):
+        wrapped = MockGroupReasoner(latency=0.05)
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=1.0, max_size=5)
+        assert reasoner.batch_size == 1
+
+        await reasoner.submit(Message(content="m0", sender="user1"))
+        futures = []
+        for message in make_messages(10):
+            futures.append(reasoner.submit(message))
+            await asyncio.sleep(0.01)
+
+        assert 1 < reasoner.batch_size <= 5
+        await asyncio.gather(*futures)
+
+    @pytest.mark.asyncio
+    async def test_max_size_limits_batches(self):
+        wrapped = MockGroupReasoner(latency=0.01)
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=0.0, max_size=3)
+
+        await reasoner.process(make_messages(7))
+
+        assert max(len(call) for call in wrapped.process_calls) <= 3
+
+    @pytest.mark.asyncio
+    async def test_max_wait_flushes_partial_batch(self):
+        wrapped = MockGroupReasoner(latency=0.01)
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=0.02, max_size=10)
+        reasoner._latency = 10.0
+        reasoner._interval = 0.01
+
+        response = await asyncio.wait_for(reasoner.process(make_messages(2)), timeout=1.0)
+
+        assert response.query == "m0 m1"
+        assert len(wrapped.process_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_message_is_lost_or_duplicated(self):
+        wrapped = MockGroupReasoner(latency=0.005)
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=0.01, max_size=4)
+        messages = make_messages(25)
+
+        futures = []
+        for message in messages:
+            futures.append(reasoner.submit(message))
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*futures)
+
+        forwarded = [message for call in wrapped.process_calls for message in call]
+        assert forwarded == messages
+        assert wrapped.processed == 25
+
+    @pytest.mark.asyncio
+    async def test_summary_starts_new_batch(self):
+        wrapped = MockGroupReasoner(latency=0.05)
+        reasoner = BufferedGroupReasoner(wrapped, max_wait=0.0)
+        summary = RoomSummary(content="Summary", end=10)
+        messages = make_messages(3)
+
+        first = reasoner.submit(messages[0])
+        await asyncio.sleep(0.01)
+        second = reasoner.submit(messages[1])
+        third = asyncio.ensure_future(reasoner.process(messages[2:], summary=summary))
+        await asyncio.gather(first, second, third)
+
+        assert wrapped.process_calls == [messages[:1], messages[1:2], messages[2:]]
+        assert wrapped.summaries == [None, None, summary]
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_batch_futures(self):
+        class FailingReasoner(MockGroupReasoner):
+            async def process(self, updates, summary=None):
+                raise RuntimeError("Reasoner failed")
+
+        reasoner = BufferedGroupReasoner(FailingReasoner())
+        with pytest.raises(RuntimeError, match="Reasoner failed"):
+            await reasoner.submit(Message(content="m0", sender="user1"))
+        assert reasoner.pending == 0
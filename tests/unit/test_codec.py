@@ -0,0 +1,21 @@
+import pytest
+
+from group_sense.storage.codec import decode_compact, encode_compact
+
+pytest.importorskip("msgpack")
+pytest.importorskip("zstandard")
+
+
+class TestCompactCodec:
+    def test_roundtrip(self):
+        state = {"agent": [{"parts": [{"content": "Hello " * 100}], "kind": "request"}], "processed": 3}
+
+        data = encode_compact(state)
+
+        assert decode_compact(data) == state
+        assert len(data) < len(str(state))
+
+    def test_compression_level(self):
+        state = {"agent": ["Hello world " * 1000], "processed": 1}
+
+        assert decode_compact(encode_compact(state, level=19)) == state
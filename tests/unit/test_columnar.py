@@ -0,0 +1,113 @@
+import pytest
+
+from group_sense.columnar import ColumnarRoomLog
+from group_sense.message import Attachment, Message, Thread
+from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+from tests.unit.test_concurrent_reasoner import MockGroupReasonerFactory
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def messages() -> list[Message]:
+    thread = Thread(id="t1", messages=[Message(content="Ref", sender="user3")])
+    attachment = Attachment(path="a.png", name="a", media_type="image/png")
+    return [
+        Message(content="Hi @user2", sender="user1", receiver="user2", id="m1"),
+        Message(content="Grüße", sender="user2", threads=[thread]),
+        Message(content="See attached", sender="user1", attachments=[attachment]),
+        Message(content="@user2 ping", sender="user3", receiver="user2"),
+    ]
+
+
+class TestColumnarRoomLog:
+    def test_messages_roundtrip(self, messages):
+        log = ColumnarRoomLog(messages)
+
+        assert len(log) == 4
+        assert list(log) == messages
+        assert log[1] == messages[1]
+        assert log[-1] == messages[-1]
+        assert log[1:3] == messages[1:3]
+        assert log == messages
+
+    def test_index_out_of_range_raises_index_error(self, messages):
+        log = ColumnarRoomLog(messages)
+
+        with pytest.raises(IndexError):
+            log[4]
+
+    def test_columns_grow(self, messages):
+        log = ColumnarRoomLog(capacity=1)
+        log.extend(messages * 10)
+
+        assert len(log) == 40
+        assert log[37] == messages[1]
+
+    def test_count(self, messages):
+        log = ColumnarRoomLog(messages)
+
+        assert log.count() == 4
+        assert log.count(sender="user1") == 2
+        assert log.count(receiver="user2") == 2
+        assert log.count(receiver="user2", start=1) == 1
+        assert log.count(sender="user1", end=2) == 1
+        assert log.count(sender="unknown") == 0
+
+    def test_count_since(self):
+        log = ColumnarRoomLog()
+        log.append(Message(content="Old", sender="user1"), timestamp=100.0)
+        log.append(Message(content="New", sender="user1"), timestamp=200.0)
+
+        assert log.count(since=150.0) == 1
+        assert list(log.timestamps) == [100.0, 200.0]
+
+    def test_indices(self, messages):
+        log = ColumnarRoomLog(messages)
+
+        assert list(log.indices(sender="user1")) == [0, 2]
+        assert list(log.indices(receiver="user2", start=2)) == [3]
+
+    def test_counts_by_sender(self, messages):
+        log = ColumnarRoomLog(messages)
+
+        assert log.counts_by_sender() == {"user1": 2, "user2": 1, "user3": 1}
+        assert log.counts_by_sender(start=2) == {"user1": 1, "user3": 1}
+
+    def test_columns(self, messages):
+        log = ColumnarRoomLog(messages)
+
+        assert list(log.senders) == ["user1", "user2", "user1", "user3"]
+        assert list(log.lengths) == [len(m.content.encode()) for m in messages]
+
+    def test_invalid_capacity_raises_value_error(self):
+        with pytest.raises(ValueError):
+            ColumnarRoomLog(capacity=0)
+
+
+class TestColumnarConcurrentGroupReasoner:
+    @pytest.mark.asyncio
+    async def test_process_with_columnar_log(self):
+        factory = MockGroupReasonerFactory()
+        reasoner = ConcurrentGroupReasoner(factory, columnar=True)
+
+        reasoner.append(Message(content="Hello", sender="system"))
+        await reasoner.process(Message(content="Hi", sender="user1"))
+
+        assert isinstance(reasoner.messages, ColumnarRoomLog)
+        assert reasoner.messages.count(sender="user1") == 1
+        assert factory.created_reasoners["user1"].process_calls == [
+            [Message(content="Hello", sender="system"), Message(content="Hi", sender="user1")]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_serialization_roundtrip(self, messages):
+        reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), columnar=True)
+        for message in messages:
+            reasoner.append(message)
+
+        restored = ConcurrentGroupReasoner(MockGroupReasonerFactory(), columnar=True)
+        restored.set_serialized(await reasoner.get_serialized())
+
+        assert isinstance(restored.messages, ColumnarRoomLog)
+        assert restored.messages == messages
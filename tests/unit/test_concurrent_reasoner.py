@@ -1,10 +1,26 @@
 import asyncio
+import json
 
 import pytest
-
-from group_sense.message import Message
-from group_sense.reasoner.base import Decision, GroupReasoner, GroupReasonerFactory, Response
+import pytest_asyncio
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.profiles import ModelProfile
+
+from group_sense.message import Message, Thread
+from group_sense.reasoner.admission import RateLimit
+from group_sense.reasoner.base import (
+    BatchGroupReasoner,
+    Decision,
+    GroupReasoner,
+    GroupReasonerFactory,
+    Response,
+    RoomSummary,
+)
 from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+from group_sense.reasoner.validator import DecisionValidator
+from group_sense.storage.sqlite import SQLiteStore
+from group_sense.storage.wal import WriteAheadLog
 
 
 class MockGroupReasoner(GroupReasoner):
@@ -14,33 +30,114 @@ class MockGroupReasoner(GroupReasoner):
         self._processed = processed
         self._response = response or Response(decision=Decision.IGNORE)
         self.process_calls: list[list[Message]] = []
+        self.summaries: list[RoomSummary | None] = []
 
     @property
     def processed(self) -> int:
         return self._processed
 
-    async def process(self, updates: list[Message]) -> Response:
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
         self.process_calls.append(updates)
+        self.summaries.append(summary)
+        if summary is not None and summary.end > self._processed:
+            self._processed = summary.end
         self._processed += len(updates)
         await asyncio.sleep(0.01)  # Simulate async work
         return self._response
 
+    def get_serialized(self) -> dict:
+        return {"processed": self._processed}
+
+    def set_serialized(self, state: dict):
+        self._processed = state["processed"]
+
+
+class HistoryMockGroupReasoner(MockGroupReasoner):
+    """Mock reasoner with a conversation history of rendered updates."""
+
+    def __init__(self):
+        super().__init__()
+        self.prompts: list[str] = []
+
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+        start = self._processed
+        rendered = "".join(
+            f'<message seq_nr="{start + i}" sender="{m.sender}">\n{m.content * 20}\n</message>\n'
+            for i, m in enumerate(updates)
+        )
+        self.prompts.append(f"<update>\n{rendered}</update>")
+        return await super().process(updates, summary)
+
+    def get_serialized(self) -> dict:
+        agent = [{"kind": "request", "parts": [{"content": prompt}]} for prompt in self.prompts]
+        return {"agent": agent, "processed": self._processed}
+
+    def set_serialized(self, state: dict):
+        self.prompts = [message["parts"][0]["content"] for message in state["agent"]]
+        self._processed = state["processed"]
+
 
 class MockGroupReasonerFactory(GroupReasonerFactory):
     """Mock factory for testing."""
 
-    def __init__(self):
+    def __init__(self, reasoner_type: type[MockGroupReasoner] = MockGroupReasoner):
+        self.reasoner_type = reasoner_type
         self.created_reasoners: dict[str, MockGroupReasoner] = {}
         self.create_calls: list[tuple[str, dict]] = []
 
     def create_group_reasoner(self, owner: str, **kwargs) -> GroupReasoner:
         self.create_calls.append((owner, kwargs))
         if owner not in self.created_reasoners:
-            reasoner = MockGroupReasoner()
+            reasoner = self.reasoner_type()
             self.created_reasoners[owner] = reasoner
         return self.created_reasoners[owner]
 
 
+class MockBatchGroupReasoner(BatchGroupReasoner):
+    """Mock batch reasoner for testing."""
+
+    def __init__(self):
+        self._processed = 0
+        self.process_calls: list[tuple[list[Message], list[str]]] = []
+
+    @property
+    def processed(self) -> int:
+        return self._processed
+
+    async def process(
+        self, updates: list[Message], owners: list[str], summary: RoomSummary | None = None
+    ) -> dict[str, Response]:
+        self.process_calls.append((updates, owners))
+        self._processed += len(updates)
+        await asyncio.sleep(0.01)
+        return {owner: Response(decision=Decision.DELEGATE, query=f"Query for {owner}") for owner in owners}
+
+    def get_serialized(self) -> dict:
+        return {"processed": self._processed}
+
+    def set_serialized(self, state: dict):
+        self._processed = state["processed"]
+
+
+class MockRoomSummarizer:
+    """Mock summarizer that summarizes all but the last message once due."""
+
+    def __init__(self, window: int = 3):
+        self.summary: RoomSummary | None = None
+        self.update_calls: list[int] = []
+        self._window = window
+
+    def due(self, num_messages: int) -> bool:
+        end = self.summary.end if self.summary else 0
+        return num_messages - 1 - end >= self._window
+
+    async def update(self, messages: list[Message]) -> RoomSummary | None:
+        self.update_calls.append(len(messages))
+        if self.due(len(messages)):
+            self.summary = RoomSummary(content=f"Summary of {len(messages) - 1}", end=len(messages) - 1)
+        return self.summary
+
+
 @pytest.fixture
 def concurrent_reasoner():
     """Fixture that creates a ConcurrentGroupReasoner with a MockGroupReasonerFactory."""
@@ -203,7 +300,7 @@ class TestConcurrentGroupReasoner:
         execution_order = []
 
         class TrackingMockReasoner(MockGroupReasoner):
-            async def process(self, updates: list[Message]) -> Response:
+            async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
                 execution_order.append(f"start-{updates[0].content}")
                 await asyncio.sleep(0.05)  # Longer delay to ensure overlap if not locked
                 execution_order.append(f"end-{updates[0].content}")
@@ -234,7 +331,7 @@ class TestConcurrentGroupReasoner:
                 super().__init__()
                 self.name = name
 
-            async def process(self, updates: list[Message]) -> Response:
+            async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
                 execution_order.append(f"start-{self.name}")
                 await asyncio.sleep(0.05)
                 execution_order.append(f"end-{self.name}")
@@ -333,3 +430,1000 @@ class TestConcurrentGroupReasoner:
         mock_reasoner = concurrent_reasoner._factory.created_reasoners["user1"]
         # First process call should get all 3 messages
         assert len(mock_reasoner.process_calls[0]) == 3
+
+
+class TestConcurrentGroupReasonerSummary:
+    @pytest.fixture
+    def summarizer(self):
+        return MockRoomSummarizer(window=3)
+
+    @pytest.fixture
+    def concurrent_reasoner(self, summarizer):
+        return ConcurrentGroupReasoner(MockGroupReasonerFactory(), summarizer=summarizer)
+
+    @pytest.mark.asyncio
+    async def test_summary_update_triggered_once_due(self, concurrent_reasoner, summarizer):
+        for i in range(3):
+            concurrent_reasoner.append(Message(content=f"Msg {i}", sender="user1"))
+        assert summarizer.update_calls == []
+
+        concurrent_reasoner.append(Message(content="Msg 3", sender="user1"))
+        await concurrent_reasoner._summary_task
+
+        assert summarizer.update_calls == [4]
+        assert summarizer.summary.end == 3
+
+    @pytest.mark.asyncio
+    async def test_lagging_reasoner_receives_summary_and_tail(self, concurrent_reasoner, summarizer):
+        for i in range(4):
+            concurrent_reasoner.append(Message(content=f"Msg {i}", sender="user1"))
+        await concurrent_reasoner._summary_task
+
+        message = Message(content="New", sender="user2")
+        await concurrent_reasoner.process(message)
+
+        mock_reasoner = concurrent_reasoner._factory.created_reasoners["user2"]
+        assert mock_reasoner.summaries == [summarizer.summary]
+        assert mock_reasoner.process_calls[0] == concurrent_reasoner.messages[3:]
+        assert mock_reasoner.processed == 5
+
+    @pytest.mark.asyncio
+    async def test_up_to_date_reasoner_receives_raw_updates(self, concurrent_reasoner, summarizer):
+        await concurrent_reasoner.process(Message(content="First", sender="user1"))
+        await concurrent_reasoner.process(Message(content="Second", sender="user1"))
+
+        mock_reasoner = concurrent_reasoner._factory.created_reasoners["user1"]
+        assert mock_reasoner.summaries == [None, None]
+        assert summarizer.summary is None
+
+    @pytest.mark.asyncio
+    async def test_summary_failure_does_not_affect_processing(self, concurrent_reasoner, summarizer):
+        async def failing_update(messages):
+            raise RuntimeError("Summary failed")
+
+        summarizer.update = failing_update
+        for i in range(4):
+            concurrent_reasoner.append(Message(content=f"Msg {i}", sender="user1"))
+
+        with pytest.raises(RuntimeError):
+            await concurrent_reasoner._summary_task
+
+        response = await concurrent_reasoner.process(Message(content="New", sender="user2"))
+        assert response.decision == Decision.IGNORE
+
+
+class TestConcurrentGroupReasonerBatching:
+    @pytest.fixture
+    def batch_reasoner(self):
+        return MockBatchGroupReasoner()
+
+    @pytest.fixture
+    def concurrent_reasoner(self, batch_reasoner):
+        return ConcurrentGroupReasoner(MockGroupReasonerFactory(), batch_reasoner=batch_reasoner, batch_window=0.01)
+
+    @pytest.mark.asyncio
+    async def test_triggers_from_multiple_senders_use_single_call(self, concurrent_reasoner, batch_reasoner):
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="alice"))
+        f2 = concurrent_reasoner.process(Message(content="Hello", sender="bob"))
+        r1, r2 = await asyncio.gather(f1, f2)
+
+        assert len(batch_reasoner.process_calls) == 1
+        updates, owners = batch_reasoner.process_calls[0]
+        assert updates == concurrent_reasoner.messages
+        assert owners == ["alice", "bob"]
+        assert r1.query == "Query for alice"
+        assert r2.query == "Query for bob"
+
+        # per-owner reasoners are not invoked
+        for reasoner in concurrent_reasoner._factory.created_reasoners.values():
+            assert reasoner.process_calls == []
+
+    @pytest.mark.asyncio
+    async def test_triggers_from_single_sender_use_owner_reasoner(self, concurrent_reasoner, batch_reasoner):
+        f1 = concurrent_reasoner.process(Message(content="First", sender="alice"))
+        f2 = concurrent_reasoner.process(Message(content="Second", sender="alice"))
+        r1, r2 = await asyncio.gather(f1, f2)
+
+        assert batch_reasoner.process_calls == []
+        mock_reasoner = concurrent_reasoner._factory.created_reasoners["alice"]
+        assert mock_reasoner.process_calls == [concurrent_reasoner.messages]
+        assert r1 is r2
+
+    @pytest.mark.asyncio
+    async def test_triggers_in_separate_windows_use_separate_calls(self, concurrent_reasoner, batch_reasoner):
+        await asyncio.gather(
+            concurrent_reasoner.process(Message(content="Hi", sender="alice")),
+            concurrent_reasoner.process(Message(content="Hello", sender="bob")),
+        )
+        await asyncio.gather(
+            concurrent_reasoner.process(Message(content="Hi again", sender="alice")),
+            concurrent_reasoner.process(Message(content="Hey", sender="carol")),
+        )
+
+        assert len(batch_reasoner.process_calls) == 2
+        updates, owners = batch_reasoner.process_calls[1]
+        assert [m.content for m in updates] == ["Hi again", "Hey"]
+        assert owners == ["alice", "carol"]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_propagates_to_all_futures(self, concurrent_reasoner, batch_reasoner):
+        async def failing_process(updates, owners, summary=None):
+            raise RuntimeError("Batch failed")
+
+        batch_reasoner.process = failing_process
+
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="alice"))
+        f2 = concurrent_reasoner.process(Message(content="Hello", sender="bob"))
+        results = await asyncio.gather(f1, f2, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class TestConcurrentGroupReasonerStream:
+    @pytest.mark.asyncio
+    async def test_process_stream_appends_message_immediately(self, concurrent_reasoner):
+        message = Message(content="Test", sender="user1")
+
+        stream = concurrent_reasoner.process_stream(message)
+        assert concurrent_reasoner.messages == [message]
+
+        response = await stream.response()
+        assert response.decision == Decision.IGNORE
+
+    @pytest.mark.asyncio
+    async def test_process_stream_yields_final_response_of_non_streaming_reasoner(self, concurrent_reasoner):
+        expected = Response(decision=Decision.DELEGATE, query="Query", receiver="user2")
+        concurrent_reasoner._factory.created_reasoners["user1"] = MockGroupReasoner(response=expected)
+
+        partials = [
+            partial async for partial in concurrent_reasoner.process_stream(Message(content="Q", sender="user1"))
+        ]
+
+        assert partials == [expected.model_copy(update={"position": 1})]
+
+    @pytest.mark.asyncio
+    async def test_process_stream_and_process_are_serialized_per_sender(self, concurrent_reasoner):
+        msg1 = Message(content="First", sender="user1")
+        msg2 = Message(content="Second", sender="user1")
+
+        stream = concurrent_reasoner.process_stream(msg1)
+        future = concurrent_reasoner.process(msg2)
+        await asyncio.gather(stream.response(), future)
+
+        mock_reasoner = concurrent_reasoner._factory.created_reasoners["user1"]
+        assert mock_reasoner.process_calls == [[msg1], [msg2]]
+
+    @pytest.mark.asyncio
+    async def test_process_stream_propagates_errors(self, concurrent_reasoner):
+        class FailingReasoner(MockGroupReasoner):
+            async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+                raise RuntimeError("Reasoner failed")
+
+        concurrent_reasoner._factory.created_reasoners["user1"] = FailingReasoner()
+
+        with pytest.raises(RuntimeError, match="Reasoner failed"):
+            await concurrent_reasoner.process_stream(Message(content="Q", sender="user1")).response()
+
+
+class TestConcurrentGroupReasonerSerialization:
+    @pytest.mark.asyncio
+    async def test_snapshot_waits_for_in_flight_triggers(self, concurrent_reasoner):
+        concurrent_reasoner.process(Message(content="First", sender="user1"))
+        concurrent_reasoner.process(Message(content="Second", sender="user2"))
+        concurrent_reasoner.process(Message(content="Third", sender="user1"))
+
+        state = await concurrent_reasoner.get_serialized()
+
+        assert [message["content"] for message in state["messages"]] == ["First", "Second", "Third"]
+        assert state["reasoners"] == {"user1": {"processed": 3}, "user2": {"processed": 2}}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_excludes_reasoners_created_while_locking(self, concurrent_reasoner):
+        await concurrent_reasoner.process(Message(content="First", sender="user1"))
+        load_reasoner = concurrent_reasoner._load_reasoner
+        future: asyncio.Future[Response] | None = None
+
+        async def load_and_process(owner, reasoner):
+            nonlocal future
+            await load_reasoner(owner, reasoner)
+            if future is None:
+                # first run of a new owner is under way while the snapshot is taken
+                future = concurrent_reasoner.process(Message(content="Second", sender="user2"))
+                await asyncio.sleep(0.001)
+
+        concurrent_reasoner._load_reasoner = load_and_process
+        state = await concurrent_reasoner.get_serialized()
+
+        assert state["reasoners"] == {"user1": {"processed": 1}}
+        assert future is not None
+        assert (await future).decision == Decision.IGNORE
+
+    @pytest.mark.asyncio
+    async def test_restore_hydrates_reasoners_lazily(self, concurrent_reasoner):
+        message = Message(content="Hi", sender="user1", threads=[Thread(id="t1", messages=[Message("Ref", "user3")])])
+        await concurrent_reasoner.process(message)
+        await concurrent_reasoner.process(Message(content="Hello", sender="user2"))
+        state = await concurrent_reasoner.get_serialized()
+
+        factory = MockGroupReasonerFactory()
+        restored = ConcurrentGroupReasoner(factory)
+        restored.set_serialized(state)
+
+        assert restored.messages == concurrent_reasoner.messages
+        assert factory.create_calls == []
+
+        await restored.process(Message(content="Again", sender="user1"))
+
+        assert [owner for owner, _ in factory.create_calls] == ["user1"]
+        assert factory.created_reasoners["user1"].process_calls == [restored.messages[1:]]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_retains_unhydrated_states(self, concurrent_reasoner):
+        await concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        state = await concurrent_reasoner.get_serialized()
+
+        restored = ConcurrentGroupReasoner(MockGroupReasonerFactory())
+        restored.set_serialized(state)
+        await restored.process(Message(content="Hello", sender="user2"))
+
+        restored_state = await restored.get_serialized()
+        assert restored_state["reasoners"] == {"user1": {"processed": 1}, "user2": {"processed": 2}}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_includes_batch_reasoner_state(self):
+        batch_reasoner = MockBatchGroupReasoner()
+        concurrent_reasoner = ConcurrentGroupReasoner(
+            MockGroupReasonerFactory(), batch_reasoner=batch_reasoner, batch_window=0.01
+        )
+        concurrent_reasoner.process(Message(content="Hi", sender="alice"))
+        concurrent_reasoner.process(Message(content="Hello", sender="bob"))
+
+        state = await concurrent_reasoner.get_serialized()
+        assert state["batch_reasoner"] == {"processed": 2}
+
+        restored_batch_reasoner = MockBatchGroupReasoner()
+        restored = ConcurrentGroupReasoner(MockGroupReasonerFactory(), batch_reasoner=restored_batch_reasoner)
+        restored.set_serialized(state)
+        assert restored_batch_reasoner.processed == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_fails_for_reasoner_without_serialization(self, concurrent_reasoner):
+        class UnserializableReasoner(GroupReasoner):
+            @property
+            def processed(self) -> int:
+                return 0
+
+            async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+                return Response(decision=Decision.IGNORE)
+
+        concurrent_reasoner._factory.created_reasoners["user1"] = UnserializableReasoner()
+        await concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+
+        with pytest.raises(NotImplementedError):
+            await concurrent_reasoner.get_serialized()
+
+    @staticmethod
+    async def history_snapshot(deduplicate: bool) -> tuple[dict, ConcurrentGroupReasoner]:
+        concurrent_reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(HistoryMockGroupReasoner))
+        for i in range(6):
+            await concurrent_reasoner.process(Message(content=f"Message {i}. ", sender=f"user{i % 3}"))
+        return await concurrent_reasoner.get_serialized(deduplicate=deduplicate), concurrent_reasoner
+
+    @pytest.mark.asyncio
+    async def test_deduplicated_snapshot_is_smaller(self):
+        state, _ = await self.history_snapshot(deduplicate=False)
+        deduplicated, _ = await self.history_snapshot(deduplicate=True)
+
+        assert "blobs" not in state
+        assert len(json.dumps(deduplicated)) < len(json.dumps(state))
+
+    @pytest.mark.asyncio
+    async def test_deduplicated_snapshot_roundtrip(self):
+        state, concurrent_reasoner = await self.history_snapshot(deduplicate=True)
+
+        factory = MockGroupReasonerFactory(HistoryMockGroupReasoner)
+        restored = ConcurrentGroupReasoner(factory)
+        restored.set_serialized(state)
+        await restored.process(Message(content="Again", sender="user1"))
+
+        original, _ = concurrent_reasoner._reasoner["user1"]
+        hydrated = factory.created_reasoners["user1"]
+        assert isinstance(original, HistoryMockGroupReasoner) and isinstance(hydrated, HistoryMockGroupReasoner)
+        assert hydrated.prompts[: len(original.prompts)] == original.prompts
+
+        # unhydrated states are expanded, the hydrated state is serialized as usual
+        restored_state = await restored.get_serialized()
+        original_state = await concurrent_reasoner.get_serialized()
+        assert "blobs" not in restored_state
+        assert restored_state["reasoners"]["user0"] == original_state["reasoners"]["user0"]
+        assert restored_state["reasoners"]["user2"] == original_state["reasoners"]["user2"]
+
+    @pytest.mark.asyncio
+    async def test_hydration_releases_blobs(self):
+        state, _ = await self.history_snapshot(deduplicate=True)
+
+        restored = ConcurrentGroupReasoner(MockGroupReasonerFactory(HistoryMockGroupReasoner))
+        restored.set_serialized(state)
+        assert restored._blobs is not None
+        size = restored._blobs.size
+
+        for owner in ["user0", "user1", "user2"]:
+            await restored.process(Message(content="Again", sender=owner))
+
+        assert size > 0
+        assert len(restored._blobs) == 0
+
+
+class SlowMockGroupReasoner(MockGroupReasoner):
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+        await asyncio.sleep(0.05)
+        return await super().process(updates, summary)
+
+
+async def message_source(messages: list[Message], pulled: list[Message] | None = None):
+    for message in messages:
+        if pulled is not None:
+            pulled.append(message)
+        yield message
+
+
+class TestConcurrentGroupReasonerIter:
+    @staticmethod
+    def reasoner_with_slow_owner(owner: str) -> ConcurrentGroupReasoner:
+        factory = MockGroupReasonerFactory()
+        factory.created_reasoners[owner] = SlowMockGroupReasoner()
+        return ConcurrentGroupReasoner(factory)
+
+    @pytest.mark.asyncio
+    async def test_yields_in_completion_order(self):
+        concurrent_reasoner = self.reasoner_with_slow_owner("user1")
+        messages = [Message(content="Slow", sender="user1"), Message(content="Fast", sender="user2")]
+
+        results = [item async for item in concurrent_reasoner.process_iter(message_source(messages))]
+
+        assert [message.content for message, _ in results] == ["Fast", "Slow"]
+        assert all(response.decision == Decision.IGNORE for _, response in results)
+        assert concurrent_reasoner.messages == messages
+
+    @pytest.mark.asyncio
+    async def test_yields_in_arrival_order(self):
+        concurrent_reasoner = self.reasoner_with_slow_owner("user1")
+        messages = [Message(content="Slow", sender="user1"), Message(content="Fast", sender="user2")]
+
+        results = [item async for item in concurrent_reasoner.process_iter(message_source(messages), ordered=True)]
+
+        assert [message.content for message, _ in results] == ["Slow", "Fast"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ordered", [False, True])
+    async def test_backpressure_bounds_pending_messages(self, concurrent_reasoner, ordered):
+        messages = [Message(content=f"Message {i}", sender=f"user{i % 4}") for i in range(12)]
+        pulled: list[Message] = []
+        consumed = 0
+
+        async for _ in concurrent_reasoner.process_iter(message_source(messages, pulled), ordered, max_pending=3):
+            await asyncio.sleep(0.02)  # slow consumer
+            consumed += 1
+            # one more message may be pulled and wait for a free slot
+            assert len(pulled) <= consumed + 3 + 1
+
+        assert consumed == 12
+
+    @pytest.mark.asyncio
+    async def test_source_exception_is_raised(self, concurrent_reasoner):
+        async def failing_source():
+            yield Message(content="Hi", sender="user1")
+            raise RuntimeError("Source failed")
+
+        with pytest.raises(RuntimeError, match="Source failed"):
+            async for _ in concurrent_reasoner.process_iter(failing_source()):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_empty_source(self, concurrent_reasoner):
+        assert [item async for item in concurrent_reasoner.process_iter(message_source([]))] == []
+
+    def test_invalid_max_pending_raises(self, concurrent_reasoner):
+        with pytest.raises(ValueError):
+            concurrent_reasoner.process_iter(message_source([]), max_pending=0)
+
+
+class TestConcurrentGroupReasonerAdmission:
+    @staticmethod
+    def messages(sender: str, n: int, offset: int = 0) -> list[Message]:
+        return [Message(content=f"Message {i}", sender=sender) for i in range(offset, offset + n)]
+
+    @pytest.mark.asyncio
+    async def test_reject_resolves_new_trigger_immediately(self):
+        factory = MockGroupReasonerFactory()
+        concurrent_reasoner = ConcurrentGroupReasoner(factory, max_pending_per_sender=1, overload="reject")
+        m1, m2, m3 = self.messages("user1", 3)
+
+        f1 = concurrent_reasoner.process(m1)
+        f2 = concurrent_reasoner.process(m2)
+        f3 = concurrent_reasoner.process(m3)
+
+        assert f2.done() and f3.done() and not f1.done()
+        assert f2.result().decision == Decision.IGNORE
+        await f1
+
+        assert factory.created_reasoners["user1"].process_calls == [[m1]]
+        assert concurrent_reasoner.messages == [m1, m2, m3]
+        assert concurrent_reasoner.shed.rejected == 2
+        assert concurrent_reasoner.shed.by_sender == {"user1": 2}
+
+    @pytest.mark.asyncio
+    async def test_merge_into_waiting_trigger(self):
+        factory = MockGroupReasonerFactory()
+        concurrent_reasoner = ConcurrentGroupReasoner(factory, max_pending_per_sender=2, overload="merge")
+        m1, m2, m3, m4 = self.messages("user1", 4)
+
+        f1 = concurrent_reasoner.process(m1)
+        f2 = concurrent_reasoner.process(m2)
+        f3 = concurrent_reasoner.process(m3)
+        f4 = concurrent_reasoner.process(m4)
+        await asyncio.gather(f1, f2, f3, f4)
+
+        assert factory.created_reasoners["user1"].process_calls == [[m1], [m2, m3, m4]]
+        assert concurrent_reasoner.shed.merged == 2
+        assert concurrent_reasoner.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_merge_without_waiting_trigger_rejects(self):
+        concurrent_reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), max_pending=1, overload="merge")
+
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        f2 = concurrent_reasoner.process(Message(content="Hello", sender="user2"))
+
+        assert f2.done()
+        await f1
+        assert concurrent_reasoner.shed.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_waiting_trigger_of_sender(self):
+        factory = MockGroupReasonerFactory()
+        concurrent_reasoner = ConcurrentGroupReasoner(factory, max_pending_per_sender=2, overload="drop_oldest")
+        m1, m2, m3 = self.messages("user1", 3)
+
+        f1 = concurrent_reasoner.process(m1)
+        await asyncio.sleep(0)  # start the run of m1
+        f2 = concurrent_reasoner.process(m2)
+        f3 = concurrent_reasoner.process(m3)
+
+        assert f2.done() and f2.result().decision == Decision.IGNORE
+        await asyncio.gather(f1, f3)
+
+        # the dropped message is covered by the next run
+        assert factory.created_reasoners["user1"].process_calls == [[m1], [m2, m3]]
+        assert concurrent_reasoner.shed.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_waiting_trigger_of_room(self):
+        factory = MockGroupReasonerFactory()
+        concurrent_reasoner = ConcurrentGroupReasoner(factory, max_pending=2, overload="drop_oldest")
+        m1, m2 = self.messages("user1", 2)
+        m3 = Message(content="Hello", sender="user2")
+
+        f1 = concurrent_reasoner.process(m1)
+        await asyncio.sleep(0)  # start the run of m1
+        f2 = concurrent_reasoner.process(m2)
+        f3 = concurrent_reasoner.process(m3)
+
+        assert f2.done()
+        await asyncio.gather(f1, f3)
+
+        assert factory.created_reasoners["user1"].process_calls == [[m1]]
+        assert factory.created_reasoners["user2"].process_calls == [[m1, m2, m3]]
+        assert concurrent_reasoner.shed.by_sender == {"user1": 1}
+
+    @pytest.mark.asyncio
+    async def test_pending_count(self, concurrent_reasoner):
+        futures = [concurrent_reasoner.process(message) for message in self.messages("user1", 3)]
+
+        assert concurrent_reasoner.pending == 3
+        await asyncio.gather(*futures)
+        assert concurrent_reasoner.pending == 0
+        assert concurrent_reasoner.shed.total == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trigger_is_not_processed(self, concurrent_reasoner):
+        m1, m2 = self.messages("user1", 2)
+
+        f1 = concurrent_reasoner.process(m1)
+        f2 = concurrent_reasoner.process(m2)
+        f2.cancel()
+        await f1
+        await asyncio.sleep(0.02)
+
+        assert concurrent_reasoner._factory.created_reasoners["user1"].process_calls == [[m1]]
+        assert concurrent_reasoner.pending == 0
+
+    def test_invalid_limits_raise(self):
+        with pytest.raises(ValueError):
+            ConcurrentGroupReasoner(MockGroupReasonerFactory(), max_pending=0)
+        with pytest.raises(ValueError):
+            ConcurrentGroupReasoner(
+                MockGroupReasonerFactory(), batch_reasoner=MockBatchGroupReasoner(), max_pending_per_sender=1
+            )
+
+
+class TestConcurrentGroupReasonerRateLimit:
+    @pytest.mark.asyncio
+    async def test_empty_sender_bucket_defers_run(self):
+        concurrent_reasoner = ConcurrentGroupReasoner(
+            MockGroupReasonerFactory(), sender_rate_limit=RateLimit(rate=10, burst=1)
+        )
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await concurrent_reasoner.process(Message(content="First", sender="user1"))
+        first = loop.time() - start
+        await concurrent_reasoner.process(Message(content="Second", sender="user1"))
+        second = loop.time() - start
+
+        assert first < 0.05
+        assert second >= 0.09
+        assert concurrent_reasoner.shed.deferred == 1
+
+    @pytest.mark.asyncio
+    async def test_triggers_merge_into_deferred_trigger(self):
+        factory = MockGroupReasonerFactory()
+        concurrent_reasoner = ConcurrentGroupReasoner(factory, sender_rate_limit=RateLimit(rate=10, burst=1))
+        m1, m2, m3 = [Message(content=f"Message {i}", sender="user1") for i in range(3)]
+
+        await concurrent_reasoner.process(m1)
+        f2 = concurrent_reasoner.process(m2)
+        f3 = concurrent_reasoner.process(m3)
+        await asyncio.gather(f2, f3)
+
+        assert factory.created_reasoners["user1"].process_calls == [[m1], [m2, m3]]
+        assert concurrent_reasoner.shed.merged == 1
+        assert concurrent_reasoner.shed.deferred == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_per_owner_class(self):
+        guest_limit = RateLimit(rate=1, burst=1)
+        concurrent_reasoner = ConcurrentGroupReasoner(
+            MockGroupReasonerFactory(),
+            sender_rate_limit=lambda sender: None if sender == "admin" else guest_limit,
+        )
+
+        for i in range(3):
+            await concurrent_reasoner.process(Message(content=f"Message {i}", sender="admin"))
+        concurrent_reasoner.process(Message(content="Hi", sender="guest"))
+        await asyncio.sleep(0)  # start the run of the first guest message
+        concurrent_reasoner.process(Message(content="Hi again", sender="guest"))
+
+        assert concurrent_reasoner.shed.deferred == 1
+
+    @pytest.mark.asyncio
+    async def test_room_rate_limit_defers_other_senders(self):
+        factory = MockGroupReasonerFactory()
+        concurrent_reasoner = ConcurrentGroupReasoner(factory, room_rate_limit=RateLimit(rate=10, burst=1))
+
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        f2 = concurrent_reasoner.process(Message(content="Hello", sender="user2"))
+        await f1
+
+        assert not f2.done()
+        await f2
+        assert concurrent_reasoner.shed.deferred == 1
+
+    def test_invalid_rate_limit_raises(self):
+        with pytest.raises(ValueError):
+            RateLimit(rate=0)
+        with pytest.raises(ValueError):
+            RateLimit(rate=1, burst=0)
+
+
+class TestConcurrentGroupReasonerStaleness:
+    DELEGATION = Response(decision=Decision.DELEGATE, query="When is the release?", receiver="user1")
+
+    @staticmethod
+    def validator(output: str) -> tuple[DecisionValidator, list]:
+        calls = []
+
+        def validate(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            calls.append(messages)
+            return ModelResponse(parts=[TextPart(content=output)])
+
+        model = FunctionModel(validate, profile=ModelProfile(supports_json_schema_output=True))
+        return DecisionValidator(model=model), calls
+
+    def reasoner(self, validator: DecisionValidator | None = None) -> ConcurrentGroupReasoner:
+        factory = MockGroupReasonerFactory()
+        factory.created_reasoners["user1"] = MockGroupReasoner(response=self.DELEGATION)
+        return ConcurrentGroupReasoner(factory, validator=validator)
+
+    @pytest.mark.asyncio
+    async def test_responses_carry_position(self, concurrent_reasoner):
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        concurrent_reasoner.append(Message(content="Hello from the assistant", sender="system"))
+        f2 = concurrent_reasoner.process(Message(content="Hello", sender="user2"))
+
+        assert (await f1).position == 1
+        assert (await f2).position == 3
+
+    @pytest.mark.asyncio
+    async def test_is_stale(self):
+        concurrent_reasoner = self.reasoner()
+        response = await concurrent_reasoner.process(Message(content="When is the release?", sender="user1"))
+
+        assert not concurrent_reasoner.is_stale(response)
+        concurrent_reasoner.append(Message(content="Next Monday.", sender="user2"))
+        assert concurrent_reasoner.is_stale(response)
+        assert not concurrent_reasoner.is_stale(response, senders={"system"})
+
+        with pytest.raises(ValueError):
+            concurrent_reasoner.is_stale(Response(decision=Decision.IGNORE))
+
+    @pytest.mark.asyncio
+    async def test_stale_delegation_is_revalidated(self):
+        validator, calls = self.validator('{"decision": "ignore"}')
+        concurrent_reasoner = self.reasoner(validator)
+
+        future = concurrent_reasoner.process(Message(content="When is the release?", sender="user1"))
+        # answered while the reasoner run is in progress
+        concurrent_reasoner.append(Message(content="Next Monday.", sender="system"))
+        response = await future
+
+        assert response == Response(decision=Decision.IGNORE, position=2)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_current_delegation_is_not_revalidated(self):
+        validator, calls = self.validator('{"decision": "ignore"}')
+        concurrent_reasoner = self.reasoner(validator)
+
+        response = await concurrent_reasoner.process(Message(content="When is the release?", sender="user1"))
+
+        assert response.decision == Decision.DELEGATE
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_revalidate_queued_decision(self):
+        validator, calls = self.validator('{"decision": "delegate"}')
+        concurrent_reasoner = self.reasoner(validator)
+        response = await concurrent_reasoner.process(Message(content="When is the release?", sender="user1"))
+
+        assert await concurrent_reasoner.revalidate(response) is response
+        concurrent_reasoner.append(Message(content="Any news?", sender="user2"))
+        revalidated = await concurrent_reasoner.revalidate(response)
+
+        assert revalidated.decision == Decision.DELEGATE and revalidated.position == 2
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_revalidate_without_validator_raises(self, concurrent_reasoner):
+        response = await concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        with pytest.raises(ValueError):
+            await concurrent_reasoner.revalidate(response)
+
+
+class TestConcurrentGroupReasonerDedup:
+    @pytest.mark.asyncio
+    async def test_duplicate_process_returns_original_future(self, concurrent_reasoner):
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="user1", id="m1"))
+        f2 = concurrent_reasoner.process(Message(content="Hi", sender="user1", id="m1"))
+
+        assert f1 is f2
+        await f1
+        assert len(concurrent_reasoner.messages) == 1
+        assert len(concurrent_reasoner._factory.created_reasoners["user1"].process_calls) == 1
+        assert concurrent_reasoner.duplicates == 1
+
+    @pytest.mark.asyncio
+    async def test_messages_without_id_are_not_deduplicated(self, concurrent_reasoner):
+        await concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        await concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+
+        assert len(concurrent_reasoner.messages) == 2
+        assert concurrent_reasoner.duplicates == 0
+
+    @pytest.mark.asyncio
+    async def test_duplicate_append_is_dropped(self, concurrent_reasoner):
+        concurrent_reasoner.append(Message(content="Hi", sender="system", id="m1"))
+        concurrent_reasoner.append(Message(content="Hi", sender="system", id="m1"))
+        response = await concurrent_reasoner.process(Message(content="Hi", sender="user1", id="m1"))
+
+        assert len(concurrent_reasoner.messages) == 1
+        assert response.decision == Decision.IGNORE
+        assert concurrent_reasoner.duplicates == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_seen_ids_are_evicted(self):
+        concurrent_reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), dedup_size=2)
+        for i in range(3):
+            concurrent_reasoner.append(Message(content="Hi", sender="user1", id=f"m{i}"))
+
+        concurrent_reasoner.append(Message(content="Hi", sender="user1", id="m0"))
+        concurrent_reasoner.append(Message(content="Hi", sender="user1", id="m2"))
+
+        assert len(concurrent_reasoner.messages) == 4
+        assert concurrent_reasoner.duplicates == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_stream_completes_with_original_response(self, concurrent_reasoner):
+        expected = Response(decision=Decision.DELEGATE, query="Query", receiver="user2")
+        concurrent_reasoner._factory.created_reasoners["user1"] = MockGroupReasoner(response=expected)
+
+        s1 = concurrent_reasoner.process_stream(Message(content="Q", sender="user1", id="m1"))
+        s2 = concurrent_reasoner.process_stream(Message(content="Q", sender="user1", id="m1"))
+
+        assert await s1.response() == await s2.response()
+        assert len(concurrent_reasoner.messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_ids_are_indexed_after_restore(self, concurrent_reasoner):
+        await concurrent_reasoner.process(Message(content="Hi", sender="user1", id="m1"))
+
+        restored = ConcurrentGroupReasoner(MockGroupReasonerFactory())
+        restored.set_serialized(await concurrent_reasoner.get_serialized())
+        restored.append(Message(content="Hi", sender="user1", id="m1"))
+
+        assert len(restored.messages) == 1
+
+    def test_invalid_dedup_size_raises_value_error(self):
+        with pytest.raises(ValueError):
+            ConcurrentGroupReasoner(MockGroupReasonerFactory(), dedup_size=0)
+
+
+class TestConcurrentGroupReasonerLifecycle:
+    @staticmethod
+    def reasoner_with_slow_owner(owner: str) -> ConcurrentGroupReasoner:
+        factory = MockGroupReasonerFactory()
+        factory.created_reasoners[owner] = SlowMockGroupReasoner()
+        return ConcurrentGroupReasoner(factory)
+
+    @pytest.mark.asyncio
+    async def test_aclose_drains_pending_runs(self, concurrent_reasoner):
+        futures = [concurrent_reasoner.process(Message(content=f"Message {i}", sender="user1")) for i in range(3)]
+
+        await concurrent_reasoner.aclose()
+
+        assert all(future.done() and not future.cancelled() for future in futures)
+        assert concurrent_reasoner.tasks() == []
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_runs_after_timeout(self):
+        concurrent_reasoner = self.reasoner_with_slow_owner("user1")
+        f1 = concurrent_reasoner.process(Message(content="Slow", sender="user1"))
+        f2 = concurrent_reasoner.process(Message(content="Fast", sender="user2"))
+
+        await concurrent_reasoner.aclose(timeout=0.02)
+
+        assert f1.cancelled()
+        assert f2.result().decision == Decision.IGNORE
+        assert concurrent_reasoner.tasks() == []
+
+    @pytest.mark.asyncio
+    async def test_closed_reasoner_rejects_messages(self, concurrent_reasoner):
+        await concurrent_reasoner.aclose()
+        await concurrent_reasoner.aclose()  # idempotent
+
+        message = Message(content="Hi", sender="user1")
+        with pytest.raises(RuntimeError):
+            concurrent_reasoner.process(message)
+        with pytest.raises(RuntimeError):
+            concurrent_reasoner.process_stream(message)
+        with pytest.raises(RuntimeError):
+            concurrent_reasoner.append(message)
+        assert concurrent_reasoner.messages == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending_of_owner(self, concurrent_reasoner):
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+        f2 = concurrent_reasoner.process(Message(content="Again", sender="user1"))
+        f3 = concurrent_reasoner.process(Message(content="Hello", sender="user2"))
+
+        assert len(concurrent_reasoner.tasks("user1")) == 2
+        assert concurrent_reasoner.cancel_pending("user1") == 2
+        await asyncio.sleep(0)
+
+        assert f1.cancelled() and f2.cancelled()
+        assert concurrent_reasoner.pending == 1
+        assert (await f3).decision == Decision.IGNORE
+        assert concurrent_reasoner.tasks("user1") == []
+        # the next trigger of user1 covers the messages of the cancelled triggers
+        await concurrent_reasoner.process(Message(content="Last", sender="user1"))
+        assert len(concurrent_reasoner._factory.created_reasoners["user1"].process_calls[-1]) == 4
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending_stream(self, concurrent_reasoner):
+        stream = concurrent_reasoner.process_stream(Message(content="Hi", sender="user1"))
+
+        assert concurrent_reasoner.cancel_pending("user1") == 1
+        with pytest.raises(asyncio.CancelledError):
+            await stream.response()
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending_stream_stops_reasoner_run(self, concurrent_reasoner):
+        class BlockingReasoner(MockGroupReasoner):
+            def __init__(self):
+                super().__init__()
+                self.started = asyncio.Event()
+                self.release = asyncio.Event()
+
+            async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+                if not self.started.is_set():
+                    self.started.set()
+                    await self.release.wait()
+                return await super().process(updates, summary)
+
+        mock_reasoner = BlockingReasoner()
+        concurrent_reasoner._factory.created_reasoners["user1"] = mock_reasoner
+        msg1 = Message(content="First", sender="user1")
+        msg2 = Message(content="Second", sender="user1")
+
+        stream = concurrent_reasoner.process_stream(msg1)
+        await mock_reasoner.started.wait()
+        assert concurrent_reasoner.cancel_pending("user1") == 1
+        with pytest.raises(asyncio.CancelledError):
+            await stream.response()
+
+        mock_reasoner.release.set()
+        await concurrent_reasoner.process(msg2)
+        await asyncio.sleep(0.05)
+
+        # the cancelled run neither completes later nor overlaps with the next run
+        assert mock_reasoner.process_calls == [[msg1, msg2]]
+        assert mock_reasoner.processed == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending_batch_trigger(self):
+        concurrent_reasoner = ConcurrentGroupReasoner(
+            MockGroupReasonerFactory(), batch_reasoner=MockBatchGroupReasoner(), batch_window=0.01
+        )
+        f1 = concurrent_reasoner.process(Message(content="Hi", sender="alice"))
+        f2 = concurrent_reasoner.process(Message(content="Hello", sender="bob"))
+
+        assert concurrent_reasoner.cancel_pending("alice") == 1
+        await f2
+        assert f1.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_reasoner(self):
+        async with ConcurrentGroupReasoner(MockGroupReasonerFactory()) as concurrent_reasoner:
+            future = concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+
+        assert future.done()
+        with pytest.raises(RuntimeError):
+            concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+
+    @pytest.mark.asyncio
+    async def test_context_manager_cancels_runs_on_error(self):
+        with pytest.raises(KeyError):
+            async with self.reasoner_with_slow_owner("user1") as concurrent_reasoner:
+                future = concurrent_reasoner.process(Message(content="Hi", sender="user1"))
+                raise KeyError("user1")
+
+        assert future.cancelled()
+
+
+class TestConcurrentGroupReasonerRecovery:
+    @pytest.mark.asyncio
+    async def test_recover_replays_messages_and_turns(self, tmp_path):
+        reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), wal=WriteAheadLog(tmp_path, commit_interval=0))
+        await reasoner.process(Message(content="Hi", sender="user1"))
+        reasoner.append(Message(content="Reply", sender="system"))
+        await reasoner.process(Message(content="Hello", sender="user2"))
+
+        factory = MockGroupReasonerFactory()
+        recovered = ConcurrentGroupReasoner(factory, wal=WriteAheadLog(tmp_path, commit_interval=0))
+        pending = recovered.recover()
+
+        assert pending == []
+        assert recovered.messages == reasoner.messages
+        assert factory.created_reasoners["user1"].processed == 1
+        assert factory.created_reasoners["user2"].processed == 3
+
+    @pytest.mark.asyncio
+    async def test_recover_reruns_uncommitted_triggers(self, tmp_path):
+        wal = WriteAheadLog(tmp_path, commit_interval=0)
+        factory = MockGroupReasonerFactory()
+        reasoner = ConcurrentGroupReasoner(factory, wal=wal)
+        await reasoner.process(Message(content="Hi", sender="user1"))
+
+        blocked = asyncio.Event()
+
+        class BlockingReasoner(MockGroupReasoner):
+            async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+                await blocked.wait()
+                return await super().process(updates, summary)
+
+        factory.created_reasoners["user2"] = BlockingReasoner()
+        message = Message(content="Question?", sender="user2")
+        future = reasoner.process(message)
+        await wal.commit()
+
+        # crash before the turn of user2 completes
+        future.cancel()
+
+        factory = MockGroupReasonerFactory()
+        recovered = ConcurrentGroupReasoner(factory, wal=WriteAheadLog(tmp_path, commit_interval=0))
+        pending = recovered.recover()
+
+        assert [m for m, _ in pending] == [message]
+        await pending[0][1]
+        assert factory.created_reasoners["user2"].process_calls == [recovered.messages]
+        assert factory.created_reasoners["user1"].process_calls == []
+
+    @pytest.mark.asyncio
+    async def test_recover_replays_log_after_snapshot(self, tmp_path):
+        reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), wal=WriteAheadLog(tmp_path, commit_interval=0))
+        await reasoner.process(Message(content="Hi", sender="user1"))
+        state = await reasoner.get_serialized()
+        await reasoner.process(Message(content="Hello", sender="user1"))
+
+        factory = MockGroupReasonerFactory()
+        recovered = ConcurrentGroupReasoner(factory, wal=WriteAheadLog(tmp_path, commit_interval=0))
+        recovered.recover(state)
+
+        assert recovered.messages == reasoner.messages
+        assert factory.created_reasoners["user1"].processed == 2
+
+    def test_recover_without_wal_raises_value_error(self, concurrent_reasoner):
+        with pytest.raises(ValueError):
+            concurrent_reasoner.recover()
+
+
+class TestConcurrentGroupReasonerStore:
+    @pytest_asyncio.fixture
+    async def store(self, tmp_path):
+        store = SQLiteStore(tmp_path / "store.db")
+        yield store
+        await store.aclose()
+
+    @pytest.mark.asyncio
+    async def test_room_is_loaded_and_reasoners_paged_in_on_demand(self, store):
+        reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), store=store, room="room1")
+        await reasoner.process(Message(content="Hi", sender="user1"))
+        reasoner.append(Message(content="Reply", sender="system"))
+        await reasoner.process(Message(content="Hello", sender="user2"))
+
+        factory = MockGroupReasonerFactory()
+        loaded = ConcurrentGroupReasoner(factory, store=store, room="room1")
+        await loaded.load()
+
+        assert loaded.messages == reasoner.messages
+        assert factory.create_calls == []
+
+        await loaded.process(Message(content="Again", sender="user1"))
+
+        assert [owner for owner, _ in factory.create_calls] == ["user1"]
+        assert factory.created_reasoners["user1"].process_calls == [loaded.messages[1:]]
+
+    @pytest.mark.asyncio
+    async def test_unloaded_reasoner_is_paged_in_again(self, store):
+        factory = MockGroupReasonerFactory()
+        reasoner = ConcurrentGroupReasoner(factory, store=store, room="room1")
+        await reasoner.process(Message(content="Hi", sender="user1"))
+        future = reasoner.process(Message(content="Hello", sender="user2"))
+
+        assert reasoner.unload("user1")
+        assert not reasoner.unload("user2")  # pending run
+        assert not reasoner.unload("user3")  # not loaded
+        await future
+
+        del factory.created_reasoners["user1"]
+        await reasoner.process(Message(content="Again", sender="user1"))
+
+        assert factory.created_reasoners["user1"].process_calls == [reasoner.messages[1:]]
+
+    def test_unload_without_store_raises_value_error(self, concurrent_reasoner):
+        with pytest.raises(ValueError):
+            concurrent_reasoner.unload("user1")
+
+    @pytest.mark.asyncio
+    async def test_rooms_are_isolated(self, store):
+        reasoner = ConcurrentGroupReasoner(MockGroupReasonerFactory(), store=store, room="room1")
+        await reasoner.process(Message(content="Hi", sender="user1"))
+
+        other = ConcurrentGroupReasoner(MockGroupReasonerFactory(), store=store, room="room2")
+        await other.load()
+
+        assert other.messages == []
+
+    def test_store_without_room_raises_value_error(self, store):
+        with pytest.raises(ValueError):
+            ConcurrentGroupReasoner(MockGroupReasonerFactory(), store=store)
@@ -1,10 +1,29 @@
+import json
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
 from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
 from pydantic_ai.models.test import TestModel
+from pydantic_ai.profiles import ModelProfile
 
 from group_sense.message import Message
-from group_sense.reasoner.base import Decision, Response
-from group_sense.reasoner.default import DefaultGroupReasoner
+from group_sense.reasoner.base import Decision, Response, RoomSummary
+from group_sense.reasoner.default import (
+    DefaultGroupReasoner,
+    DefaultGroupReasonerFactory,
+)
+from group_sense.reasoner.profile import Profile
+from group_sense.reasoner.prompt import PromptBudget, estimate_tokens
 
 
 class TestableDefaultGroupReasoner(DefaultGroupReasoner):
@@ -19,6 +38,16 @@ class TestableDefaultGroupReasoner(DefaultGroupReasoner):
         )
 
 
+def user_prompts(history: list[ModelMessage]) -> list[str]:
+    return [
+        part.content
+        for message in history
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+        if isinstance(part, UserPromptPart) and isinstance(part.content, str)
+    ]
+
+
 @pytest.fixture
 def reasoner():
     """Fixture that creates a TestableDefaultGroupReasoner with IGNORE decision."""
@@ -122,3 +151,340 @@ class TestDefaultGroupReasoner:
         messages2 = [Message(content="Second", sender="user2", receiver="bot")]
         await reasoner.process(messages2)
         assert len(reasoner._history) > history_length_after_first
+
+    @pytest.mark.asyncio
+    async def test_summary_replaces_backlog(self, reasoner):
+        summary = RoomSummary(content="Earlier discussion", end=10)
+        messages = [Message(content="After summary", sender="user1", receiver="bot")]
+        await reasoner.process(messages, summary=summary)
+
+        assert reasoner.processed == 11
+        prompt = user_prompts(reasoner._history)[-1]
+        assert '<summary end_seq_nr="9">' in prompt
+        assert 'seq_nr="10"' in prompt
+
+    @pytest.mark.asyncio
+    async def test_summary_ignored_if_already_processed(self, reasoner):
+        await reasoner.process([Message(content="First", sender="user1", receiver="bot")])
+        await reasoner.process(
+            [Message(content="Second", sender="user2", receiver="bot")],
+            summary=RoomSummary(content="Stale", end=1),
+        )
+
+        assert reasoner.processed == 2
+        prompt = user_prompts(reasoner._history)[-1]
+        assert "<summary" not in prompt
+        assert 'seq_nr="1"' in prompt
+
+
+def streaming_reasoner(response: dict, chunk_size: int = 5) -> DefaultGroupReasoner:
+    text = json.dumps(response)
+
+    async def stream(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        for i in range(0, len(text), chunk_size):
+            yield text[i : i + chunk_size]
+
+    model = FunctionModel(stream_function=stream, profile=ModelProfile(supports_json_schema_output=True))
+    return DefaultGroupReasoner(system_prompt="You are a helpful assistant", model=model)
+
+
+class TestDefaultGroupReasonerStream:
+    @pytest.mark.asyncio
+    async def test_decision_precedes_complete_query(self):
+        reasoner = streaming_reasoner({"decision": "delegate", "query": "Can you explain async/await?", "receiver": ""})
+        messages = [Message(content="How does async work?", sender="user1")]
+
+        partials = [partial async for partial in reasoner.process_stream(messages)]
+
+        assert partials[0].decision == Decision.DELEGATE
+        assert partials[0].query != "Can you explain async/await?"
+        assert partials[-1] == Response(decision=Decision.DELEGATE, query="Can you explain async/await?")
+        assert reasoner.processed == 1
+        assert len(reasoner._history) == 2
+
+    @pytest.mark.asyncio
+    async def test_state_updated_when_stream_abandoned(self):
+        reasoner = streaming_reasoner({"decision": "ignore", "query": None, "receiver": None}, chunk_size=2)
+        messages = [Message(content="Just chatting", sender="user1")]
+
+        stream = reasoner.process_stream(messages)
+        async for partial in stream:
+            assert partial.decision == Decision.IGNORE
+            break
+
+        response = await stream.response()
+        assert response.decision == Decision.IGNORE
+        assert reasoner.processed == 1
+        assert len(reasoner._history) == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential_stream_and_process_share_history(self):
+        reasoner = streaming_reasoner({"decision": "ignore"})
+
+        stream = reasoner.process_stream([Message(content="First", sender="user1")])
+        await stream.response()
+        stream = reasoner.process_stream([Message(content="Second", sender="user2")])
+        await stream.response()
+
+        assert reasoner.processed == 2
+        assert 'seq_nr="1"' in user_prompts(reasoner._history)[-1]
+
+    def test_empty_updates_raises_value_error(self):
+        reasoner = streaming_reasoner({"decision": "ignore"})
+        with pytest.raises(ValueError, match="Updates must not be empty"):
+            reasoner.process_stream([])
+
+    @pytest.mark.asyncio
+    async def test_model_error_raised_by_stream(self):
+        async def stream(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+            raise RuntimeError("Model failed")
+            yield ""
+
+        model = FunctionModel(stream_function=stream, profile=ModelProfile(supports_json_schema_output=True))
+        reasoner = DefaultGroupReasoner(system_prompt="You are a helpful assistant", model=model)
+
+        with pytest.raises(RuntimeError, match="Model failed"):
+            await reasoner.process_stream([Message(content="Hi", sender="user1")]).response()
+        assert reasoner.processed == 0
+
+
+class TestDefaultGroupReasonerProfile:
+    @staticmethod
+    def recording_reasoner(profile: Profile) -> tuple[DefaultGroupReasoner, list]:
+        calls = []
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            calls.append((messages, info.model_settings))
+            return ModelResponse(parts=[TextPart(content='{"decision": "ignore"}')])
+
+        model = FunctionModel(respond, profile=ModelProfile(supports_json_schema_output=True))
+        return DefaultGroupReasoner(system_prompt="You are a helpful assistant", model=model, profile=profile), calls
+
+    def test_default_profile_is_thorough(self, reasoner):
+        assert reasoner.profile == Profile.THOROUGH
+
+    @pytest.mark.asyncio
+    async def test_fast_profile_limits_history_sent_but_keeps_full_history(self):
+        reasoner, calls = self.recording_reasoner(Profile.FAST)
+        for i in range(4):
+            await reasoner.process([Message(content=f"Message {i}", sender="user1")])
+
+        sent, settings = calls[-1]
+        assert len(user_prompts(sent)) == 3
+        assert isinstance(sent[0].parts[0], SystemPromptPart)
+        assert settings["google_thinking_config"]["thinking_level"] == "minimal"
+        assert len(user_prompts(reasoner._history)) == 4
+
+    @pytest.mark.asyncio
+    async def test_adaptive_profile_selects_settings_per_call(self):
+        reasoner, calls = self.recording_reasoner(Profile.ADAPTIVE)
+        await reasoner.process([Message(content="Sounds good", sender="user1")])
+        await reasoner.process([Message(content="When is the meeting?", sender="user1")])
+
+        assert calls[0][1]["google_thinking_config"]["thinking_level"] == "low"
+        assert calls[1][1]["google_thinking_config"]["thinking_level"] == "high"
+
+    def test_factory_passes_profile(self):
+        factory = DefaultGroupReasonerFactory(system_prompt_template="Assist {owner}", profile="fast")
+        alice = factory.create_group_reasoner(owner="alice", model=TestModel())
+        bob = factory.create_group_reasoner(owner="bob", model=TestModel(), profile="adaptive")
+
+        assert isinstance(alice, DefaultGroupReasoner) and alice.profile == Profile.FAST
+        assert isinstance(bob, DefaultGroupReasoner) and bob.profile == Profile.ADAPTIVE
+
+
+class TestDefaultGroupReasonerPromptBudget:
+    @pytest.mark.asyncio
+    async def test_prompt_is_fit_into_budget(self):
+        prompts = []
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            prompts.extend(user_prompts(messages))
+            return ModelResponse(parts=[TextPart(content='{"decision": "ignore"}')])
+
+        model = FunctionModel(respond, profile=ModelProfile(supports_json_schema_output=True))
+        budget = PromptBudget(max_tokens=10_000, max_message_tokens=100)
+        reasoner = DefaultGroupReasoner(system_prompt="You are a helpful assistant", model=model, prompt_budget=budget)
+
+        await reasoner.process([Message(content="x" * 10_000, sender="user1")])
+
+        assert "tokens elided" in prompts[-1]
+        assert estimate_tokens(prompts[-1]) < 200
+
+    def test_factory_passes_prompt_budget(self):
+        budget = PromptBudget(max_tokens=10_000)
+        factory = DefaultGroupReasonerFactory(system_prompt_template="Assist {owner}", prompt_budget=budget)
+        reasoner = factory.create_group_reasoner(owner="alice", model=TestModel())
+
+        assert isinstance(reasoner, DefaultGroupReasoner) and reasoner._prompt_budget == budget
+
+
+class TestDefaultGroupReasonerDelta:
+    @staticmethod
+    async def process_turns(reasoner: DefaultGroupReasoner, n: int, offset: int = 0):
+        for i in range(offset, offset + n):
+            await reasoner.process([Message(content=f"Message {i}", sender="user1")])
+
+    @staticmethod
+    def restored(state: dict | None = None) -> DefaultGroupReasoner:
+        model = TestModel(custom_output_args=Response(decision=Decision.IGNORE))
+        reasoner = TestableDefaultGroupReasoner(system_prompt="You are a helpful assistant", model=model)
+        if state is not None:
+            reasoner.set_serialized(state)
+        return reasoner
+
+    @pytest.mark.asyncio
+    async def test_delta_contains_only_new_messages(self, reasoner):
+        await self.process_turns(reasoner, 2)
+        first = reasoner.get_serialized_delta()
+        await self.process_turns(reasoner, 1, offset=2)
+        second = reasoner.get_serialized_delta()
+
+        assert first["start"] == 0
+        assert second["start"] == len(first["agent"])
+        assert len(first["agent"]) + len(second["agent"]) == len(reasoner._history)
+        assert second["processed"] == 3
+        assert reasoner.get_serialized_delta()["agent"] == []
+
+    @pytest.mark.asyncio
+    async def test_replaying_deltas_restores_state(self, reasoner):
+        deltas = []
+        for i in range(3):
+            await self.process_turns(reasoner, 1, offset=i)
+            deltas.append(reasoner.get_serialized_delta())
+
+        restored = self.restored()
+        for delta in deltas:
+            restored.apply_serialized_delta(delta)
+
+        assert restored.get_serialized() == reasoner.get_serialized()
+
+    @pytest.mark.asyncio
+    async def test_compaction_equals_full_snapshot(self, reasoner):
+        await self.process_turns(reasoner, 2)
+        snapshot = reasoner.get_serialized()
+        reasoner.get_serialized_delta()
+
+        deltas = []
+        for i in range(2, 4):
+            await self.process_turns(reasoner, 1, offset=i)
+            deltas.append(reasoner.get_serialized_delta())
+
+        compacted = DefaultGroupReasoner.compact_serialized(snapshot, deltas)
+        assert compacted == reasoner.get_serialized()
+
+    @pytest.mark.asyncio
+    async def test_deltas_continue_after_restore(self, reasoner):
+        await self.process_turns(reasoner, 2)
+        restored = self.restored(reasoner.get_serialized())
+
+        await self.process_turns(restored, 1, offset=2)
+        delta = restored.get_serialized_delta()
+
+        assert delta["start"] == len(reasoner._history)
+        assert self.restored(DefaultGroupReasoner.compact_serialized(reasoner.get_serialized(), [delta])).processed == 3
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_delta_raises_value_error(self, reasoner):
+        await self.process_turns(reasoner, 1)
+        reasoner.get_serialized_delta()
+        await self.process_turns(reasoner, 1, offset=1)
+        second = reasoner.get_serialized_delta()
+
+        with pytest.raises(ValueError):
+            self.restored().apply_serialized_delta(second)
+        with pytest.raises(ValueError):
+            DefaultGroupReasoner.compact_serialized({"agent": [], "processed": 0}, [second])
+
+
+class TestDefaultGroupReasonerAsyncSerialization:
+    @pytest.mark.asyncio
+    async def test_async_serialization_matches_sync(self, reasoner):
+        await reasoner.process([Message(content="Hello", sender="user1")])
+
+        assert await reasoner.get_serialized_async() == reasoner.get_serialized()
+
+    @pytest.mark.asyncio
+    async def test_async_restore(self, reasoner):
+        await reasoner.process([Message(content="Hello", sender="user1")])
+        state = await reasoner.get_serialized_async()
+
+        restored = TestDefaultGroupReasonerDelta.restored()
+        await restored.set_serialized_async(state)
+
+        assert restored.get_serialized() == state
+        assert restored.get_serialized_delta()["start"] == len(reasoner._history)
+
+    @pytest.mark.asyncio
+    async def test_async_serialization_in_process_pool(self, reasoner):
+        await reasoner.process([Message(content="Hello", sender="user1")])
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            state = await reasoner.get_serialized_async(executor)
+
+        assert state == reasoner.get_serialized()
+
+
+class TestDefaultGroupReasonerIngest:
+    @pytest.mark.asyncio
+    async def test_ingest_advances_processed_without_model_call(self):
+        reasoner, calls = TestDefaultGroupReasonerProfile.recording_reasoner(Profile.THOROUGH)
+        transcript = [Message(content=f"Message {i}", sender=f"user{i % 2}") for i in range(5)]
+
+        await reasoner.ingest(transcript)
+
+        assert calls == []
+        assert reasoner.processed == 5
+        assert '<message seq_nr="4" sender="user0" receiver="">' in user_prompts(reasoner._history)[0]
+
+    @pytest.mark.asyncio
+    async def test_process_after_ingest_sees_transcript(self):
+        reasoner, calls = TestDefaultGroupReasonerProfile.recording_reasoner(Profile.THOROUGH)
+        await reasoner.ingest([Message(content="Old message", sender="user1")])
+
+        await reasoner.process([Message(content="New message", sender="user2")])
+
+        sent, _ = calls[0]
+        prompts = user_prompts(sent)
+        assert "Old message" in prompts[0]
+        assert '<message seq_nr="1" sender="user2" receiver="">' in prompts[1]
+        assert reasoner.processed == 2
+
+    @pytest.mark.asyncio
+    async def test_process_after_ingest_sends_system_prompt(self):
+        reasoner, calls = TestDefaultGroupReasonerProfile.recording_reasoner(Profile.FAST)
+        for i in range(3):
+            await reasoner.ingest([Message(content=f"Old message {i}", sender="user1")])
+
+        await reasoner.process([Message(content="New message", sender="user2")])
+
+        sent, _ = calls[0]
+        system_prompts = [part.content for part in sent[0].parts if isinstance(part, SystemPromptPart)]
+        assert system_prompts == ["You are a helpful assistant"]
+
+    @pytest.mark.asyncio
+    async def test_ingest_with_summary(self):
+        reasoner, _ = TestDefaultGroupReasonerProfile.recording_reasoner(Profile.THOROUGH)
+        summary = RoomSummary(content="user1 asked about the release date.", end=100)
+
+        await reasoner.ingest([Message(content="Recent message", sender="user1")], summary=summary)
+
+        prompt = user_prompts(reasoner._history)[0]
+        assert "user1 asked about the release date." in prompt
+        assert '<message seq_nr="100" sender="user1" receiver="">' in prompt
+        assert reasoner.processed == 101
+
+    @pytest.mark.asyncio
+    async def test_ingested_history_is_serialized(self, reasoner):
+        await reasoner.ingest([Message(content="Old message", sender="user1")])
+        delta = reasoner.get_serialized_delta()
+
+        restored = TestDefaultGroupReasonerDelta.restored()
+        restored.apply_serialized_delta(delta)
+
+        assert restored.get_serialized() == reasoner.get_serialized()
+
+    @pytest.mark.asyncio
+    async def test_ingest_empty_updates_raises(self, reasoner):
+        with pytest.raises(ValueError):
+            await reasoner.ingest([])
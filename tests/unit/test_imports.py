@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+import group_sense
+
+
+def imported_modules(statement: str) -> set[str]:
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+class TestLazyImports:
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import group_sense",
+            "from group_sense import Message, Thread, Attachment",
+            "from group_sense.reasoner.prompt import user_prompt",
+        ],
+    )
+    def test_light_imports_do_not_import_pydantic_ai(self, statement):
+        modules = imported_modules(statement)
+
+        assert "pydantic_ai" not in modules
+        assert "google.genai" not in modules
+
+    def test_reasoner_is_imported_on_first_access(self):
+        modules = imported_modules("from group_sense import DefaultGroupReasoner")
+
+        assert "group_sense.reasoner.default" in modules
+        assert "pydantic_ai" in modules
+
+    def test_all_exports_resolve(self):
+        for name in group_sense.__all__:
+            assert getattr(group_sense, name).__name__ == name
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        with pytest.raises(AttributeError):
+            getattr(group_sense, "Unknown")
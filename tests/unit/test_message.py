@@ -0,0 +1,45 @@
+from pydantic import TypeAdapter
+
+from group_sense.message import Attachment, Message, Thread
+
+
+class TestMessage:
+    def test_messages_are_slotted(self):
+        message = Message(content="Hi", sender="user1")
+
+        assert not hasattr(message, "__dict__")
+        assert not hasattr(Thread(id="t1", messages=[]), "__dict__")
+        assert not hasattr(Attachment(path="a.png", name="a", media_type="image/png"), "__dict__")
+
+    def test_messages_share_empty_threads_and_attachments(self):
+        m1 = Message(content="Hi", sender="user1")
+        m2 = Message(content="Hello", sender="user2", threads=[], attachments=[])
+
+        assert m1.threads == ()
+        assert m1.threads is m2.threads
+        assert m1.attachments is m2.attachments
+
+    def test_sender_and_receiver_are_interned(self):
+        m1 = Message(content="Hi", sender="".join(["user", "1"]), receiver="".join(["user", "2"]))
+        m2 = Message(content="Hello", sender="".join(["user", "1"]), receiver="".join(["user", "2"]))
+
+        assert m1.sender is m2.sender
+        assert m1.receiver is m2.receiver
+
+    def test_threads_and_attachments_are_stored_as_tuples(self):
+        thread = Thread(id="t1", messages=[Message(content="Ref", sender="user3")])
+        attachment = Attachment(path="a.png", name="a", media_type="image/png")
+        message = Message(content="Hi", sender="user1", threads=[thread], attachments=[attachment])
+
+        assert message.threads == (thread,)
+        assert message.attachments == (attachment,)
+
+    def test_json_roundtrip(self):
+        adapter = TypeAdapter(Message)
+        thread = Thread(id="t1", messages=[Message(content="Ref", sender="user3")])
+        message = Message(content="Hi", sender="user1", receiver="user2", threads=[thread], id="m1")
+
+        restored = adapter.validate_json(adapter.dump_json(message))
+
+        assert restored == message
+        assert restored.sender is message.sender
@@ -0,0 +1,83 @@
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, SystemPromptPart, TextPart, UserPromptPart
+
+from group_sense.message import Message
+from group_sense.reasoner.profile import Profile, limit_history, profile_settings, select_profile
+
+
+def make_history(turns: int) -> list[ModelMessage]:
+    history: list[ModelMessage] = []
+    for i in range(turns):
+        parts = [SystemPromptPart(content="System")] if i == 0 else []
+        history.append(ModelRequest(parts=[*parts, UserPromptPart(content=f"Prompt {i}")]))
+        history.append(ModelResponse(parts=[TextPart(content=f"Response {i}")]))
+    return history
+
+
+def content(message: ModelMessage, index: int) -> str:
+    part = message.parts[index]
+    assert isinstance(part, (UserPromptPart, TextPart)) and isinstance(part.content, str)
+    return part.content
+
+
+class TestProfileSettings:
+    def test_fast_profile_disables_thinking_and_limits_history(self):
+        settings = profile_settings(Profile.FAST)
+        assert settings.model_settings["google_thinking_config"]["thinking_level"] == "minimal"
+        assert settings.history_limit is not None
+
+    def test_thorough_profile_matches_previous_default(self):
+        settings = profile_settings(Profile.THOROUGH)
+        assert settings.model_settings["google_thinking_config"] == {
+            "thinking_level": "high",
+            "include_thoughts": True,
+        }
+        assert settings.history_limit is None
+
+    def test_adaptive_profile_has_no_fixed_settings(self):
+        with pytest.raises(ValueError, match="Adaptive profile"):
+            profile_settings(Profile.ADAPTIVE)
+
+    def test_profile_from_string(self):
+        assert Profile("balanced") == Profile.BALANCED
+
+
+class TestSelectProfile:
+    def test_small_statement_is_balanced(self):
+        assert select_profile([Message(content="Sounds good", sender="user1")]) == Profile.BALANCED
+
+    def test_question_is_thorough(self):
+        assert select_profile([Message(content="Is it at 3pm?", sender="user1")]) == Profile.THOROUGH
+
+    def test_mention_is_thorough(self):
+        assert select_profile([Message(content="@bob see above", sender="user1")]) == Profile.THOROUGH
+
+    def test_receiver_is_thorough(self):
+        assert select_profile([Message(content="Noted", sender="user1", receiver="bob")]) == Profile.THOROUGH
+
+    def test_large_update_is_thorough(self):
+        updates = [Message(content="Ok", sender="user1") for _ in range(5)]
+        assert select_profile(updates) == Profile.THOROUGH
+        assert select_profile(updates[:4]) == Profile.BALANCED
+
+
+class TestLimitHistory:
+    def test_no_limit_returns_history(self):
+        history = make_history(3)
+        assert limit_history(history, None) is history
+
+    def test_short_history_is_unchanged(self):
+        history = make_history(2)
+        assert limit_history(history, 2) is history
+
+    def test_retains_last_turns_and_system_prompt(self):
+        history = make_history(4)
+        limited = limit_history(history, 2)
+
+        assert len(limited) == 4
+        assert isinstance(limited[0].parts[0], SystemPromptPart)
+        assert content(limited[0], 1) == "Prompt 2"
+        assert content(limited[-1], 0) == "Response 3"
+        # original history is not modified
+        assert content(history[4], 0) == "Prompt 2"
+        assert len(history[4].parts) == 1
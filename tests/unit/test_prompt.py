@@ -1,15 +1,29 @@
+import pytest
+
 from group_sense.message import Attachment, Message, Thread
+from group_sense.reasoner.base import RoomSummary
 from group_sense.reasoner.prompt import (
     ATTACHMENT_TEMPLATE,
+    ELIDED_ATTACHMENTS_TEMPLATE,
+    ELIDED_MESSAGES_TEMPLATE,
+    ELIDED_THREAD_MESSAGES_TEMPLATE,
+    ELIDED_THREADS_TEMPLATE,
     THREADS_TEMPLATE,
     UPDATE_TEMPLATE,
+    PromptBudget,
+    PromptCache,
+    estimate_tokens,
     format_attachment,
     format_attachments,
     format_message,
+    format_summary,
     format_thread,
     format_threads,
     format_update,
     format_update_messages,
+    message_tokens,
+    resolve_threads,
+    truncate_content,
     unique_threads,
     user_prompt,
 )
@@ -210,6 +224,12 @@ class TestUniqueThreads:
         assert [t.id for t in result] == ["thread-1", "thread-2", "thread-3"]
 
 
+class TestFormatSummary:
+    def test_format_summary(self):
+        result = format_summary(RoomSummary(content="Alice asked about Python", end=20))
+        assert result == '<summary end_seq_nr="19">\nAlice asked about Python\n</summary>'
+
+
 class TestFormatUpdate:
     def test_format_single_message_update(self):
         messages = [Message(content="Hello", sender="user1", receiver="user2")]
@@ -305,3 +325,197 @@ class TestUserPrompt:
         result = user_prompt(messages, start_seq_nr=100)
         assert 'seq_nr="100"' in result
         assert 'seq_nr="101"' in result
+
+    def test_summary_precedes_threads_and_update(self):
+        thread = Thread(id="thread-1", messages=[Message(content="Thread msg", sender="user1")])
+        messages = [Message(content="After summary", sender="user1", threads=[thread])]
+        result = user_prompt(messages, start_seq_nr=5, summary=RoomSummary(content="Earlier", end=5))
+        assert result.index("<summary") < result.index("<threads>") < result.index("<update>")
+        assert 'seq_nr="5"' in result
+
+
+class TestEstimateTokens:
+    def test_ascii_text(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_non_ascii_characters_count_as_one_token(self):
+        assert estimate_tokens("abcd日本") == 3
+
+    def test_message_tokens_are_cached_per_seq_nr(self):
+        cache = PromptCache()
+        message = Message(content="Hello " * 100, sender="user1")
+
+        tokens = message_tokens(message, 3, cache)
+        assert tokens == estimate_tokens(format_message(message, 3))
+        assert message_tokens(message, 3, cache) == tokens
+        # equal messages created on access, e.g. by a columnar log, hit the cache
+        cache._message_tokens.put(3, (message.sender, message.receiver, message.content, message.attachments), -1)
+        assert message_tokens(Message(content="Hello " * 100, sender="user1"), 3, cache) == -1
+
+        message.content = "Hello"
+        assert message_tokens(message, 3, cache) < tokens
+
+    def test_prompt_cache_is_bounded(self):
+        cache = PromptCache(capacity=2)
+        for seq_nr in range(3):
+            message_tokens(Message(content="Hi", sender="user1"), seq_nr, cache)
+
+        assert len(cache._message_tokens._entries) == 2
+        with pytest.raises(ValueError):
+            PromptCache(capacity=0)
+
+
+class TestPromptBudget:
+    def test_invalid_limits_raise_value_error(self):
+        with pytest.raises(ValueError):
+            PromptBudget(max_tokens=0)
+        with pytest.raises(ValueError):
+            PromptBudget(max_tokens=100, max_message_tokens=0)
+        with pytest.raises(ValueError):
+            PromptBudget(max_tokens=100, max_attachments=-1)
+
+    def test_truncate_content_keeps_beginning_and_end(self):
+        content = "a" * 400 + "b" * 400
+
+        truncated = truncate_content(content, 100)
+
+        assert truncated.startswith("aaa")
+        assert truncated.endswith("bbb")
+        assert "tokens elided" in truncated
+        assert estimate_tokens(truncated) <= 100
+
+    def test_prompt_within_budget_is_unchanged(self):
+        messages = [Message(content="Hi", sender="user1"), Message(content="Hello", sender="user2")]
+
+        assert user_prompt(messages, 5, budget=PromptBudget(max_tokens=1000)) == user_prompt(messages, 5)
+
+    def test_long_message_content_is_truncated(self):
+        messages = [Message(content="x" * 10_000, sender="user1")]
+
+        prompt = user_prompt(messages, 0, budget=PromptBudget(max_tokens=10_000, max_message_tokens=100))
+
+        assert "tokens elided" in prompt
+        assert estimate_tokens(prompt) < 200
+
+    def test_attachments_are_elided(self):
+        attachments = [Attachment(path=f"/file{i}.txt", name=f"file{i}.txt", media_type="text/plain") for i in range(5)]
+        messages = [Message(content="Files", sender="user1", attachments=attachments)]
+
+        prompt = user_prompt(messages, 0, budget=PromptBudget(max_tokens=10_000, max_attachments=2))
+
+        assert prompt.count("<attachment ") == 2
+        assert ELIDED_ATTACHMENTS_TEMPLATE.format(count=3) in prompt
+
+    def test_thread_keeps_most_recent_messages(self):
+        thread = Thread(id="t1", messages=[Message(content=f"Thread message {i}", sender="user3") for i in range(20)])
+
+        formatted = format_thread(thread, PromptBudget(max_tokens=10_000, max_thread_tokens=50))
+
+        assert "Thread message 19" in formatted
+        assert "Thread message 0\n" not in formatted
+        kept = formatted.count("<thread-message ")
+        assert ELIDED_THREAD_MESSAGES_TEMPLATE.format(count=20 - kept) in formatted
+
+    def test_threads_are_elided_before_messages(self):
+        thread = Thread(id="t1", messages=[Message(content="x" * 4000, sender="user3")])
+        messages = [Message(content="Hi", sender="user1", threads=[thread]), Message(content="Hello", sender="user2")]
+
+        prompt = user_prompt(messages, 0, budget=PromptBudget(max_tokens=200))
+
+        assert ELIDED_THREADS_TEMPLATE.format(ids="t1") in prompt
+        assert '<message seq_nr="0"' in prompt
+        assert '<message seq_nr="1"' in prompt
+
+    def test_oldest_messages_are_elided_keeping_seq_nr(self):
+        messages = [Message(content=f"Message {i} " + "x" * 200, sender="user1") for i in range(20)]
+
+        prompt = user_prompt(messages, 10, budget=PromptBudget(max_tokens=300))
+
+        assert estimate_tokens(prompt) <= 300
+        assert '<message seq_nr="29"' in prompt
+        assert '<message seq_nr="10"' not in prompt
+        elided = prompt.count("<message ")
+        assert ELIDED_MESSAGES_TEMPLATE.format(start_seq_nr=10, end_seq_nr=29 - elided) in prompt
+
+    def test_most_recent_message_is_truncated_to_fit(self):
+        messages = [Message(content="Hi", sender="user1"), Message(content="x" * 10_000, sender="user2")]
+
+        prompt = user_prompt(messages, 0, budget=PromptBudget(max_tokens=500, max_message_tokens=1000))
+
+        assert estimate_tokens(prompt) <= 500
+        assert '<message seq_nr="1"' in prompt
+        assert "tokens elided" in prompt
+
+
+class TestResolveThreads:
+    @staticmethod
+    def nested_threads() -> tuple[Thread, Thread, Thread]:
+        thread_1 = Thread(id="t1", messages=[Message(content="Question 1", sender="user1")])
+        thread_2 = Thread(id="t2", messages=[Message(content="Answer 2", sender="system", threads=[thread_1])])
+        thread_3 = Thread(id="t3", messages=[Message(content="Answer 3", sender="system", threads=[thread_2])])
+        return thread_1, thread_2, thread_3
+
+    def test_nested_threads_are_resolved_by_depth(self):
+        thread_1, thread_2, thread_3 = self.nested_threads()
+        thread_4 = Thread(id="t4", messages=[])
+        messages = [Message(content="Hi", sender="user1", threads=[thread_3, thread_4])]
+
+        assert resolve_threads(messages) == [thread_3, thread_4, thread_2, thread_1]
+
+    def test_reference_cycles_are_resolved_once(self):
+        thread_1 = Thread(id="t1", messages=[])
+        thread_2 = Thread(id="t2", messages=[Message(content="Ref 1", sender="user1", threads=[thread_1])])
+        thread_1.messages.append(Message(content="Ref 2", sender="user2", threads=[thread_2, thread_1]))
+        messages = [Message(content="Hi", sender="user1", threads=[thread_1])]
+
+        assert resolve_threads(messages) == [thread_1, thread_2]
+
+    def test_depth_and_size_limits(self):
+        thread_1, thread_2, thread_3 = self.nested_threads()
+        messages = [Message(content="Hi", sender="user1", threads=[thread_3])]
+
+        assert resolve_threads(messages, max_depth=2) == [thread_3, thread_2]
+        assert resolve_threads(messages, max_threads=1) == [thread_3]
+        assert unique_threads(messages) == [thread_3]
+
+    def test_user_prompt_includes_nested_threads(self):
+        thread_1, thread_2, _ = self.nested_threads()
+        messages = [Message(content="Hi", sender="user1", threads=[thread_2])]
+
+        prompt = user_prompt(messages, 0)
+
+        assert prompt.index('<thread id="t2">') < prompt.index('<thread id="t1">')
+
+    def test_formatted_threads_are_memoized_until_thread_messages_change(self):
+        cache = PromptCache()
+        thread = Thread(id="t1", messages=[Message(content="Question", sender="user1")])
+
+        formatted = format_thread(thread, cache=cache)
+        assert format_thread(thread, cache=cache) is formatted
+        assert format_thread(Thread(id="t1", messages=list(thread.messages)), cache=cache) is formatted
+
+        thread.messages.append(Message(content="Answer", sender="user2"))
+        assert "Answer" in format_thread(thread, cache=cache)
+
+        thread.messages[1].content = "Edited"
+        assert "Edited" in format_thread(thread, cache=cache)
+        assert format_thread(thread, cache=cache) == format_thread(thread)
+
+    def test_budget_elides_threads_beyond_max_threads(self):
+        _, thread_2, _ = self.nested_threads()
+        messages = [Message(content="Hi", sender="user1", threads=[thread_2])]
+
+        prompt = user_prompt(messages, 0, budget=PromptBudget(max_tokens=10_000, max_threads=1))
+
+        assert '<thread id="t2">' in prompt
+        assert ELIDED_THREADS_TEMPLATE.format(ids="t1") in prompt
+
+    def test_budget_limits_thread_depth(self):
+        _, thread_2, _ = self.nested_threads()
+        messages = [Message(content="Hi", sender="user1", threads=[thread_2])]
+
+        prompt = user_prompt(messages, 0, budget=PromptBudget(max_tokens=10_000, max_thread_depth=1))
+
+        assert '<thread id="t1">' not in prompt
@@ -0,0 +1,286 @@
+import asyncio
+import io
+import json
+
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.profiles import ModelProfile
+
+from group_sense.cli import create_parser, main
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, GroupReasoner, GroupReasonerFactory, Response, RoomSummary
+from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+from group_sense.reasoner.default import DefaultGroupReasoner
+from group_sense.replay import expand_sources, read_records, replay
+from tests.unit.test_concurrent_reasoner import MockGroupReasonerFactory
+
+
+class RecordingGroupReasoner(GroupReasoner):
+    """Reasoner that records its calls and tracks the number of concurrent calls."""
+
+    active = 0
+    max_active = 0
+
+    def __init__(self):
+        self._processed = 0
+        self.calls: list[list[Message]] = []
+
+    @property
+    def processed(self) -> int:
+        return self._processed
+
+    async def process(self, updates: list[Message], summary: RoomSummary | None = None) -> Response:
+        cls = RecordingGroupReasoner
+        cls.active += 1
+        cls.max_active = max(cls.max_active, cls.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            cls.active -= 1
+        self.calls.append(list(updates))
+        self._processed += len(updates)
+        if "?" in updates[-1].content:
+            return Response(decision=Decision.DELEGATE, query=updates[-1].content, receiver=updates[-1].sender)
+        return Response(decision=Decision.IGNORE)
+
+
+class RecordingGroupReasonerFactory(GroupReasonerFactory):
+    def create_group_reasoner(self, owner: str) -> GroupReasoner:
+        return RecordingGroupReasoner()
+
+
+def records(room: str, n: int) -> list[dict]:
+    return [{"content": f"Message {i}{'?' if i % 2 else ''}", "sender": f"user{i % 3}", "room": room} for i in range(n)]
+
+
+def write_ndjson(path, rows: list[dict]):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+
+def decisions(output: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestReadRecords:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    async def test_read_json_array(self, tmp_path, chunk_size):
+        rows = records("r1", 5)
+        path = tmp_path / "chat.json"
+        path.write_text(json.dumps(rows, indent=2))
+
+        assert [record async for record in read_records(path, chunk_size=chunk_size)] == rows
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    async def test_read_ndjson(self, tmp_path, chunk_size):
+        rows = records("r1", 5)
+        path = tmp_path / "chat.ndjson"
+        write_ndjson(path, rows)
+
+        assert [record async for record in read_records(path, chunk_size=chunk_size)] == rows
+
+    @pytest.mark.asyncio
+    async def test_read_empty_array(self, tmp_path):
+        path = tmp_path / "chat.json"
+        path.write_text(" [ ] ")
+
+        assert [record async for record in read_records(path)] == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", ['[{"content": "Hi", "sender": "a"}', '{"content": "Hi", "sender"'])
+    async def test_truncated_file_raises(self, tmp_path, content):
+        path = tmp_path / "chat.json"
+        path.write_text(content)
+
+        with pytest.raises(ValueError):
+            _ = [record async for record in read_records(path, chunk_size=4)]
+
+    @pytest.mark.asyncio
+    async def test_malformed_ndjson_line_raises_before_reading_further(self, tmp_path):
+        path = tmp_path / "chat.ndjson"
+        write_ndjson(path, records("r1", 2))
+        with path.open("a") as f:
+            f.write('{"content": "Hi", "sender": }\n')
+            f.writelines(json.dumps(row) + "\n" for row in records("r1", 1000))
+
+        reader = read_records(path, chunk_size=16, max_record_size=256)
+        assert [await anext(reader), await anext(reader)] == records("r1", 2)
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            await anext(reader)
+
+    @pytest.mark.asyncio
+    async def test_malformed_array_record_raises_at_max_record_size(self, tmp_path):
+        path = tmp_path / "chat.json"
+        path.write_text('[{"content": "Hi", "sender": "a}, ' + json.dumps(records("r1", 1000))[1:])
+
+        with pytest.raises(ValueError, match="exceeds 256 characters"):
+            _ = [record async for record in read_records(path, chunk_size=16, max_record_size=256)]
+
+    @pytest.mark.asyncio
+    async def test_large_record(self, tmp_path):
+        rows = [{"content": "x" * 100_000, "sender": "a"}, {"content": "Hi", "sender": "b"}]
+        path = tmp_path / "chat.ndjson"
+        write_ndjson(path, rows)
+
+        assert [record async for record in read_records(path, chunk_size=7)] == rows
+
+    def test_expand_sources(self, tmp_path):
+        (tmp_path / "b.ndjson").write_text("")
+        (tmp_path / "a.json").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "c.jsonl").write_text("")
+
+        assert expand_sources([tmp_path]) == [tmp_path / "a.json", tmp_path / "b.ndjson", tmp_path / "sub" / "c.jsonl"]
+
+
+class TestReplay:
+    @pytest.fixture(autouse=True)
+    def reset_counters(self):
+        RecordingGroupReasoner.active = 0
+        RecordingGroupReasoner.max_active = 0
+
+    @pytest.mark.asyncio
+    async def test_replay_rooms_of_interleaved_stream(self, tmp_path):
+        rows = [row for pair in zip(records("r1", 4), records("r2", 4)) for row in pair]
+        write_ndjson(tmp_path / "chat.ndjson", rows)
+        reasoners: dict[str, RecordingGroupReasoner] = {}
+
+        def create_reasoner(room: str) -> GroupReasoner:
+            reasoners[room] = RecordingGroupReasoner()
+            return reasoners[room]
+
+        output = io.StringIO()
+        stats = await replay([tmp_path / "chat.ndjson"], output, create_reasoner, batch_size=3)
+
+        assert [len(call) for call in reasoners["r1"].calls] == [3, 1]
+        assert [m.content for call in reasoners["r2"].calls for m in call] == [
+            f"Message {i}{'?' * (i % 2)}" for i in range(4)
+        ]
+        assert (stats.rooms, stats.messages, stats.decisions, stats.delegations, stats.errors) == (2, 8, 4, 2, 0)
+
+        r1 = [d for d in decisions(output) if d["room"] == "r1"]
+        assert r1 == [
+            {"room": "r1", "seq_nr": 2, "sender": "user2", "decision": "ignore", "query": None, "receiver": None},
+            {
+                "room": "r1",
+                "seq_nr": 3,
+                "sender": "user0",
+                "decision": "delegate",
+                "query": "Message 3?",
+                "receiver": "user0",
+            },
+        ]
+
+    @pytest.mark.asyncio
+    async def test_replay_files_as_rooms_with_concurrency_limit(self, tmp_path):
+        for i in range(6):
+            path = tmp_path / f"room{i}.json"
+            path.write_text(json.dumps([{k: v for k, v in row.items() if k != "room"} for row in records("", 3)]))
+
+        rooms = []
+
+        def create_reasoner(room: str) -> GroupReasoner:
+            rooms.append(room)
+            return RecordingGroupReasoner()
+
+        output = io.StringIO()
+        stats = await replay(expand_sources([tmp_path]), output, create_reasoner, concurrency=2)
+
+        assert sorted(rooms) == [str(tmp_path / f"room{i}") for i in range(6)]
+        assert stats.decisions == 18
+        assert RecordingGroupReasoner.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_concurrent_reasoner_appends_context_senders(self, tmp_path):
+        rows = [
+            {"content": "Hi", "sender": "user1"},
+            {"content": "Hello from the assistant", "sender": "system"},
+            {"content": "Thanks", "sender": "user2"},
+        ]
+        write_ndjson(tmp_path / "room.ndjson", rows)
+        created = []
+
+        def create_reasoner(room: str) -> ConcurrentGroupReasoner:
+            created.append(ConcurrentGroupReasoner(MockGroupReasonerFactory()))
+            return created[-1]
+
+        output = io.StringIO()
+        stats = await replay([tmp_path / "room.ndjson"], output, create_reasoner)
+
+        assert sorted((d["seq_nr"], d["sender"]) for d in decisions(output)) == [(0, "user1"), (2, "user2")]
+        assert len(created[0].messages) == 3
+        assert stats.messages == 3
+
+    @pytest.mark.asyncio
+    async def test_replay_concurrent_reasoner_runs_senders_of_room_in_parallel(self, tmp_path):
+        write_ndjson(tmp_path / "chat.ndjson", records("r1", 6))
+
+        output = io.StringIO()
+        stats = await replay(
+            [tmp_path / "chat.ndjson"],
+            output,
+            lambda room: ConcurrentGroupReasoner(RecordingGroupReasonerFactory()),
+            concurrency=2,
+        )
+
+        assert stats.decisions == 6
+        assert sorted(d["seq_nr"] for d in decisions(output)) == list(range(6))
+        assert RecordingGroupReasoner.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_writes_errors_and_skips_invalid_sources(self, tmp_path):
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            return ModelResponse(parts=[TextPart(content="not json")])
+
+        model = FunctionModel(respond, profile=ModelProfile(supports_json_schema_output=True))
+        write_ndjson(tmp_path / "a.ndjson", [{"content": "Hi", "sender": "user1"}])
+        (tmp_path / "b.ndjson").write_text('{"content": "Hi"}\n')
+
+        output = io.StringIO()
+        stats = await replay(
+            [tmp_path / "a.ndjson", tmp_path / "b.ndjson"],
+            output,
+            lambda room: DefaultGroupReasoner(system_prompt="Assist", model=model),
+        )
+
+        assert stats.errors == 2
+        assert "error" in decisions(output)[0]
+
+    @pytest.mark.asyncio
+    async def test_progress_callback(self, tmp_path):
+        write_ndjson(tmp_path / "chat.ndjson", records("r1", 10))
+        reports = []
+
+        await replay(
+            [tmp_path / "chat.ndjson"],
+            io.StringIO(),
+            lambda room: RecordingGroupReasoner(),
+            on_progress=lambda stats: reports.append(stats.messages),
+            progress_interval=0.02,
+        )
+
+        assert reports
+        assert reports == sorted(reports)
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_raise(self, tmp_path):
+        with pytest.raises(ValueError):
+            await replay([], io.StringIO(), lambda room: RecordingGroupReasoner(), concurrency=0)
+
+
+class TestCli:
+    def test_backfill_is_alias_of_replay(self, tmp_path):
+        args = create_parser().parse_args(["backfill", str(tmp_path), "--prompt-file", "prompt.md", "--concurrent"])
+
+        assert args.inputs == [tmp_path]
+        assert args.concurrent
+
+    def test_concurrent_prompt_without_owner_placeholder_exits(self, tmp_path):
+        prompt_file = tmp_path / "prompt.md"
+        prompt_file.write_text("You are a helpful assistant")
+
+        with pytest.raises(SystemExit):
+            main(["replay", str(tmp_path), "--prompt-file", str(prompt_file), "--concurrent"])
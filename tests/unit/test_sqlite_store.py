@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+import pytest_asyncio
+
+from group_sense.message import Message, Thread
+from group_sense.storage.sqlite import SQLiteStore
+
+
+@pytest_asyncio.fixture
+async def store(tmp_path):
+    store = SQLiteStore(tmp_path / "store.db")
+    yield store
+    await store.aclose()
+
+
+class TestSQLiteStore:
+    @pytest.mark.asyncio
+    async def test_messages_roundtrip(self, store):
+        messages = [
+            Message(content="Hi", sender="user1", threads=[Thread(id="t1", messages=[Message("Ref", "user3")])]),
+            Message(content="Hello", sender="user2", receiver="user1"),
+        ]
+        store.append_messages("room1", 0, messages)
+        store.append_messages("room2", 0, messages[:1])
+
+        assert await store.load_messages("room1") == messages
+        assert await store.load_messages("room1", start=1) == messages[1:]
+        assert await store.load_messages("room1", end=1) == messages[:1]
+        assert await store.count_messages("room1") == 2
+        assert await store.count_messages("room2") == 1
+
+    @pytest.mark.asyncio
+    async def test_history_deltas_are_appended(self, store):
+        store.save_reasoner_delta("room1", "alice", {"start": 0, "agent": [{"n": 0}, {"n": 1}], "processed": 1})
+        store.save_reasoner_delta("room1", "alice", {"start": 2, "agent": [{"n": 2}], "processed": 3})
+
+        state = await store.load_reasoner("room1", "alice")
+        assert state == {"agent": [{"n": 0}, {"n": 1}, {"n": 2}], "processed": 3}
+
+    @pytest.mark.asyncio
+    async def test_repeated_delta_replaces_history_suffix(self, store):
+        store.save_reasoner_delta("room1", "alice", {"start": 0, "agent": [{"n": 0}, {"n": 1}], "processed": 1})
+        store.save_reasoner_delta("room1", "alice", {"start": 1, "agent": [{"n": 2}], "processed": 2})
+
+        state = await store.load_reasoner("room1", "alice")
+        assert state == {"agent": [{"n": 0}, {"n": 2}], "processed": 2}
+
+    @pytest.mark.asyncio
+    async def test_full_state_is_stored_as_a_whole(self, store):
+        store.save_reasoner_delta("room1", "alice", {"processed": 5, "custom": True})
+
+        assert await store.load_reasoner("room1", "alice") == {"processed": 5, "custom": True}
+        assert await store.load_reasoner("room1", "bob") is None
+
+    @pytest.mark.asyncio
+    async def test_room_state_roundtrip(self, store):
+        store.save_room_state("room1", "summarizer", {"content": "Summary", "end": 3})
+
+        assert await store.load_room_state("room1", "summarizer") == {"content": "Summary", "end": 3}
+        assert await store.load_room_state("room1", "batch_reasoner") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_operation_does_not_stop_worker(self, store):
+        store.save_reasoner_delta("room1", "alice", {"agent": [], "processed": 1})
+        await store.flush()
+        await store._call(lambda conn: conn.execute("UPDATE reasoners SET state = 'corrupt'"))
+
+        with pytest.raises(ValueError):
+            await store.load_reasoner("room1", "alice")
+        assert await store.count_messages("room1") == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_operation_is_rolled_back_without_other_operations_of_batch(self, store):
+        released = threading.Event()
+
+        def block(conn):
+            released.wait()
+
+        def fail(conn):
+            conn.execute("INSERT INTO room_state VALUES ('room1', 'partial', '{}')")
+            raise RuntimeError("Write failed")
+
+        store._submit(block)
+        store.append_messages("room1", 0, [Message(content="Hi", sender="user1")])
+        store._submit(fail)
+        store.save_room_state("room1", "summarizer", {"end": 1})
+        released.set()
+
+        assert await store.count_messages("room1") == 1
+        assert await store.load_room_state("room1", "partial") is None
+        assert await store.load_room_state("room1", "summarizer") == {"end": 1}
+
+    @pytest.mark.asyncio
+    async def test_writes_are_persisted_on_close(self, tmp_path):
+        store = SQLiteStore(tmp_path / "store.db")
+        store.append_messages("room1", 0, [Message(content="Hi", sender="user1")])
+        await store.aclose()
+
+        reopened = SQLiteStore(tmp_path / "store.db")
+        assert await reopened.count_messages("room1") == 1
+        await reopened.aclose()
+
+        with pytest.raises(RuntimeError):
+            store.append_messages("room1", 1, [Message(content="Late", sender="user1")])
+
+    def test_invalid_batch_size_raises_value_error(self, tmp_path):
+        with pytest.raises(ValueError):
+            SQLiteStore(tmp_path / "store.db", batch_size=0)
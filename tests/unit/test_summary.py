@@ -0,0 +1,93 @@
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from group_sense.message import Message
+from group_sense.reasoner.base import RoomSummary
+from group_sense.reasoner.summary import RoomSummarizer
+
+
+def make_messages(n: int, start: int = 0) -> list[Message]:
+    return [Message(content=f"Message {i}", sender=f"user{i % 3}") for i in range(start, start + n)]
+
+
+@pytest.fixture
+def summarizer():
+    """Fixture that creates a RoomSummarizer with a fixed summary output."""
+    return RoomSummarizer(model=TestModel(custom_output_text="Summary text"), window=4, tail=2)
+
+
+class TestRoomSummarizer:
+    def test_invalid_window_raises_value_error(self):
+        with pytest.raises(ValueError, match="Window must be at least 1"):
+            RoomSummarizer(model=TestModel(), window=0)
+
+    def test_invalid_tail_raises_value_error(self):
+        with pytest.raises(ValueError, match="Tail must be at least 1"):
+            RoomSummarizer(model=TestModel(), tail=0)
+
+    def test_initial_state(self, summarizer):
+        assert summarizer.summary is None
+        assert summarizer.end == 0
+
+    def test_due_requires_full_window_beyond_tail(self, summarizer):
+        assert not summarizer.due(5)
+        assert summarizer.due(6)
+
+    @pytest.mark.asyncio
+    async def test_update_not_due_returns_current_summary(self, summarizer):
+        result = await summarizer.update(make_messages(5))
+        assert result is None
+        assert summarizer.end == 0
+
+    @pytest.mark.asyncio
+    async def test_update_excludes_tail(self, summarizer):
+        result = await summarizer.update(make_messages(7))
+        assert result == RoomSummary(content="Summary text", end=5)
+        assert summarizer.summary is result
+
+    @pytest.mark.asyncio
+    async def test_update_is_incremental(self, summarizer):
+        messages = make_messages(7)
+        await summarizer.update(messages)
+
+        messages.extend(make_messages(3, start=7))
+        result = await summarizer.update(messages)
+        assert result.end == 5
+
+        messages.extend(make_messages(1, start=10))
+        result = await summarizer.update(messages)
+        assert result.end == 9
+
+    @pytest.mark.asyncio
+    async def test_update_prompt_contains_previous_summary_and_window(self):
+        prompts: list[str] = []
+
+        def summarize(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            part = messages[-1].parts[-1]
+            assert isinstance(part, UserPromptPart) and isinstance(part.content, str)
+            prompts.append(part.content)
+            return ModelResponse(parts=[TextPart(content="New summary")])
+
+        summarizer = RoomSummarizer(model=FunctionModel(summarize), window=2, tail=1)
+        summarizer.set_serialized({"content": "Previous summary", "end": 2})
+
+        await summarizer.update(make_messages(5))
+
+        assert summarizer.summary == RoomSummary(content="New summary", end=4)
+        assert '<summary end_seq_nr="1">\nPrevious summary\n</summary>' in prompts[0]
+        assert 'seq_nr="2"' in prompts[0]
+        assert 'seq_nr="3"' in prompts[0]
+        assert "Message 1" not in prompts[0]
+        assert "Message 4" not in prompts[0]
+
+    def test_serialization_roundtrip(self, summarizer):
+        assert summarizer.get_serialized() == {}
+
+        summarizer.set_serialized({"content": "Saved", "end": 10})
+        assert summarizer.summary == RoomSummary(content="Saved", end=10)
+        assert summarizer.get_serialized() == {"content": "Saved", "end": 10}
+
+        summarizer.set_serialized({})
+        assert summarizer.summary is None
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, Response
+from group_sense.reasoner.concurrent import ConcurrentGroupReasoner
+from group_sense.reasoner.sync import SyncGroupReasoner
+from tests.unit.test_concurrent_reasoner import MockGroupReasoner, MockGroupReasonerFactory
+
+
+@pytest.fixture
+def factory():
+    return MockGroupReasonerFactory()
+
+
+@pytest.fixture
+def sync_reasoner(factory):
+    reasoner = SyncGroupReasoner(ConcurrentGroupReasoner(factory))
+    yield reasoner
+    reasoner.close()
+
+
+class TestSyncGroupReasoner:
+    def test_process_returns_concurrent_future(self, sync_reasoner):
+        future = sync_reasoner.process(Message(content="Hi", sender="user1"))
+
+        assert future.result(timeout=5).decision == Decision.IGNORE
+
+    def test_append_and_process_are_applied_in_call_order(self, sync_reasoner, factory):
+        sync_reasoner.append(Message(content="Hello", sender="system"))
+        sync_reasoner.process(Message(content="Hi", sender="user1")).result(timeout=5)
+
+        assert factory.created_reasoners["user1"].process_calls == [
+            [Message(content="Hello", sender="system"), Message(content="Hi", sender="user1")]
+        ]
+
+    def test_process_batch(self, sync_reasoner, factory):
+        expected = Response(decision=Decision.DELEGATE, query="Query", receiver="user1")
+        factory.created_reasoners["user1"] = MockGroupReasoner(response=expected)
+
+        responses = sync_reasoner.process_batch(
+            [Message(content="Q", sender="user1"), Message(content="Hi", sender="user2")], timeout=5
+        )
+
+        assert [r.decision for r in responses] == [Decision.DELEGATE, Decision.IGNORE]
+
+    def test_process_batch_timeout_raises_timeout_error(self, sync_reasoner):
+        with pytest.raises(TimeoutError):
+            sync_reasoner.process_batch([Message(content="Hi", sender="user1")], timeout=0)
+
+    def test_process_from_multiple_threads(self, sync_reasoner):
+        def process(i: int) -> Response:
+            return sync_reasoner.process(Message(content=f"Hi {i}", sender=f"user{i % 4}")).result(timeout=5)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(process, range(40)))
+
+        assert len(responses) == 40
+        messages = sync_reasoner.submit(_messages(sync_reasoner)).result(timeout=5)
+        assert len(messages) == 40
+
+    def test_process_error_is_set_on_future(self, sync_reasoner):
+        sync_reasoner.submit(sync_reasoner.reasoner.aclose()).result(timeout=5)
+
+        with pytest.raises(RuntimeError):
+            sync_reasoner.process(Message(content="Hi", sender="user1")).result(timeout=5)
+
+    def test_reasoner_runs_on_loop_thread(self, sync_reasoner):
+        async def thread_name() -> str:
+            return threading.current_thread().name
+
+        assert sync_reasoner.submit(thread_name()).result(timeout=5) != threading.current_thread().name
+
+    def test_close_stops_owned_loop(self, factory):
+        reasoner = SyncGroupReasoner(ConcurrentGroupReasoner(factory))
+        future = reasoner.process(Message(content="Hi", sender="user1"))
+
+        reasoner.close()
+
+        assert future.done()
+        assert reasoner.loop.is_closed()
+        reasoner.close()
+
+    def test_facades_share_loop(self, sync_reasoner, factory):
+        other = SyncGroupReasoner(ConcurrentGroupReasoner(MockGroupReasonerFactory()), loop=sync_reasoner.loop)
+
+        assert other.process(Message(content="Hi", sender="user1")).result(timeout=5).decision == Decision.IGNORE
+        other.close()
+        assert not sync_reasoner.loop.is_closed()
+
+    def test_context_manager_closes_reasoner(self, factory):
+        with SyncGroupReasoner(ConcurrentGroupReasoner(factory)) as reasoner:
+            reasoner.process(Message(content="Hi", sender="user1"))
+
+        assert reasoner.loop.is_closed()
+
+
+async def _messages(sync_reasoner: SyncGroupReasoner) -> list[Message]:
+    return list(sync_reasoner.reasoner.messages)
@@ -0,0 +1,69 @@
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.profiles import ModelProfile
+
+from group_sense.message import Message
+from group_sense.reasoner.base import Decision, Response
+from group_sense.reasoner.validator import DecisionValidator
+
+
+def recording_validator(output: str) -> tuple[DecisionValidator, list[str]]:
+    prompts: list[str] = []
+
+    def validate(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        part = messages[-1].parts[-1]
+        assert isinstance(part, UserPromptPart) and isinstance(part.content, str)
+        prompts.append(part.content)
+        return ModelResponse(parts=[TextPart(content=output)])
+
+    model = FunctionModel(validate, profile=ModelProfile(supports_json_schema_output=True))
+    return DecisionValidator(model=model), prompts
+
+
+DELEGATION = Response(decision=Decision.DELEGATE, query="When is the release?", receiver="user1", position=1)
+
+
+class TestDecisionValidator:
+    @pytest.mark.asyncio
+    async def test_answered_query_is_ignored(self):
+        validator, prompts = recording_validator('{"decision": "ignore"}')
+        messages = [
+            Message(content="When is the release?", sender="user1"),
+            Message(content="It's next Monday.", sender="user2"),
+        ]
+
+        response = await validator.validate(DELEGATION, messages)
+
+        assert response == Response(decision=Decision.IGNORE, position=2)
+        assert '<delegation receiver="user1">\nWhen is the release?\n</delegation>' in prompts[0]
+        assert '<message seq_nr="1" sender="user2" receiver="">' in prompts[0]
+        assert 'seq_nr="0"' not in prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_open_query_keeps_delegation(self):
+        validator, _ = recording_validator('{"decision": "delegate"}')
+        messages = [Message(content="When is the release?", sender="user1"), Message(content="Hi", sender="user3")]
+
+        response = await validator.validate(DELEGATION, messages)
+
+        assert response == DELEGATION.model_copy(update={"position": 2})
+
+    @pytest.mark.asyncio
+    async def test_current_response_is_returned_without_model_call(self):
+        validator, prompts = recording_validator('{"decision": "ignore"}')
+
+        response = await validator.validate(DELEGATION, [Message(content="When is the release?", sender="user1")])
+
+        assert response is DELEGATION
+        assert prompts == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_responses_raise(self):
+        validator, _ = recording_validator('{"decision": "ignore"}')
+        messages = [Message(content="Hi", sender="user1")]
+
+        with pytest.raises(ValueError):
+            await validator.validate(Response(decision=Decision.IGNORE, position=0), messages)
+        with pytest.raises(ValueError):
+            await validator.validate(DELEGATION.model_copy(update={"position": None}), messages)
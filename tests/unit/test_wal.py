@@ -0,0 +1,85 @@
+import pytest
+
+from group_sense.storage.wal import WriteAheadLog
+
+
+class CountingWriteAheadLog(WriteAheadLog):
+    """Write-ahead log that records the number of records of each write."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes: list[int] = []
+
+    def _write(self, batch: list[bytes], first: int):
+        self.writes.append(len(batch))
+        super()._write(batch, first)
+
+
+class TestWriteAheadLog:
+    @pytest.mark.asyncio
+    async def test_records_are_durable_after_commit(self, tmp_path):
+        wal = WriteAheadLog(tmp_path, commit_interval=0)
+        lsns = [wal.append({"type": "message", "n": i}) for i in range(3)]
+        await wal.commit(lsns[-1])
+
+        assert lsns == [0, 1, 2]
+        assert wal.durable == 3
+        assert [record["n"] for record in wal.records()] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_records_are_written_in_batches(self, tmp_path):
+        wal = CountingWriteAheadLog(tmp_path, commit_interval=0.01)
+
+        for i in range(5):
+            wal.append({"n": i})
+        await wal.commit()
+
+        assert wal.writes == [5]
+
+    @pytest.mark.asyncio
+    async def test_reopened_log_continues_sequence(self, tmp_path):
+        wal = WriteAheadLog(tmp_path, commit_interval=0)
+        wal.append({"n": 0})
+        await wal.aclose()
+
+        reopened = WriteAheadLog(tmp_path, commit_interval=0)
+        assert reopened.lsn == 1
+        reopened.append({"n": 1})
+        await reopened.commit()
+
+        assert [record["lsn"] for record in reopened.records()] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_partially_written_record_is_discarded(self, tmp_path):
+        wal = WriteAheadLog(tmp_path, commit_interval=0)
+        wal.append({"n": 0})
+        await wal.aclose()
+        with open(wal.segments[-1], "ab") as f:
+            f.write(b'{"lsn":1,"n"')
+
+        reopened = WriteAheadLog(tmp_path, commit_interval=0)
+        assert reopened.lsn == 1
+        reopened.append({"n": 1})
+        await reopened.commit()
+
+        assert [record["n"] for record in reopened.records()] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_segments_roll_and_truncate(self, tmp_path):
+        wal = WriteAheadLog(tmp_path, segment_size=100, commit_interval=0)
+        for i in range(10):
+            wal.append({"content": "x" * 40, "n": i})
+            await wal.commit()
+
+        assert len(wal.segments) > 1
+        assert [record["n"] for record in wal.records(start=7)] == [7, 8, 9]
+
+        wal.truncate(7)
+        assert int(wal.segments[0].stem) <= 7
+        assert [record["n"] for record in wal.records(start=7)] == [7, 8, 9]
+
+    def test_invalid_arguments_raise_value_error(self, tmp_path):
+        with pytest.raises(ValueError):
+            WriteAheadLog(tmp_path, segment_size=0)
+        with pytest.raises(ValueError):
+            WriteAheadLog(tmp_path, commit_interval=-1)